@@ -2,10 +2,10 @@
 
 
 import math
-import random
 import signal
 import sys
-import time
+
+import numpy as np
 
 
 from which_pyqt import PYQT_VER
@@ -26,58 +26,168 @@ else:
 
 # Import the code with the actual implementation
 from convex_hull import *
+from hull_worker import HullWorker
+from point_generators import generate_points
+
+
+def to_polygonf(points):
+	# fills a QPolygonF's QPointF storage (two doubles each) from an (N, 2) array in one copy
+	points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+	polygon = QPolygonF(len(points))
+	if len(points):
+		storage = polygon.data()
+		storage.setsize(points.nbytes)
+		np.frombuffer(storage, dtype=np.float64)[:] = points.ravel()
+	return polygon
 
 
 # This class controls the visual stuff in the GUI.  An instance of it is passed to the solver
 # when it is called so that wrapper functions in the file "convex_hull.py" can update the GUI
 #
 class PointLineView( QWidget ):
+	# the position in the merge log being played back, after every event drawn or seek
+	eventMoved = pyqtSignal(int)
+
 	def __init__( self, status_bar ):
 		super(QWidget,self).__init__()
 		self.setMinimumSize(600,400)
 
+		# points by color, and lines by color then by id() - the QLineF objects passed to
+		# addLines are the ones clearLines removes, found in O(1) rather than by equality
 		self.pointList  = {}
 		self.lineList   = {}
 		self.status_bar = status_bar
 
+		# the points drawn once onto a transparent pixmap, redrawn only on a change or resize
+		self.pointLayer = None
+
+		# a hull_events.HullEvents log played back (see playEvents), the number of its events
+		# drawn so far, and what they leave on screen: the sub-hulls by their leftmost and
+		# rightmost points, the tangent candidate and the tangents of the merge under way
+		self.events = None
+		self.eventPosition = 0
+		self.eventHulls = {}
+		self.eventCandidate = None
+		self.eventTangents = []
+		self.eventLines = {}
+		self.eventTimer = QTimer(self)
+		self.eventTimer.timeout.connect(self._playEvent)
+
+	# The solver runs on a hull_worker.HullWorker, whose ViewProxy calls these on the main
+	# thread, in batches - the repaint is left to the event loop rather than forced here
 	def displayStatusText(self, text):
 		self.status_bar.showMessage(text)
 		self.update()
-		app.processEvents
 
 	def clearPoints(self):
 		self.pointList = {}
+		self.pointLayer = None
 
 	def clearLines(self, lines=None):
 		if(not lines):
 			self.lineList = {}
 		else:
 			for color in self.lineList:
+				lines_of_color = self.lineList[color]
 				for line in lines:
-					try:
-						self.lineList[color].remove(line)
-					except:
-						pass
+					lines_of_color.pop(id(line), None)
 		self.update()
-		app.processEvents()
 
-	def addPoints( self, point_list, color ):
-		if color in self.pointList:
-			self.pointList[color].extend( point_list )
-		else:
-			self.pointList[color] = point_list
+	def addPoints( self, points, color ):
+		# points is an (N, 2) float64 array, copied straight into a QPolygonF
+		self.pointList.setdefault(color, []).append( to_polygonf(points) )
+		self.pointLayer = None
 
 	def addLines( self, line_list, color ):
-		if color in self.lineList:
-			self.lineList[color].extend( line_list )
-		else:
-			self.lineList[color] = line_list
+		lines_of_color = self.lineList.setdefault(color, {})
+		for line in line_list:
+			lines_of_color[id(line)] = line
 		self.update()
-		app.processEvents()
 
-	def paintEvent(self, event):
-		painter = QPainter(self)
+	# Playback of the merge log of a solve with "Show Recursion" checked - the solver runs at
+	# full speed and the animation is replayed here, at any speed, from any event
+	def setEvents(self, events):
+		self.pauseEvents()
+		self.events = events
+		self.seekEvent(0)
+
+	def playEvents(self, speed=1.0):
+		# PAUSE seconds per event at speed 1
+		if self.events is None:
+			return
+		if self.eventPosition >= len(self.events):
+			self.seekEvent(0)
+		self.eventTimer.start(max(1, int(1000 * PAUSE / speed)))
+
+	def pauseEvents(self):
+		self.eventTimer.stop()
+
+	def isPlaying(self):
+		return self.eventTimer.isActive()
+
+	def stepEvents(self, count=1):
+		# count events forwards, or backwards if negative
+		self.seekEvent(self.eventPosition + count)
+
+	def seekEvent(self, position):
+		# draws the first position events.  Going back replays the log from its start, but
+		# only the state is replayed - the lines are made once, for what is left on screen
+		total = len(self.events) if self.events is not None else 0
+		position = max(0, min(position, total))
+		if position < self.eventPosition or self.events is None:
+			self.eventPosition = 0
+			self.eventHulls = {}
+			self.eventCandidate = None
+			self.eventTangents = []
+		while self.eventPosition < position:
+			self._applyEvent(*self.events[self.eventPosition])
+			self.eventPosition += 1
+		self._showEvents()
+		self.eventMoved.emit(self.eventPosition)
+
+	def _playEvent(self):
+		if self.events is None or self.eventPosition + 1 >= len(self.events):
+			# stopped before the last event is drawn, so eventMoved sees the playback over
+			self.pauseEvents()
+		self.stepEvents()
+
+	def _applyEvent(self, kind, values):
+		if kind == EVENT_CANDIDATE:
+			self.eventCandidate = values
+		elif kind == EVENT_TANGENT:
+			self.eventCandidate = None
+			self.eventTangents.append(values)
+		elif kind == EVENT_MERGE:
+			# the two hulls are replaced by the one the tangents bridge them into; a hull of 1
+			# point is never logged, its name holds it
+			left = self.eventHulls.pop(values[0:4], values[0:2])
+			right = self.eventHulls.pop(values[4:8], values[4:6])
+			upper, lower = self.eventTangents
+			self.eventHulls[values[0:2] + values[6:8]] = merge_vertices(left, right, upper, lower)
+			self.eventTangents = []
+		elif kind == EVENT_SUBHULL:
+			xs = values[0::2]
+			ys = values[1::2]
+			vertices = list(zip(xs, ys))
+			self.eventHulls[min(vertices) + max(vertices)] = values
+
+	def _showEvents(self):
+		hull_lines = []
+		for values in self.eventHulls.values():
+			# closed, x0, y0 again at the end
+			ring = values + values[:2]
+			hull_lines.extend(QLineF(*ring[i:i + 4]) for i in range(0, len(values), 2))
+		self.eventLines = {RED: hull_lines, GREEN: [QLineF(*line) for line in self.eventTangents]}
+		if self.eventCandidate is not None:
+			self.eventLines[BLUE] = [QLineF(*self.eventCandidate)]
+		self.update()
 
+	def resizeEvent(self, event):
+		self.pointLayer = None
+		super().resizeEvent(event)
+
+	def viewTransform(self):
+		# maps the [-1, 1] coordinates of points and lines to the widget, keeping the aspect ratio
 		w = self.width() / 2.0
 		h = self.height() / 2.0
 		w2h_desired_ratio = 1.5
@@ -88,22 +198,40 @@ class PointLineView( QWidget ):
 
 		tform = QTransform()
 		tform.translate(self.width()/2.0,self.height()/2.0)
-		tform.scale(1.0,-1.0)
-		painter.setTransform(tform)
+		tform.scale(w,-h)
+		return tform
+
+	def drawPointLayer(self):
+		self.pointLayer = QPixmap(self.size())
+		self.pointLayer.fill(Qt.transparent)
+		painter = QPainter(self.pointLayer)
+		tform = self.viewTransform()
+		for color in self.pointList:
+			# transformed up front, so the dots are square pixels whatever the scale
+			painter.setPen( QPen(QColor(color[0],color[1],color[2]), 2.0) )
+			for polygon in self.pointList[color]:
+				painter.drawPoints( tform.map(polygon) )
+		painter.end()
 
+	def paintEvent(self, event):
+		if self.pointLayer is None:
+			self.drawPointLayer()
+
+		painter = QPainter(self)
+		painter.setTransform(self.viewTransform())
 		for color in self.lineList:
-			c = QColor(color[0],color[1],color[2])
-			painter.setPen( c )
-			for line in self.lineList[color]:
-				ln = QLineF( w*line.x1(), h*line.y1(), w*line.x2(), h*line.y2() )
-				painter.drawLine( ln )
+			pen = QPen(QColor(color[0],color[1],color[2]))
+			pen.setCosmetic(True)
+			painter.setPen( pen )
+			painter.drawLines( list(self.lineList[color].values()) )
+		for color in self.eventLines:
+			pen = QPen(QColor(color[0],color[1],color[2]))
+			pen.setCosmetic(True)
+			painter.setPen( pen )
+			painter.drawLines( self.eventLines[color] )
 
-		for color in self.pointList:
-			c = QColor(color[0],color[1],color[2])
-			painter.setPen( c )
-			for point in self.pointList[color]:
-				pt = QPointF(w*point.x(), h*point.y())
-				painter.drawEllipse( pt, 1.0, 1.0)
+		painter.resetTransform()
+		painter.drawPixmap(0, 0, self.pointLayer)
 
 
 # Main GUI class
@@ -114,9 +242,12 @@ class Proj2GUI( QMainWindow ):
 
 		# This is where the points for a problem instance are kept
 		self.points = None
+		# and the hull cache key of a seeded instance, or None
+		self.pointsKey = None
 
-		# Getting an instance of your solver
+		# Getting an instance of your solver, and the thread running it during a solve
 		self.solver = ConvexHullSolver()
+		self.worker = None
 
 		# start the GUI
 		self.initUI()
@@ -126,51 +257,27 @@ class Proj2GUI( QMainWindow ):
 
 		if self.randBySeed.isChecked():
 			seed = int(self.randSeed.text())
-			random.seed( seed )
-		else: # do by time
-			random.seed( time.time() )
-
-		ptlist = []
-		unique_xvals = {}
-		max_r  = 0.98
-		WIDTH  = 1.0
-		HEIGHT = 1.0
+		else: # fresh points every time
+			seed = None
+
 		npoints = int(self.npoints.text())
 		if self.distribOval.isChecked():
-			while len(ptlist) < npoints:
-				x = random.uniform(-1.0,1.0)
-				y = random.uniform(-1.0,1.0)
-				if x**2+y**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
+			distribution = 'uniform'
 		elif self.distribSphere.isChecked():
-			while len(ptlist) < npoints:
-				x = random.uniform(-1.0,1.0)
-				y = random.uniform(-1.0,1.0)
-				z = random.uniform(-1.0,1.0)
-				if x**2 + y**2 + z**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
-		elif self.distribGaussian.isChecked():
-			while len(ptlist) < npoints:
-				x = random.gauss(0.0,0.25)
-				y = random.gauss(0.0,0.25)
-				if x**2+y**2 <= max_r**2:
-					xval = WIDTH*x
-					yval = HEIGHT*y
-					if not xval in unique_xvals:
-						ptlist.append( QPointF(xval,yval) )
-						unique_xvals[xval] = 1
-		return ptlist
+			distribution = 'spherical'
+		else:
+			distribution = 'gaussian'
+		points = generate_points(distribution, npoints, seed)
+
+		# a seeded instance is named by how it was generated, so the solver needn't hash it
+		self.pointsKey = None if seed is None else generator_key(distribution, npoints, seed)
+		# the array itself goes to the view and the solver, with no QPointF per point
+		return points
 
 # Methods that handle GUI events
 	def clearClicked(self):
+		self.view.setEvents(None)
+		self._updatePlayback()
 		self.view.clearLines()
 		self.view.displayStatusText('')
 		self.solveButton.setEnabled(True)
@@ -178,7 +285,9 @@ class Proj2GUI( QMainWindow ):
 		app.processEvents()
 
 	def generateClicked(self):
-		if self.points:
+		if self.points is not None:
+			self.view.setEvents(None)
+			self._updatePlayback()
 			self.view.clearPoints()
 			self.view.clearLines()
 		self.points = self.newPoints()
@@ -195,13 +304,77 @@ class Proj2GUI( QMainWindow ):
 		self.generateButton.setEnabled(False)
 		self.clearButton.setEnabled(False)
 		self.solveButton.setEnabled(False)
-		self.view.update()
-		app.processEvents()
-		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view)
+		self.cancelButton.setEnabled(True)
+		self.view.setEvents(None)
+		self._updatePlayback()
+		self.view.displayStatusText('Solving...')
+		# the solve runs on a worker thread, so the window stays responsive
+		self.worker = HullWorker(self.solver,self.points,self.showRecursion.isChecked(),self.view,cache_key=self.pointsKey)
+		self.worker.solved.connect(self._solveSolved)
+		self.worker.cancelled.connect(self._solveCancelled)
+		self.worker.failed.connect(self._solveFailed)
+		self.worker.finished.connect(self._solveFinished)
+		self.worker.start()
+
+	def cancelClicked(self):
+		self.cancelButton.setEnabled(False)
+		self.view.displayStatusText('Cancelling...')
+		self.worker.cancel()
+
+	def _solveSolved(self, hull):
+		# the solver logged its merges rather than pausing in them: play them back over the points
+		if self.showRecursion.isChecked() and self.solver.events is not None:
+			self.view.clearLines()
+			self.view.setEvents(self.solver.events)
+			self._updatePlayback()
+			self.view.playEvents(self.playSpeed.value())
+			self.playButton.setText('Pause')
+
+	def _solveCancelled(self):
+		self.view.clearLines()
+		self.view.displayStatusText('Cancelled')
+		self.solveButton.setEnabled(True)
+
+	def _solveFailed(self, error):
+		self.view.displayStatusText('Failed: {}'.format(error))
+
+	def _solveFinished(self):
 		self.generateButton.setEnabled(True)
 		self.clearButton.setEnabled(True)
+		self.cancelButton.setEnabled(False)
 		self.view.update()
-		app.processEvents()
+
+	# Playback of the merge log
+	def playClicked(self):
+		if self.view.isPlaying():
+			self.view.pauseEvents()
+		else:
+			self.view.playEvents(self.playSpeed.value())
+		self.playButton.setText('Pause' if self.view.isPlaying() else 'Play')
+
+	def stepClicked(self):
+		self.view.pauseEvents()
+		self.playButton.setText('Play')
+		self.view.stepEvents()
+
+	def _speedChanged(self, speed):
+		if self.view.isPlaying():
+			self.view.playEvents(speed)
+
+	def _eventMoved(self, position):
+		self.playSlider.blockSignals(True)
+		self.playSlider.setValue(position)
+		self.playSlider.blockSignals(False)
+		if not self.view.isPlaying():
+			self.playButton.setText('Play')
+
+	def _updatePlayback(self):
+		# the controls match the log the view holds
+		events = self.view.events
+		self.playSlider.setMaximum(len(events) if events is not None else 0)
+		for widget in (self.playButton, self.stepButton, self.playSlider):
+			widget.setEnabled(events is not None)
+		self.playButton.setText('Play')
 
 	def _randbytime(self):
 		self.randSeed.setEnabled(False)
@@ -227,6 +400,7 @@ class Proj2GUI( QMainWindow ):
 		self.generateButton = QPushButton('Generate')
 		self.solveButton    = QPushButton('Solve')
 		self.clearButton    = QPushButton('Clear To Points')
+		self.cancelButton   = QPushButton('Cancel')
 		self.distribOval    = QRadioButton('Uniform')
 		self.distribSphere  = QRadioButton('Spherical')
 		self.distribGaussian= QRadioButton('Gaussian')
@@ -236,6 +410,13 @@ class Proj2GUI( QMainWindow ):
 		self.randSeed       = QLineEdit('0')
 
 		self.showRecursion	= QCheckBox('Show Recursion')
+		self.playButton		= QPushButton('Play')
+		self.stepButton		= QPushButton('Step')
+		self.playSlider		= QSlider(Qt.Horizontal)
+		self.playSpeed		= QDoubleSpinBox()
+		self.playSpeed.setRange(0.1, 100.0)
+		self.playSpeed.setValue(1.0)
+		self.playSpeed.setSuffix('x')
 
 		h = QHBoxLayout()
 		h.addWidget( self.view )
@@ -247,6 +428,7 @@ class Proj2GUI( QMainWindow ):
 		h.addWidget( self.generateButton )
 		h.addWidget( self.solveButton )
 		h.addWidget( self.clearButton )
+		h.addWidget( self.cancelButton )
 		h.addStretch(1)
 		vbox.addLayout(h)
 
@@ -274,9 +456,27 @@ class Proj2GUI( QMainWindow ):
 		h.addWidget(self.showRecursion)
 		vbox.addLayout(h)
 
+		h = QHBoxLayout()
+		h.addWidget( QLabel( 'Recursion: ' ) )
+		h.addWidget( self.playButton )
+		h.addWidget( self.stepButton )
+		h.addWidget( self.playSlider, 1 )
+		h.addWidget( QLabel( 'Speed: ' ) )
+		h.addWidget( self.playSpeed )
+		vbox.addLayout(h)
+
 		self.generateButton.clicked.connect(self.generateClicked)
 		self.solveButton.clicked.connect(self.solveClicked)
 		self.clearButton.clicked.connect(self.clearClicked)
+		self.cancelButton.clicked.connect(self.cancelClicked)
+		self.cancelButton.setEnabled(False)
+
+		self.playButton.clicked.connect(self.playClicked)
+		self.stepButton.clicked.connect(self.stepClicked)
+		self.playSlider.valueChanged.connect(self.view.seekEvent)
+		self.playSpeed.valueChanged.connect(self._speedChanged)
+		self.view.eventMoved.connect(self._eventMoved)
+		self._updatePlayback()
 
 		self.randByTime.clicked.connect(self._randbytime)
 		self.randBySeed.clicked.connect(self._randbyseed)
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from convex_hull_core import *
+from hull_algorithms import chan, choose_engine, monotone_chain, quickhull
+from hull_stats import HullStats
+from point_generators import DISTRIBUTIONS, generate_points, points_to_list
+from presort import presort
+
+
+#
+# Benchmark suite for the hull engines.  Every engine is run on the distributions the GUI
+# generates plus some degenerate ones (see point_generators), over a range of sizes.
+# Each run records the sort, hull and list-conversion times, the peak memory (in all and
+# per input point), and the empirical constant of O(n log n).  The fastest engine of each
+# distribution and size is reported, with the engine the auto mode picked for it.  Results
+# are written as JSON, and can be compared with a stored baseline to flag regressions.
+#
+# With --tune-base-size, the dc engines are timed instead over a range of base case sizes
+# (see convex_hull_core.DC_BASE_SIZE), reporting the fastest and how many merges it saves.
+# With --save as well, the fastest is saved for the dc engines to use from then on.
+#
+# usage: python benchmark.py [--sizes 10 1000 100000] [--output results.json] [--baseline base.json]
+#        python benchmark.py --tune-base-size [--sizes 100000] [--save]
+#
+
+ENGINES = [ENGINE_DC, ENGINE_DC_ITERATIVE, ENGINE_DC_PARALLEL, ENGINE_DC_ARRAY, ENGINE_NUMPY,
+		   ENGINE_MONOTONE_CHAIN, ENGINE_QUICKHULL, ENGINE_CHAN, ENGINE_AUTO]
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# A run is a regression when it is this many times slower than the baseline...
+DEFAULT_THRESHOLD = 1.25
+# ...and the baseline took at least this long, in seconds, so noise is not flagged
+MIN_COMPARED_TIME = 0.001
+
+# The base case sizes --tune-base-size tries, and the number of points it tries them on
+BASE_SIZES = [1, 2, 4, 8, 12, 16, 24, 32, 48, 64, 96, 128]
+DEFAULT_TUNE_SIZES = [100000]
+
+
+def time_engine(engine: str, points: list) -> dict:
+	"""
+	Times one engine on one problem instance
+
+	:param engine: One of ENGINES
+	:param points: A list of (x, y) tuples, in any order
+	:return: A dict of the sort, hull and list-conversion times, in seconds
+	"""
+	if engine == ENGINE_NUMPY:
+		from convex_hull_np import convex_hull_dc_np
+
+		# the NumPy engine sorts internally, and returns indices to convert
+		t1 = time.perf_counter()
+		indices = convex_hull_dc_np(points)
+		t2 = time.perf_counter()
+		[points[i] for i in indices]
+		t3 = time.perf_counter()
+		return {'sort': None, 'hull': t2 - t1, 'convert': t3 - t2}
+	if engine in (ENGINE_QUICKHULL, ENGINE_CHAN, ENGINE_AUTO):
+		# no sort, and the hull comes back as a list already
+		t1 = time.perf_counter()
+		if engine == ENGINE_AUTO:
+			engine = choose_engine(points)
+		if engine == ENGINE_QUICKHULL:
+			quickhull(points)
+		elif engine == ENGINE_CHAN:
+			chan(points)
+		else:
+			monotone_chain(presort(points)[0])
+		t2 = time.perf_counter()
+		return {'sort': None, 'hull': t2 - t1, 'convert': 0.0}
+
+	t1 = time.perf_counter()
+	sorted_points, _ = presort(points)
+	t2 = time.perf_counter()
+	if engine == ENGINE_MONOTONE_CHAIN:
+		monotone_chain(sorted_points)
+		t3 = time.perf_counter()
+		return {'sort': t2 - t1, 'hull': t3 - t2, 'convert': 0.0}
+	if engine == ENGINE_DC_ARRAY:
+		ring, root = convex_hull_dc_array(sorted_points)
+		t3 = time.perf_counter()
+		convert_ring_to_list(ring, root)
+		t4 = time.perf_counter()
+		return {'sort': t2 - t1, 'hull': t3 - t2, 'convert': t4 - t3}
+	if engine == ENGINE_DC:
+		hull = convex_hull_dc(sorted_points)
+	elif engine == ENGINE_DC_ITERATIVE:
+		hull = convex_hull_dc_iterative(sorted_points)
+	elif engine == ENGINE_DC_PARALLEL:
+		hull = convex_hull_dc_parallel(sorted_points)
+	else:
+		raise ValueError('Unknown hull engine: {}'.format(engine))
+	t3 = time.perf_counter()
+	convert_nodes_to_list(hull.root)
+	t4 = time.perf_counter()
+	return {'sort': t2 - t1, 'hull': t3 - t2, 'convert': t4 - t3}
+
+
+def peak_memory(engine: str, points: list) -> int:
+	"""
+	Measures the peak memory allocated by one engine on one problem instance
+
+	Run apart from the timings, since tracing allocations slows everything down.
+
+	:return: The peak traced memory, in bytes
+	"""
+	tracemalloc.start()
+	try:
+		time_engine(engine, points)
+		return tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+
+
+def merge_stats(engine: str, points: list):
+	"""
+	Counts the merge steps of one engine on one problem instance
+
+	Run apart from the timings, since counting slows the merges down.
+
+	:return: A hull_stats.HullStats, or None for engines that can't be instrumented
+	"""
+	if engine not in (ENGINE_DC, ENGINE_DC_ITERATIVE):
+		return None
+	stats = HullStats()
+	sorted_points, _ = presort(points)
+	if engine == ENGINE_DC:
+		convex_hull_dc(sorted_points, stats)
+	else:
+		convex_hull_dc_iterative(sorted_points, stats)
+	return stats
+
+
+def tune_base_size(distributions: list, sizes: list, base_sizes: list = BASE_SIZES, repeat: int = 3,
+				   seed: int = 0, log=print) -> list:
+	"""
+	Times the dc engines over a range of base case sizes
+
+	Each base size is scored by its total time over every distribution and size, the fastest
+	of repeat runs of each engine on each.
+
+	:param base_sizes: The values of base_size to try
+	:param log: Called with a line of text after each base size
+	:return: A list of dicts of the base size, its total time and merges for each engine,
+			 in the order of base_sizes
+	"""
+	instances = [presort(points_to_list(generate_points(distribution, n, seed)))[0]
+				 for distribution in distributions for n in sizes]
+	engines = [(ENGINE_DC, convex_hull_dc), (ENGINE_DC_ITERATIVE, convex_hull_dc_iterative)]
+	results = []
+	for base_size in base_sizes:
+		result = {'base_size': base_size}
+		for engine, solve in engines:
+			total = 0.0
+			stats = HullStats()
+			for sorted_points in instances:
+				runs = []
+				for _ in range(repeat):
+					t1 = time.perf_counter()
+					solve(sorted_points, base_size=base_size)
+					runs.append(time.perf_counter() - t1)
+				total += min(runs)
+				solve(sorted_points, stats, base_size=base_size)
+			result[engine] = total
+			result[engine + '_merges'] = stats.merges
+		results.append(result)
+		log(format_tuning(result, results[0]))
+	return results
+
+
+def best_base_size(tuning: list) -> dict:
+	"""
+	:param tuning: The results of tune_base_size
+	:return: The result of the base size with the least time over both dc engines
+	"""
+	return min(tuning, key=lambda result: result[ENGINE_DC] + result[ENGINE_DC_ITERATIVE])
+
+
+def format_tuning(result: dict, first: dict) -> str:
+	"""
+	:param first: The result to compare merges with, e.g. that of a base size of 1
+	:return: One line of text describing the times and merges of a base size
+	"""
+	text = 'base size {:>4}'.format(result['base_size'])
+	for engine in (ENGINE_DC, ENGINE_DC_ITERATIVE):
+		merges = result[engine + '_merges']
+		text += '  {} {:9.4f}s {:>9} merges'.format(engine, result[engine], merges)
+		if merges and merges != first[engine + '_merges']:
+			text += ' ({:5.1f}x fewer)'.format(first[engine + '_merges'] / merges)
+	return text
+
+
+def run_benchmarks(engines: list, distributions: list, sizes: list, repeat: int = 3, seed: int = 0,
+				   memory: bool = True, instrument: bool = False, log=print) -> list:
+	"""
+	Runs every engine on every distribution and size
+
+	:param repeat: The number of timed runs of each, of which the fastest is kept
+	:param memory: Whether to measure the peak memory too
+	:param instrument: Whether to count the merge steps too
+	:param log: Called with a line of text after each result
+	:return: A list of result dicts
+	"""
+	results = []
+	for distribution in distributions:
+		for n in sizes:
+			points = points_to_list(generate_points(distribution, n, seed))
+			for engine in engines:
+				result = {'engine': engine, 'distribution': distribution, 'n': n}
+				if engine == ENGINE_AUTO:
+					result['chosen'] = choose_engine(points)
+				try:
+					runs = [time_engine(engine, points) for _ in range(repeat)]
+					best = min(runs, key=_total)
+					result.update(best)
+					result['total'] = _total(best)
+					result['nlogn_constant'] = best['hull'] / (n * math.log2(n)) if n > 1 else None
+					result['peak_memory'] = peak_memory(engine, points) if memory else None
+					result['bytes_per_point'] = result['peak_memory'] / n if memory else None
+					stats = merge_stats(engine, points) if instrument else None
+					result['stats'] = stats.to_dict() if stats is not None else None
+					result['error'] = None
+				except Exception as error:
+					# degenerate inputs some engines can't handle are recorded, not fatal
+					result['error'] = '{}: {}'.format(type(error).__name__, error)
+				results.append(result)
+				log(format_result(result))
+	return results
+
+
+def format_result(result: dict) -> str:
+	"""
+	:return: One line of text describing a result
+	"""
+	name = '{:<14} {:<10} {:>9}'.format(result['engine'], result['distribution'], result['n'])
+	if result['error']:
+		return '{}  FAILED {}'.format(name, result['error'])
+	text = '{}  total {:9.4f}s  hull {:9.4f}s'.format(name, result['total'], result['hull'])
+	if result['sort'] is not None:
+		text += '  sort {:8.4f}s'.format(result['sort'])
+	text += '  convert {:8.4f}s'.format(result['convert'])
+	if result['nlogn_constant'] is not None:
+		text += '  c {:.3e}'.format(result['nlogn_constant'])
+	if result['peak_memory'] is not None:
+		text += '  mem {:8.1f}KB ({:5.0f}B/point)'.format(result['peak_memory'] / 1024, result['bytes_per_point'])
+	if result.get('stats'):
+		text += '  {} merges, {:.2f} steps/node'.format(result['stats']['merges'], result['stats']['steps_per_node'])
+	if result.get('chosen'):
+		text += '  ran {}'.format(result['chosen'])
+	return text
+
+
+def winners(results: list) -> list:
+	"""
+	Finds the fastest engine of each distribution and size, auto aside
+
+	:param results: A list of result dicts
+	:return: A list of dicts of the distribution, size, fastest engine and its total time, and
+			 the engine auto picked (or None if auto wasn't run), in the order of results
+	"""
+	best = {}
+	chosen = {}
+	for result in results:
+		key = result['distribution'], result['n']
+		if result['engine'] == ENGINE_AUTO:
+			chosen[key] = result['chosen']
+			continue
+		best.setdefault(key, None)
+		if not result['error'] and (best[key] is None or result['total'] < best[key]['total']):
+			best[key] = result
+	return [{
+		'distribution': distribution,
+		'n': n,
+		'engine': result['engine'] if result else None,
+		'total': result['total'] if result else None,
+		'auto': chosen.get((distribution, n)),
+	} for (distribution, n), result in best.items()]
+
+
+def format_winner(winner: dict) -> str:
+	"""
+	:return: One line of text describing the fastest engine of a distribution and size
+	"""
+	text = '{:<10} {:>9}  '.format(winner['distribution'], winner['n'])
+	if winner['engine'] is None:
+		return text + 'every engine failed'
+	text += '{:<14} {:9.4f}s'.format(winner['engine'], winner['total'])
+	if winner['auto'] is not None:
+		text += '  auto ran {}'.format(winner['auto'])
+	return text
+
+
+def compare(results: list, baseline: list, threshold: float = DEFAULT_THRESHOLD) -> list:
+	"""
+	Finds the results that regressed against a baseline
+
+	:param results: A list of result dicts
+	:param baseline: A list of result dicts from an earlier run
+	:param threshold: How many times slower than the baseline counts as a regression
+	:return: A list of (result, baseline result) pairs that regressed
+	"""
+	baseline_by_key = {_key(result): result for result in baseline}
+	regressions = []
+	for result in results:
+		base = baseline_by_key.get(_key(result))
+		if base is None or base['error'] or result['error']:
+			if base is not None and result['error'] and not base['error']:
+				# used to work
+				regressions.append((result, base))
+			continue
+		if base['total'] >= MIN_COMPARED_TIME and result['total'] > base['total'] * threshold:
+			regressions.append((result, base))
+	return regressions
+
+
+def _total(run: dict) -> float:
+	return sum(value for value in run.values() if value is not None)
+
+
+def _key(result: dict) -> tuple:
+	return result['engine'], result['distribution'], result['n']
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Benchmark the convex hull engines.')
+	parser.add_argument('--engines', nargs='+', default=ENGINES, choices=ENGINES)
+	parser.add_argument('--distributions', nargs='+', default=DISTRIBUTIONS, choices=DISTRIBUTIONS)
+	parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES,
+						help='numbers of points, e.g. 10 100 ... 10000000')
+	parser.add_argument('--repeat', type=int, default=3)
+	parser.add_argument('--seed', type=int, default=0)
+	parser.add_argument('--no-memory', action='store_true', help='skip measuring peak memory')
+	parser.add_argument('--stats', action='store_true', help='count the merge steps of the dc engines')
+	parser.add_argument('--output', help='write the results to this JSON file')
+	parser.add_argument('--baseline', help='compare the results with this JSON file')
+	parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+	parser.add_argument('--tune-base-size', action='store_true',
+						help='time the dc engines over a range of base case sizes instead (default sizes {})'.format(DEFAULT_TUNE_SIZES))
+	parser.add_argument('--base-sizes', nargs='+', type=int, default=BASE_SIZES, help='the base case sizes to tune over')
+	parser.add_argument('--save', action='store_true',
+						help='with --tune-base-size, save the fastest to {} for the dc engines to use'.format(TUNING_FILE))
+	args = parser.parse_args(argv)
+
+	if args.tune_base_size:
+		sizes = args.sizes if args.sizes != DEFAULT_SIZES else DEFAULT_TUNE_SIZES
+		tuning = tune_base_size(args.distributions, sizes, args.base_sizes, args.repeat, args.seed)
+		best = best_base_size(tuning)
+		print()
+		print('fastest: {}'.format(format_tuning(best, tuning[0])))
+		if args.save:
+			save_base_size(best['base_size'])
+			print('saved base size {} to {} (was {})'.format(best['base_size'], TUNING_FILE, DC_BASE_SIZE))
+		else:
+			print('run with --save to use base size {} (now {})'.format(best['base_size'], DC_BASE_SIZE))
+		if args.output:
+			with open(args.output, 'w') as file:
+				json.dump({
+					'python': platform.python_version(),
+					'platform': platform.platform(),
+					'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+					'base_sizes': tuning,
+					'best_base_size': best['base_size'],
+				}, file, indent=1)
+		return 0
+
+	results = run_benchmarks(args.engines, args.distributions, args.sizes, args.repeat, args.seed,
+							 memory=not args.no_memory, instrument=args.stats)
+
+	fastest = winners(results)
+	print()
+	print('fastest engines:')
+	for winner in fastest:
+		print(format_winner(winner))
+
+	if args.output:
+		with open(args.output, 'w') as file:
+			json.dump({
+				'python': platform.python_version(),
+				'platform': platform.platform(),
+				'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+				'results': results,
+				'winners': fastest,
+			}, file, indent=1)
+
+	if args.baseline:
+		with open(args.baseline) as file:
+			baseline = json.load(file)['results']
+		regressions = compare(results, baseline, args.threshold)
+		for result, base in regressions:
+			if result['error']:
+				print('REGRESSION {}: now fails with {}'.format(_key(result), result['error']))
+			else:
+				print('REGRESSION {}: {:.4f}s -> {:.4f}s ({:.2f}x)'.format(
+					_key(result), base['total'], result['total'], result['total'] / base['total']))
+		if regressions:
+			return 1
+		print('no regressions against {}'.format(args.baseline))
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -1,4 +1,8 @@
 import random
+import sys
+import threading
+from array import array
+from itertools import chain
 
 from which_pyqt import PYQT_VER
 if PYQT_VER == 'PYQT5':
@@ -12,21 +16,26 @@ else:
 
 
 import time
-from typing import Tuple
+
+# The Qt-free algorithm core; re-exported here for the GUI
+from convex_hull_core import *
+from hull_algorithms import chan, choose_engine, compute_hull_points, monotone_chain, quickhull, vertex_indices
+from hull_cache import HullCache, points_key, generator_key
+from hull_events import *
+from hull_stats import HullStats
+from presort import presort, SORT_AUTO, SORT_TIMSORT, SORT_ARGSORT, SORT_RADIX, SORT_BUCKET
 
 # Some global color constants that might be useful
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 
-# Global variable that controls the speed of the recursion automation, in seconds
-PAUSE = 0.25
+# Global variable that controls the speed of the recursion animation: seconds per event of
+# the merge log, played back at speed 1 (see hull_events and PointLineView.playEvents)
+PAUSE = 0.05
 
-# Constants for the program
-FAILURE = -1
-ABOVE = 1
-ON = 0
-BELOW = -1
+# Range of the coordinates of the points the GUI generates, for bucket sorting
+COORDINATE_BOUNDS = (-1.0, 1.0)
 
 
 #
@@ -38,14 +47,22 @@ class ConvexHullSolver(QObject):
 	def __init__(self):
 		super().__init__()
 		self.pause = False
+		# the merge events of the last compute_hull with pause set, for the view to play back
+		self.events = None
+		# solved hulls, so the same points aren't solved twice - set to None to always solve
+		self.cache = HullCache()
+		# set from another thread to stop compute_hull with HullCancelled (see hull_worker)
+		self.cancelled = threading.Event()
+		# the hull lines drawn, by their endpoints, since the view erases lines by identity
+		self.hullLines = {}
+		# the merge counters of the last compute_hull(instrument=True), or None
+		self.stats = None
 
 # Some helper methods that make calls to the GUI, allowing us to send updates
 # to be displayed.
 
 	def showTangent(self, line, color):
 		self.view.addLines(line, color)
-		if self.pause:
-			time.sleep(PAUSE)
 
 	def eraseTangent(self, line):
 		self.view.clearLines(line)
@@ -55,386 +72,220 @@ class ConvexHullSolver(QObject):
 		self.eraseTangent(line)
 
 	def showHull(self, polygon, color):
+		for line in polygon:
+			self.hullLines[(line.x1(), line.y1()), (line.x2(), line.y2())] = line
 		self.view.addLines(polygon, color)
-		if self.pause:
-			time.sleep(PAUSE)
 
 	def eraseHull(self, polygon):
+		for line in polygon:
+			self.hullLines.pop(((line.x1(), line.y1()), (line.x2(), line.y2())), None)
 		self.view.clearLines(polygon)
 
+	def showHullChange(self, change, color):
+		# redraw only the edges a DynamicConvexHull insert/delete changed, erasing the
+		# very QLineF objects that were drawn for them
+		if change.removed:
+			self.eraseHull([self.hullLines[edge] for edge in change.removed if edge in self.hullLines])
+		if change.added:
+			self.showHull([QLineF(QPointF(*a), QPointF(*b)) for a, b in change.added], color)
+
 	def showText(self, text):
 		self.view.displayStatusText(text)
 
+	def checkCancelled(self):
+		# between phases - the engines also check during their merges
+		check_cancelled(self.cancelled)
+
 	# This is the method that gets called by the GUI and actually executes
-	# the finding of the hull
-	def compute_hull(self, points, pause, view):
+	# the finding of the hull.  points may be an (N, 2) float64 NumPy array, a flat
+	# array('d') of x, y pairs (or any other buffer of doubles), or a list of QPointF
+	# objects or (x, y) tuples.  Returns the hull as a list of indices into points, in
+	# clockwise order.  With pause set, the merges of the dc engines are logged in
+	# self.events at full speed, for the view to animate afterwards
+	def compute_hull(self, points, pause, view, engine=DEFAULT_ENGINE, prefilter=False, sort=SORT_AUTO, instrument=False, exact=False, cache_key=None):
 		self.pause = pause
 		self.view = view
-		assert(type(points) == list and type(points[0]) == QPointF)
-
+		self.hullLines = {}
+		self.stats = None
+		self.events = None
+
+		# Leave Qt behind for the algorithm core: a flat view of the caller's doubles, not a copy
+		values = as_coordinates(points)
+		npoints = len(values) // 2
+
+		# a hull solved before is drawn straight from the cache (not when counting or logging merges)
+		key = None
+		if self.cache is not None and not instrument and not pause:
+			t1 = time.time()
+			# e.g. generator_key(distribution, npoints, seed), else a fingerprint of the points
+			key = (cache_key if cache_key is not None else points_key(values), exact)
+			hull = self.cache.get(key)
+			if hull is not None:
+				self.showHull(self.to_polygon(values, hull), RED)
+				self.showText('Time Elapsed (Cache hit): {:3.3f} sec, {}'.format(time.time() - t1, self.cache))
+				return hull
+
+		# the engines other than NumPy's take (x, y) tuples, made only for the points they need
 		t1 = time.time()
-		# Sort the points by increasing x-value
-		sorted_points = sorted(points, key=lambda point: point.x())
+		subset = None
+		coords = None
+		if engine != ENGINE_NUMPY:
+			if prefilter:
+				# throw out the points inside the extreme octagon, they can't be on the hull
+				subset, coords = prefilter_points(values)
+			else:
+				coords = list(zip(values[0::2].tolist(), values[1::2].tolist()))
 		t2 = time.time()
+		self.checkCancelled()
+
+		# counters for the merges, when asked for, and the log of the merges to animate (dc engines only)
+		stats = HullStats() if instrument else None
+		events = HullEvents() if pause else None
 
+		sort_time = None
 		t3 = time.time()
-		# find the convex hull of the set of sorted points
-		convex_hull_node = convex_hull_dc(sorted_points)
-		# convert the nodes to a list (for compatibility with gui)
-		convex_hull_list = convert_nodes_to_list(convex_hull_node)
-		# draw lines between the points
-		polygon = [QLineF(convex_hull_list[i], convex_hull_list[(i + 1) % len(convex_hull_list)]) for i in range(len(convex_hull_list))]
+		if engine == ENGINE_AUTO:
+			# from the number of points, and a sample estimate of the number on the hull
+			engine = choose_engine(coords)
+		if engine == ENGINE_NUMPY:
+			# the NumPy engine reads the caller's buffer, sorts internally and returns hull indices
+			# (and pre-filters on the arrays it sorts, when asked to)
+			hull = compute_hull_np(values, exact, prefilter, self.cancelled).tolist()
+		elif not coords:
+			hull = []
+		else:
+			if engine == ENGINE_QUICKHULL:
+				convex_hull_coords = quickhull(coords, exact)
+			elif engine == ENGINE_CHAN:
+				convex_hull_coords = chan(coords, exact)
+			elif engine in (ENGINE_DC, ENGINE_DC_ITERATIVE, ENGINE_DC_PARALLEL, ENGINE_DC_ARRAY, ENGINE_MONOTONE_CHAIN):
+				# Sort the points by increasing x-value, then y-value, dropping repeated points
+				sorted_points, sort = presort(coords, sort, bounds=COORDINATE_BOUNDS)
+				sort_time = time.time() - t3
+				self.checkCancelled()
+
+				# find the convex hull of the set of sorted points, and convert it to a list
+				if engine == ENGINE_MONOTONE_CHAIN:
+					convex_hull_coords = monotone_chain(sorted_points, exact)
+				elif engine == ENGINE_DC_ARRAY:
+					ring, root = convex_hull_dc_array(sorted_points, exact, self.cancelled)
+					convex_hull_coords = convert_ring_to_list(ring, root)
+				else:
+					if engine == ENGINE_DC:
+						convex_hull = convex_hull_dc(sorted_points, stats, exact=exact, cancelled=self.cancelled, events=events)
+					elif engine == ENGINE_DC_PARALLEL:
+						convex_hull = convex_hull_dc_parallel(sorted_points, exact=exact, cancelled=self.cancelled)
+					else:
+						convex_hull = convex_hull_dc_iterative(sorted_points, stats, exact, self.cancelled, events)
+					convex_hull_coords = convert_nodes_to_list(convex_hull.root)
+			else:
+				raise ValueError('Unknown hull engine: {}'.format(engine))
+
+			# back to indices into the caller's points
+			hull = vertex_indices(coords, convex_hull_coords)
+			if subset is not None:
+				hull = [subset[i] for i in hull]
+		polygon = self.to_polygon(values, hull)
 		t4 = time.time()
+		self.checkCancelled()
+
+		if key is not None:
+			self.cache.put(key, hull)
+		self.stats = stats
+		if events is not None and len(events):
+			self.events = events
 
 		# when passing lines to the display, pass a list of QLineF objects.  Each QLineF
 		# object can be created with two QPointF objects corresponding to the endpoints
 		self.showHull(polygon, RED)
-		self.showText('Time Elapsed (Convex Hull): {:3.3f} sec'.format(t4-t3))
-
-
-class PointNode:
-	"""
-	Represents a point in a convex hull
-
-	clockwise: The following node in clockwise direction
-	counter_clockwise: The following node in counter-clockwise direction
-	"""
-	point = None
-	clockwise = None
-	counter_clockwise = None
-
-	def __init__(self, point: QPointF):
-		self.point = point
-
+		if sort_time is None:
+			text = 'Time Elapsed (Convex Hull, {}): {:3.3f} sec'.format(engine, t4-t3)
+		else:
+			text = 'Time Elapsed (Sort, {}): {:3.3f} sec, (Convex Hull, {}): {:3.3f} sec'.format(sort, sort_time, engine, t4-t3-sort_time)
+		if prefilter and engine == ENGINE_NUMPY:
+			text += ', Pre-filter: in the hull time'
+		elif prefilter:
+			text += ', Pre-filter: {:3.3f} sec, discarded {} of {} points'.format(t2-t1, npoints - len(coords), npoints)
+		self.showText(text)
 
-def convert_nodes_to_list(start_node: PointNode) -> list:
-	"""
-	Returns a list of QPointF objects, given a point in a convex hull
-
-	:param start_node: Any point in a convex hull
-	:return: A list of QPointF objects composing the convex hull
-	"""
-	points = []
-
-	curr_node = start_node
-	while True:
-		points.append(curr_node.point)
+		return hull
 
-		# increment and check if tried every point
-		curr_node = curr_node.clockwise
-		if curr_node is start_node:
-			break
+	def to_polygon(self, values, hull):
+		# one QLineF per hull edge, read straight from the coordinates (for compatibility with gui)
+		ends = hull[1:] + hull[:1]
+		return [QLineF(values[2 * a], values[2 * a + 1], values[2 * b], values[2 * b + 1]) for a, b in zip(hull, ends)]
 
-	return points
 
-
-def convex_hull_dc(sorted_points_list: list) -> PointNode:
+def as_coordinates(points) -> memoryview:
 	"""
-	A divide and conquer approach to finding a convex hull
+	Views points as a flat buffer of x, y doubles, without copying them where possible
 
-	:param sorted_points_list: A list of QPointF objects from which to find the convex hull, sorted by x-value
-	:return: The root node of the resulting convex hull
+	:param points: An (N, 2) float64 array, a flat array('d') of x, y pairs or any other
+				   C-contiguous buffer of doubles, or a list of QPointF objects or (x, y) tuples
+	:return: A 1-D memoryview of format 'd', x0, y0, x1, y1, ...
 	"""
-	# base case - a hull of 1 point
-	if len(sorted_points_list) == 1:
-		# when a hull has only 1 point, we create a new node whose left & right values are itself
-		one_node_hull = PointNode(sorted_points_list[0])
-		one_node_hull.clockwise = one_node_hull
-		one_node_hull.counter_clockwise = one_node_hull
-
-		return one_node_hull
-
-	# divide into two hulls and solve
-	middle_index = len(sorted_points_list) // 2
-	left_hull = convex_hull_dc(sorted_points_list[0:middle_index])
-	right_hull = convex_hull_dc(sorted_points_list[middle_index:len(sorted_points_list)])
-
-	# combine the hulls together
-	return combine(left_hull, right_hull)
-
-
-def find_upper_tangent(left_hull_node: PointNode, right_hull_node: PointNode) -> Tuple[PointNode, PointNode]:
+	if isinstance(points, list):
+		if points and isinstance(points[0], QPointF):
+			points = [(point.x(), point.y()) for point in points]
+		return memoryview(array('d', chain.from_iterable(points)))
+
+	view = memoryview(points)
+	if view.format != 'd' or not view.c_contiguous:
+		# e.g. float32 or strided arrays, which are copied once
+		import numpy as np
+		view = memoryview(np.ascontiguousarray(points, dtype=np.float64))
+	if view.nbytes == 0:
+		return memoryview(array('d'))
+	values = view.cast('B').cast('d')
+	if len(values) % 2:
+		raise ValueError('Points must be x, y pairs, got {} values'.format(len(values)))
+	return values
+
+
+def compute_hull_np(points, exact: bool = False, prefilter: bool = False, cancelled=None):
 	"""
-	Finds the upper tangent of two convex hulls
+	Runs the NumPy engine (convex_hull_np) on any points compute_hull takes
 
-	:param left_hull_node: Any node in the left convex hull (rightmost Node)
-	:param right_hull_node: Any node in the right convex hull (leftmost Node)
-	:return: A tuple of PointNode objects of the left and right points of the upper tangent
+	:param points: A buffer of x, y doubles, or a list of QPointF objects or (x, y) tuples (see as_coordinates)
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param prefilter: Whether to discard the points inside the extreme octagon first
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:return: An array of indices into points, composing the convex hull in clockwise order
 	"""
-	# find rightmost point in left_hull and leftmost point in right hull
-	left_node = to_rightmost_node(left_hull_node)
-	right_node = to_leftmost_node(right_hull_node)
-
-	# starting line between innermost nodes of the hulls
-	curr_line = QLineF(left_node.point, right_node.point)
-
-	# will be compared to that of any potential tangent while "walking"
-	curr_slope = (curr_line.y2() - curr_line.y1()) / (curr_line.x2() - curr_line.x1())
-
-	# alternate walking left and right hulls until upper tangent found
-	done = 0
-	while not done:
-		done = 1
-		# walk up left hull
-		while True:
-			# potential point for walking UP left hull
-			new_left = left_node.counter_clockwise
-
-			# slope of the new line walked UP to the left
-			new_slope = (curr_line.p2().y() - new_left.point.y()) / (curr_line.p2().x() - new_left.point.x())
-			if new_slope < curr_slope:
-				# new slope is closer to being the tangent - keep it
-				curr_line.setP1(new_left.point)
-				left_node = new_left
-				curr_slope = new_slope
-
-				done = 0
-			else:
-				# curr_line is upper tangent to left hull
-				break
-		# walk up right hull
-		while True:
-			# potential point for walking UP right hull
-			new_right = right_node.clockwise
-
-			# slope of the new line walked UP to the right
-			new_slope = (new_right.point.y() - curr_line.p1().y()) / (new_right.point.x() - curr_line.p1().x())
-			if new_slope > curr_slope:
-				# new slope is closer to being the tangent - keep it
-				curr_line.setP2(new_right.point)
-				right_node = new_right
-				curr_slope = new_slope
-
-				done = 0
-			else:
-				# curr_line is upper tangent to right hull
-				break
-	return left_node, right_node
+	# imported here so NumPy is only needed when this engine is picked
+	import numpy as np
+	from convex_hull_np import convex_hull_dc_np
 
+	# the points are read where they are, not copied
+	xy = np.frombuffer(as_coordinates(points), dtype=np.float64).reshape(-1, 2)
+	if len(xy) == 0:
+		return np.zeros(0, dtype=np.intp)
+	return convex_hull_dc_np(xy, prefilter=prefilter, exact=exact, cancelled=cancelled)
 
-def find_lower_tangent(left_hull_node: PointNode, right_hull_node: PointNode) -> Tuple[PointNode, PointNode]:
-	"""
-	Finds the lower tangent of two convex hulls
 
-	:param left_hull_node: Any node in the left convex hull
-	:param right_hull_node: Any node in the right convex hull
-	:return: A tuple of PointNode objects of the left and right points of the lower tangent
+def prefilter_points(values) -> tuple:
 	"""
-	# find rightmost point in left_hull and leftmost point in right hull
-	left_node = to_rightmost_node(left_hull_node)
-	right_node = to_leftmost_node(right_hull_node)
-
-	# starting line between innermost nodes of the hulls
-	curr_line = QLineF(left_node.point, right_node.point)
-
-	# will be compared to that of any potential tangent while "walking"
-	curr_slope = (curr_line.y2() - curr_line.y1()) / (curr_line.x2() - curr_line.x1())
-
-	# alternate walking left and right hulls until lower tangent found
-	done = 0
-	while not done:
-		done = 1
-		# walk down left hull
-		while True:
-			# potential point for walking DOWN left hull
-			new_left = left_node.clockwise
-
-			# slope of the new line walked DOWN to the left
-			new_slope = (curr_line.p2().y() - new_left.point.y()) / (curr_line.p2().x() - new_left.point.x())
-			if new_slope > curr_slope:
-				# new slope is closer to being the tangent - keep it
-				curr_line.setP1(new_left.point)
-				left_node = new_left
-				curr_slope = new_slope
-
-				done = 0
-			else:
-				# curr_line is lower tangent to left hull
-				break
-		# walk down right hull
-		while True:
-			# potential point for walking DOWN right hull
-			new_right = right_node.counter_clockwise
-
-			# slope of the new line walked DOWN to the right
-			new_slope = (new_right.point.y() - curr_line.p1().y()) / (new_right.point.x() - curr_line.p1().x())
-			if new_slope < curr_slope:
-				# new slope is closer to being the tangent - keep it
-				curr_line.setP2(new_right.point)
-				right_node = new_right
-				curr_slope = new_slope
-
-				done = 0
-			else:
-				# curr_line is lower tangent to right hull
-				break
-	return left_node, right_node
+	Discards the points strictly inside the extreme octagon, like akl_toussaint_filter
 
+	Runs the vectorized convex_hull_np.akl_toussaint_mask when NumPy is installed, which is
+	several times faster than the pure-Python filter it falls back on, and makes (x, y)
+	tuples of the surviving points only.
 
-def combine(left_hull_node: PointNode, right_hull_node: PointNode) -> PointNode:
+	:param values: A flat buffer of x, y doubles, from as_coordinates
+	:return: A tuple of a list of the indices of the points that may be on the convex hull, in
+			 their original order, and a list of those points as (x, y) tuples
 	"""
-	Combines two hulls by finding upper and lower tangents and removing nodes
-	that are no longer part of the combined hull
+	try:
+		import numpy as np
+		from convex_hull_np import akl_toussaint_mask
+	except ImportError:
+		coords = list(zip(values[0::2].tolist(), values[1::2].tolist()))
+		survivors = akl_toussaint_filter(coords)
+		return vertex_indices(coords, survivors), survivors
 
-	:param left_hull_node: Any PointNode in the hull left hull to combine (rightmost point)
-	:param right_hull_node: Any PointNode in the right hull to combine (leftmost point)
-	:return: The root PointNode of the combined hull
-	"""
-	# find tangents
-	upper_left, upper_right = find_upper_tangent(left_hull_node, right_hull_node)
-	lower_left, lower_right = find_lower_tangent(left_hull_node, right_hull_node)
-
-	# connect the hulls by pointing tangent points to each other rather
-	upper_left.clockwise = upper_right
-	upper_right.counter_clockwise = upper_left
-	lower_left.counter_clockwise = lower_right
-	lower_right.clockwise = lower_left
-
-	return upper_left
-
-
-def to_leftmost_node(root_node: PointNode) -> PointNode:
-	"""
-	Rotates through the convex hull to the leftmost node\n
-
-	:param root_node: A node in the convex hull
-	:return: The leftmost node in the same convex hull as root_node
-	"""
-	curr_node = root_node
-	curr_x = root_node.point.x()
-	while curr_node.clockwise.point.x() < curr_x:
-		# bottom of the hull - rotate clockwise
-		curr_node = curr_node.clockwise
-		curr_x = curr_node.point.x()
-	while curr_node.counter_clockwise.point.x() < curr_x:
-		# top of the hull - rotate counter-clockwise
-		curr_node = curr_node.counter_clockwise
-		curr_x = curr_node.point.x()
-
-	return curr_node
-
-
-def to_rightmost_node(root_node: PointNode) -> PointNode:
-	"""
-	Rotates through the convex hull to the rightmost node\n
-
-	:param root_node: A node in the convex hull
-	:return: The rightmost node in the same convex hull as root_node
-	"""
-	curr_node = root_node
-	curr_x = root_node.point.x()
-	while curr_node.clockwise.point.x() > curr_x:
-		# top of the hull - rotate clockwise
-		curr_node = curr_node.clockwise
-		curr_x = curr_node.point.x()
-	while curr_node.counter_clockwise.point.x() > curr_x:
-		# bottom of the hull - rotate counter-clockwise
-		curr_node = curr_node.counter_clockwise
-		curr_x = curr_node.point.x()
-
-	return curr_node
-
-
-# def is_upper_tangent(point_in_hull: PointNode, tangent_left: QPointF, tangent_right: QPointF) -> bool:
-# 	"""
-# 	Finds if the tangent is above of all points on the list
-#
-# 	:param point_in_hull: Any point of the hull which will be compared to tangent line, as a PointNode
-# 	:param tangent_left: The left point of the tangent, as a QPointF
-# 	:param tangent_right: The right point of the tangent, as a QPointF
-# 	:return: Whether the tangent is above all points on the list
-# 	"""
-# 	m = find_slope(tangent_left, tangent_right)
-# 	b = find_y_intercept(m, tangent_left)
-#
-# 	# check if each point in the hull is below the tangent
-# 	curr_point = point_in_hull
-# 	while True:
-# 		if above_or_below(m, b, curr_point.point) == ABOVE:
-# 			# not an upper tangent for at least this point
-# 			return False
-#
-# 		# increment and check if tried every point
-# 		curr_point = curr_point.clockwise
-# 		if curr_point is point_in_hull:
-# 			break
-#
-# 	# all points were on or below
-# 	return True
-
-
-# def is_lower_tangent(point_in_hull: PointNode, tangent_left: QPointF, tangent_right: QPointF) -> bool:
-# 	"""
-# 	Finds if the tangent is below of all points on the list
-#
-# 	:param point_in_hull: Any point of the hull which will be compared to tangent line, as a PointNode
-# 	:param tangent_left: The left point of the tangent, as a QPointF
-# 	:param tangent_right: The right point of the tangent, as a QPointF
-# 	:return: Whether the tangent is below all points on the list
-# 	"""
-#
-# 	m = find_slope(tangent_left, tangent_right)
-# 	b = find_y_intercept(m, tangent_left)
-#
-# 	# check if each point in the hull is above the tangent
-# 	curr_point = point_in_hull
-# 	while True:
-# 		if above_or_below(m, b, curr_point.point) == BELOW:
-# 			# not a lower tangent for at least this point
-# 			return False
-#
-# 		# increment and check if tried every point
-# 		curr_point = curr_point.clockwise
-# 		if curr_point is point_in_hull:
-# 			break
-#
-# 	# all points were on or above
-# 	return True
-
-
-# def above_or_below(m: float, b: float, point: QPointF) -> int:
-# 	"""
-# 	y_0 >/=/< m(x_0) + b
-#
-# 	:param m: The slope, as a float
-# 	:param b: The y-intercept, as a float
-# 	:param point: The point to compare to the tangent line, as a QPointF
-# 	:return: ABOVE (1), ON (0), or BELOW (-1)
-# 	"""
-# 	y_0 = point.y()
-# 	result = m * point.x() + b
-# 	# print(f"y_0: {y_0}, result: {result}")
-# 	if abs(y_0 - result) < 0.0000001: # 0.0000000001
-# 		# print("   ON")
-# 		return ON
-# 	elif y_0 > result:
-# 		# print("   ABOVE")
-# 		return ABOVE
-# 	elif y_0 < result:
-# 		# print("   BELOW")
-# 		return BELOW
-
-
-# def find_slope(tangent_left: QPointF, tangent_right: QPointF) -> float:
-# 	"""
-# 	m = (y_2 - Y_1) / (x_2 - x_1)
-#
-# 	:param tangent_left: The left point on the tangent, as a QPointF
-# 	:param tangent_right: The right point on the tangent, as a QPointF
-# 	:return: The slope, as a float
-# 	"""
-# 	return (tangent_right.y() - tangent_left.y()) / (tangent_right.x() - tangent_left.x())
-
-
-# def find_y_intercept(m: float, point_on_tangent: QPointF) -> float:
-# 	"""
-# 	b = y_1 - (m * x_1)
-#
-# 	:param m: The slope
-# 	:param point_on_tangent: Either point on the tangent, as a QPointF
-# 	:return: The y-intercept, as a float
-# 	"""
-# 	return point_on_tangent.y() - (m * point_on_tangent.x())
+	xy = np.frombuffer(values, dtype=np.float64).reshape(-1, 2)
+	survivors = np.flatnonzero(akl_toussaint_mask(xy[:, 0], xy[:, 1]))
+	return survivors.tolist(), list(zip(xy[survivors, 0].tolist(), xy[survivors, 1].tolist()))
 
 
 if __name__ == "__main__":
@@ -442,15 +293,18 @@ if __name__ == "__main__":
 	# sorted_points = [QPointF(1.000001, 2.000001), QPointF(2.000001, 3.000001), QPointF(2.500004, 2.000001), QPointF(3.000005, 1.000001), QPointF(3.500005, 3.000001), QPointF(4.00002, 4.000001), QPointF(5.002, 2.000001), QPointF(6.0005, 3.000001)]
 	# sorted_points = [QPointF(-0.8346014684451692, 0.11172643811141669), QPointF(-0.8040451631412548,-0.2748520657076059), QPointF(-0.1248416717398606, -0.3760631777812582), QPointF(0.03115216321399039, 0.9751813280210595), QPointF(0.4523649013590423, 0.1558272297975385)]
 	# sorted_points = [QPointF(-0.6726141353934931, -0.021656509885807473), QPointF(-0.3588946762474199, -0.48025045570101055), QPointF(-0.20384115482678244, -0.3015934861352687), QPointF(0.20213023654773443, -0.09789206232693326)]
+	# usage: python convex_hull.py [dc|dc_iterative|dc_parallel|dc_array|numpy|monotone_chain|quickhull|chan|auto]
+	engine = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_ENGINE
 	sorted_points = []
 	for i in range(100000):
-		sorted_points.append(QPointF(i, random.randrange(300)))
+		sorted_points.append((float(i), float(random.randrange(300))))
 	print("done generating")
 	print(len(sorted_points))
 	t1 = time.time()
-	node = convex_hull_dc(sorted_points)
+	# the points are generated in sorted order, with no repeats
+	hull_points = compute_hull_points(sorted_points, engine, presorted=True)
 	t2 = time.time()
-	print("done finding convex_hull: time: ", str(t2 - t1))
-	hull_points = convert_nodes_to_list(node)
-	print(hull_points)
+	print("done finding convex_hull ({}): time: ".format(engine), str(t2 - t1))
+	# the hull itself can be long: write it to a file with hull_cli.py instead
+	print("{} points on the hull, from {} to {}".format(len(hull_points), hull_points[0], hull_points[-1]))
 
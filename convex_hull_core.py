@@ -0,0 +1,993 @@
+import json
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice, repeat
+from operator import attrgetter
+from typing import Tuple
+
+
+#
+# The divide and conquer convex hull algorithm.  This module is free of Qt, so it can be
+# imported by headless workers without loading PyQt.  Points are (x, y) tuples of floats,
+# and the coordinates are stored directly on each PointNode of a hull.  The conversion
+# to and from QPointF/QLineF is done at the GUI boundary, in convex_hull.ConvexHullSolver.
+#
+# The engines take points sorted by x-value, then y-value, with no point repeated (see
+# presort.presort).  Points may share x-values, and collinear points are left out of a hull.
+#
+
+# The hull engines compute_hull can pick from
+ENGINE_DC = 'dc'						# convex_hull_dc, recursive
+ENGINE_DC_ITERATIVE = 'dc_iterative'	# convex_hull_dc_iterative, bottom-up with no recursion
+ENGINE_DC_PARALLEL = 'dc_parallel'		# convex_hull_dc_parallel, one chunk per core
+ENGINE_DC_ARRAY = 'dc_array'			# convex_hull_dc_array, on a PointRing of index links
+ENGINE_NUMPY = 'numpy'					# convex_hull_dc_np, on NumPy index arrays
+ENGINE_MONOTONE_CHAIN = 'monotone_chain'	# hull_algorithms.monotone_chain, one pass over the sorted points
+ENGINE_QUICKHULL = 'quickhull'			# hull_algorithms.quickhull, on unsorted points
+ENGINE_CHAN = 'chan'					# hull_algorithms.chan, O(n log h) on unsorted points
+ENGINE_AUTO = 'auto'					# hull_algorithms.choose_engine picks one of the above
+DEFAULT_ENGINE = ENGINE_DC_ITERATIVE
+
+# Below this many points per worker, convex_hull_dc_parallel solves on a single core
+MIN_PARALLEL_CHUNK = 10000
+
+# Up to this many points, convex_hull_dc and convex_hull_dc_iterative build a hull in one
+# pass (see convex_hull_base) rather than merging hulls of 1 point.  1 merges all the way
+# down.  16 was the fastest measured, at 1/4 the time of 1 with 1/12 the merges; running
+# benchmark.py --tune-base-size --save writes the fastest on a machine to TUNING_FILE,
+# which is read in its place
+DEFAULT_DC_BASE_SIZE = 16
+TUNING_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hull_tuning.json')
+
+# The sorted points of convex_hull_dc_parallel, in its forked workers
+_shared_points = None
+
+# A cancellable engine checks its cancelled flag about once per this many points merged
+CANCEL_CHECK_SIZE = 4096
+
+# Relative error bound of the floating-point cross product in walk_tangent: only a result smaller than this times the sum of the magnitudes of
+# its two products may have the wrong sign (Shewchuk's ccwerrboundA, epsilon = 2^-53)
+SIDE_ERROR_BOUND = (3.0 + 16.0 * 2.0 ** -53) * 2.0 ** -53
+
+# Constants for the program
+FAILURE = -1
+ABOVE = 1
+ON = 0
+BELOW = -1
+
+
+def load_base_size(path: str = TUNING_FILE) -> int:
+	"""
+	:return: The base size saved in a tuning file, or DEFAULT_DC_BASE_SIZE without a valid one
+	"""
+	try:
+		with open(path) as file:
+			base_size = json.load(file)['dc_base_size']
+	except (OSError, ValueError, KeyError, TypeError):
+		return DEFAULT_DC_BASE_SIZE
+	if not isinstance(base_size, int) or base_size < 1:
+		return DEFAULT_DC_BASE_SIZE
+	return base_size
+
+
+def save_base_size(base_size: int, path: str = TUNING_FILE):
+	"""
+	Saves a base size for the next imports of this module to use as DC_BASE_SIZE
+	"""
+	with open(path, 'w') as file:
+		json.dump({'dc_base_size': base_size}, file)
+
+
+DC_BASE_SIZE = load_base_size()
+
+
+class HullCancelled(Exception):
+	"""
+	Raised out of an engine whose cancelled flag was set
+	"""
+
+
+class PointNode:
+	"""
+	Represents a point in a convex hull
+
+	x, y: The coordinates of the point, as floats
+	clockwise: The following node in clockwise direction
+	counter_clockwise: The following node in counter-clockwise direction
+	"""
+	__slots__ = ('x', 'y', 'clockwise', 'counter_clockwise')
+
+	def __init__(self, x: float, y: float):
+		self.x = x
+		self.y = y
+		self.clockwise = None
+		self.counter_clockwise = None
+
+
+class Hull:
+	"""
+	A handle on a convex hull, as returned by the divide and conquer engines
+
+	root: The root node of the hull, where convert_nodes_to_list starts
+	leftmost: The node with the smallest x-value (and the smallest y-value of those)
+	rightmost: The node with the largest x-value (and the largest y-value of those)
+	"""
+	__slots__ = ('root', 'leftmost', 'rightmost')
+
+	def __init__(self, root: PointNode, leftmost: PointNode, rightmost: PointNode):
+		self.root = root
+		self.leftmost = leftmost
+		self.rightmost = rightmost
+
+
+class PointRing:
+	"""
+	Hull rings of points, stored as parallel arrays rather than as one PointNode per point
+
+	Point i is (x[i], y[i]), and its clockwise/counter-clockwise neighbours in its hull are
+	clockwise[i] and counter_clockwise[i].  Every point starts as a hull of 1 point, linked
+	to itself.  A hull is then named by the index of any point in it, like a PointNode.
+
+	x, y: The coordinates of the points, as lists of floats
+	clockwise: The index of the following point in clockwise direction, as an array('i')
+	counter_clockwise: The index of the following point in counter-clockwise direction, as an array('i')
+	"""
+	__slots__ = ('x', 'y', 'clockwise', 'counter_clockwise')
+
+	def __init__(self, x: list, y: list):
+		self.x = x
+		self.y = y
+		self.clockwise = array('i', range(len(x)))
+		self.counter_clockwise = array('i', range(len(x)))
+
+
+def convert_nodes_to_list(start_node: PointNode) -> list:
+	"""
+	Returns a list of (x, y) tuples, given a point in a convex hull
+
+	:param start_node: Any point in a convex hull
+	:return: A list of (x, y) tuples composing the convex hull
+	"""
+	points = []
+
+	curr_node = start_node
+	while True:
+		points.append((curr_node.x, curr_node.y))
+
+		# increment and check if tried every point
+		curr_node = curr_node.clockwise
+		if curr_node is start_node:
+			break
+
+	return points
+
+
+def convert_ring_to_list(ring: PointRing, start: int) -> list:
+	"""
+	Returns a list of (x, y) tuples, given a point in a hull ring of a PointRing
+
+	:param ring: The PointRing holding the hull
+	:param start: The index of any point in the hull ring
+	:return: A list of (x, y) tuples composing the convex hull
+	"""
+	x = ring.x
+	y = ring.y
+	clockwise = ring.clockwise
+	points = []
+
+	curr = start
+	while True:
+		points.append((x[curr], y[curr]))
+
+		# increment and check if tried every point
+		curr = clockwise[curr]
+		if curr == start:
+			break
+
+	return points
+
+
+def ring_to_indices(ring: PointRing, start: int) -> list:
+	"""
+	Returns the indices composing a hull ring of a PointRing, given an index in the ring
+
+	:param ring: The PointRing holding the hull
+	:param start: The index of any point in the hull ring
+	:return: A list of indices in clockwise order, beginning with start
+	"""
+	clockwise = ring.clockwise
+	indices = []
+
+	curr = start
+	while True:
+		indices.append(curr)
+
+		# increment and check if tried every index
+		curr = clockwise[curr]
+		if curr == start:
+			break
+
+	return indices
+
+
+def convex_hull_dc(sorted_points_list: list, stats=None, depth: int = 0, exact: bool = False, cancelled=None, events=None,
+				   base_size: int = DC_BASE_SIZE) -> Hull:
+	"""
+	A divide and conquer approach to finding a convex hull
+
+	:param sorted_points_list: A list of distinct (x, y) tuples from which to find the convex hull, sorted
+	:param stats: An optional hull_stats.HullStats to record every merge in
+	:param depth: The recursion depth of this call, 0 at the top
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:param events: An optional hull_events.HullEvents to log every merge in, for animating it
+	:param base_size: Up to this many points, the hull is built directly rather than merged
+	:return: The resulting convex hull
+	"""
+	# base case - few enough points to build the hull in one pass, down to a hull of 1 point
+	if len(sorted_points_list) <= base_size or len(sorted_points_list) == 1:
+		base_hull = convex_hull_base(sorted_points_list, exact)
+		if events is not None and len(sorted_points_list) > 1:
+			events.record_hull(base_hull)
+		return base_hull
+
+	if cancelled is not None and len(sorted_points_list) >= CANCEL_CHECK_SIZE:
+		check_cancelled(cancelled)
+
+	# divide into two hulls and solve
+	middle_index = len(sorted_points_list) // 2
+	left_hull = convex_hull_dc(sorted_points_list[0:middle_index], stats, depth + 1, exact, cancelled, events, base_size)
+	right_hull = convex_hull_dc(sorted_points_list[middle_index:len(sorted_points_list)], stats, depth + 1, exact, cancelled, events, base_size)
+
+	# combine the hulls together
+	return combine(left_hull, right_hull, stats, depth, exact, events)
+
+
+def convex_hull_dc_iterative(sorted_points_list: list, stats=None, exact: bool = False, cancelled=None, events=None,
+							 base_size: int = DC_BASE_SIZE) -> Hull:
+	"""
+	A bottom-up divide and conquer approach to finding a convex hull
+
+	Starts from a hull of each run of base_size points (of 1 point, for a base_size of 1)
+	and combines adjacent pairs of hulls, level by level, until a single hull is left.  Hulls are combined in place in one list,
+	so there is no slicing and no recursion.  The resulting hull is the same as that of
+	convex_hull_dc, though its root node may differ.
+
+	:param sorted_points_list: A list of distinct (x, y) tuples from which to find the convex hull, sorted
+	:param stats: An optional hull_stats.HullStats to record every merge in
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:param events: An optional hull_events.HullEvents to log every merge in, for animating it
+	:param base_size: The number of points of each hull built directly rather than merged
+	:return: The resulting convex hull
+	"""
+	if base_size > 1:
+		# base case for every run of points - a hull built in one pass
+		hulls = []
+		for start in range(0, len(sorted_points_list), base_size):
+			if cancelled is not None and start % CANCEL_CHECK_SIZE < base_size:
+				check_cancelled(cancelled)
+			run = sorted_points_list[start:start + base_size]
+			base_hull = convex_hull_base(run, exact)
+			if events is not None and len(run) > 1:
+				events.record_hull(base_hull)
+			hulls.append(base_hull)
+		return combine_adjacent(hulls, stats, exact, cancelled, events)
+
+	# base case for every point - a hull of 1 point whose left & right values are itself
+	one_node_hulls = []
+	for x, y in sorted_points_list:
+		one_node_hull = PointNode(x, y)
+		one_node_hull.clockwise = one_node_hull
+		one_node_hull.counter_clockwise = one_node_hull
+		one_node_hulls.append(one_node_hull)
+
+	# first level: combine pairs of 1-node hulls, only keeping a handle for each pair
+	count = len(one_node_hulls)
+	depth = (count - 1).bit_length() - 1
+	hulls = []
+	for i in range(0, count - 1, 2):
+		if cancelled is not None and i % CANCEL_CHECK_SIZE == 0:
+			check_cancelled(cancelled)
+		left_node = one_node_hulls[i]
+		right_node = one_node_hulls[i + 1]
+		hulls.append(combine(Hull(left_node, left_node, left_node), Hull(right_node, right_node, right_node), stats, depth, exact, events))
+	if count & 1:
+		last_node = one_node_hulls[-1]
+		hulls.append(Hull(last_node, last_node, last_node))
+
+	return combine_adjacent(hulls, stats, exact, cancelled, events)
+
+
+def combine_adjacent(hulls: list, stats=None, exact: bool = False, cancelled=None, events=None) -> Hull:
+	"""
+	Combines a list of hulls, ordered left to right, into a single hull
+
+	Combines hulls[i] & hulls[i + 1] into hulls[i // 2], level by level, until a single
+	hull remains.  The list is overwritten in the process.
+
+	:param hulls: A list of Hulls, each entirely left of the next
+	:param stats: An optional hull_stats.HullStats to record every merge in
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:param events: An optional hull_events.HullEvents to log every merge in
+	:return: The combined hull
+	"""
+	count = len(hulls)
+	# the merges of the last level are at depth 0, like the top of convex_hull_dc
+	depth = (count - 1).bit_length() - 1
+	while count > 1:
+		for i in range(0, count - 1, 2):
+			if cancelled is not None and i % CANCEL_CHECK_SIZE == 0:
+				check_cancelled(cancelled)
+			hulls[i >> 1] = combine(hulls[i], hulls[i + 1], stats, depth, exact, events)
+		if count & 1:
+			# odd hull out moves up a level unchanged
+			hulls[count >> 1] = hulls[count - 1]
+		count = (count + 1) >> 1
+		depth -= 1
+
+	return hulls[0]
+
+
+def convex_hull_base(sorted_points_list: list, exact: bool = False) -> Hull:
+	"""
+	Builds the convex hull of a few points in one pass, with Andrew's monotone chain
+
+	The base case of convex_hull_dc and convex_hull_dc_iterative: costs no tangent searches,
+	and makes a PointNode only for each vertex of the hull.
+
+	:param sorted_points_list: A non-empty list of distinct (x, y) tuples, sorted
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: The convex hull, with its leftmost node as its root
+	"""
+	upper = monotone_half_chain(sorted_points_list, 1.0, exact)
+	lower = monotone_half_chain(sorted_points_list, -1.0, exact)
+
+	# over the top left to right, then back along the bottom without repeating the ends
+	nodes = [PointNode(x, y) for x, y in chain(upper, lower[-2:0:-1])]
+	previous_node = nodes[-1]
+	for node in nodes:
+		node.counter_clockwise = previous_node
+		previous_node.clockwise = node
+		previous_node = node
+
+	return Hull(nodes[0], nodes[0], nodes[len(upper) - 1])
+
+
+def monotone_half_chain(sorted_points_list: list, sign: float, exact: bool = False) -> list:
+	"""
+	One half of Andrew's monotone chain, for convex_hull_base and hull_algorithms
+
+	:param sorted_points_list: A list of distinct (x, y) tuples, sorted
+	:param sign: 1.0 for the upper chain, -1.0 for the lower chain
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: The chain from the first point to the last, with no collinear vertices
+	"""
+	hull_chain = []
+	for point in sorted_points_list:
+		c_x, c_y = point
+		while len(hull_chain) >= 2:
+			a_x, a_y = hull_chain[-2]
+			b_x, b_y = hull_chain[-1]
+			line_x = b_x - a_x
+			line_y = b_y - a_y
+			side = line_x * (c_y - a_y) - line_y * (c_x - a_x)
+			if exact:
+				side = settle_side(side, line_x, line_y, c_x - a_x, c_y - a_y, a_x, a_y, b_x, b_y, c_x, c_y)
+			# the new point is on or beyond the line through the last two, the last can't be a vertex
+			if sign * side >= 0:
+				hull_chain.pop()
+			else:
+				break
+		hull_chain.append(point)
+	return hull_chain
+
+
+def convex_hull_dc_parallel(sorted_points_list: list, workers: int = None, exact: bool = False, cancelled=None) -> Hull:
+	"""
+	A multi-core divide and conquer approach to finding a convex hull
+
+	Splits the sorted points into one contiguous chunk per worker and solves the chunks in
+	a process pool.  Where workers can be forked, they inherit the points and are sent only
+	the bounds of their chunk, so the parent does no per-point work before they start;
+	elsewhere chunks cross the process boundary as flat array('d') buffers of x, y pairs.
+	Only the hull vertices of each chunk come back, as such a buffer.  The partial hulls
+	are then combined with the usual upper/lower tangent logic.
+
+	:param sorted_points_list: A list of distinct (x, y) tuples from which to find the convex hull, sorted
+	:param workers: The number of worker processes, os.cpu_count() by default
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set - checked
+					  before and after the workers, and during the merges in this process
+	:return: The resulting convex hull
+	"""
+	if workers is None:
+		workers = os.cpu_count() or 1
+	workers = min(workers, len(sorted_points_list) // MIN_PARALLEL_CHUNK)
+	if workers <= 1:
+		return convex_hull_dc_iterative(sorted_points_list, exact=exact, cancelled=cancelled)
+	if cancelled is not None:
+		check_cancelled(cancelled)
+
+	bounds = [len(sorted_points_list) * k // workers for k in range(workers + 1)]
+	if 'fork' in multiprocessing.get_all_start_methods():
+		# forked workers inherit the list, so only the bounds of each chunk are sent
+		context = multiprocessing.get_context('fork')
+		with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+								 initializer=_share_points, initargs=(sorted_points_list,)) as executor:
+			hull_buffers = list(executor.map(_solve_range, bounds[:-1], bounds[1:], repeat(exact)))
+	else:
+		# split into contiguous chunks, each packed as x0, y0, x1, y1, ...
+		chunks = [array('d', chain.from_iterable(islice(sorted_points_list, start, end)))
+				  for start, end in zip(bounds[:-1], bounds[1:])]
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			hull_buffers = list(executor.map(_solve_chunk, chunks, repeat(exact)))
+
+	# rebuild each partial hull as a ring and combine them left to right
+	if cancelled is not None:
+		check_cancelled(cancelled)
+	return combine_adjacent([hull_of_nodes(convert_buffer_to_nodes(buffer)) for buffer in hull_buffers], exact=exact, cancelled=cancelled)
+
+
+def _share_points(sorted_points_list: list):
+	"""
+	Initializer of the forked workers of convex_hull_dc_parallel
+	"""
+	global _shared_points
+	_shared_points = sorted_points_list
+
+
+def _solve_range(start: int, end: int, exact: bool = False) -> array:
+	"""
+	Worker for convex_hull_dc_parallel: solves the shared sorted points in [start, end)
+
+	:return: The chunk's hull vertices in clockwise order, as a flat array('d') of x, y pairs
+	"""
+	hull = convex_hull_dc_iterative(_shared_points[start:end], exact=exact)
+	return array('d', chain.from_iterable(convert_nodes_to_list(hull.root)))
+
+
+def _solve_chunk(chunk: array, exact: bool = False) -> array:
+	"""
+	Worker for convex_hull_dc_parallel: solves one chunk of sorted points
+
+	:param chunk: The chunk's points, as a flat array('d') of x, y pairs
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:return: The chunk's hull vertices in clockwise order, as a flat array('d') of x, y pairs
+	"""
+	hull = convex_hull_dc_iterative(list(zip(chunk[0::2], chunk[1::2])), exact=exact)
+
+	hull_buffer = array('d')
+	for point in convert_nodes_to_list(hull.root):
+		hull_buffer.extend(point)
+	return hull_buffer
+
+
+def convex_hull_dc_array(sorted_points_list: list, exact: bool = False, cancelled=None) -> Tuple[PointRing, int]:
+	"""
+	A divide and conquer approach to finding a convex hull, on a PointRing
+
+	Runs the same merges as convex_hull_dc, but the hull rings are links between indices in
+	two preallocated arrays, so no PointNode or Hull is built per point and the sorted list
+	is never sliced.  The resulting hull and its root are the same as those of convex_hull_dc
+	with a base_size of 1.
+
+	:param sorted_points_list: A list of distinct (x, y) tuples from which to find the convex hull, sorted
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:return: A tuple of the PointRing, whose indices are those of sorted_points_list, and the
+			 index of the root of the hull in it
+	"""
+	ring = PointRing([x for x, _ in sorted_points_list], [y for _, y in sorted_points_list])
+	root, _, _ = ring_hull_range(ring, 0, len(sorted_points_list), exact, cancelled)
+	return ring, root
+
+
+def ring_hull_range(ring: PointRing, start: int, end: int, exact: bool = False, cancelled=None) -> Tuple[int, int, int]:
+	"""
+	Finds the convex hull of the sorted points of a PointRing in the index range [start, end)
+
+	:param ring: The PointRing holding the points, each still a hull of 1 point
+	:param start: The first index of the range
+	:param end: The index past the last of the range
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising HullCancelled when set
+	:return: A tuple of the root, leftmost and rightmost indices of the resulting hull ring
+	"""
+	# base case - a hull of 1 point, already linked to itself
+	if end - start == 1:
+		return start, start, start
+
+	if cancelled is not None and end - start >= CANCEL_CHECK_SIZE:
+		check_cancelled(cancelled)
+
+	# divide into two hulls and solve
+	middle = start + (end - start) // 2
+	left_hull = ring_hull_range(ring, start, middle, exact, cancelled)
+	right_hull = ring_hull_range(ring, middle, end, exact, cancelled)
+
+	# combine the hulls together
+	return combine_ring(ring, left_hull, right_hull, exact)
+
+
+def check_cancelled(cancelled):
+	"""
+	:param cancelled: A threading.Event, or anything with an is_set method
+	:raises HullCancelled: When cancelled is set
+	"""
+	if cancelled.is_set():
+		raise HullCancelled()
+
+
+def convert_buffer_to_nodes(buffer: array) -> PointNode:
+	"""
+	Returns a hull of PointNodes, given its vertices in clockwise order
+
+	:param buffer: The hull vertices in clockwise order, as a flat array('d') of x, y pairs
+	:return: The first node of the hull
+	"""
+	return convert_list_to_nodes(list(zip(buffer[0::2], buffer[1::2])))
+
+
+def hull_of_nodes(root_node: PointNode) -> Hull:
+	"""
+	Returns a handle on a hull of PointNodes, walking to its leftmost and rightmost nodes
+
+	:param root_node: Any node in a convex hull
+	:return: The hull, with root_node as its root
+	"""
+	return Hull(root_node, to_leftmost_node(root_node), to_rightmost_node(root_node))
+
+
+def convert_list_to_nodes(points: list) -> PointNode:
+	"""
+	Returns a hull of PointNodes, given its vertices in clockwise order
+
+	:param points: The hull vertices in clockwise order, as (x, y) tuples
+	:return: The first node of the hull
+	"""
+	nodes = [PointNode(x, y) for x, y in points]
+	for i in range(len(nodes)):
+		nodes[i].clockwise = nodes[(i + 1) % len(nodes)]
+		nodes[i].counter_clockwise = nodes[i - 1]
+
+	return nodes[0]
+
+
+def akl_toussaint_filter(points: list) -> list:
+	"""
+	Discards the points that are strictly inside the octagon of extreme points
+
+	The octagon is made of the points with min/max x, y, x + y and x - y, which are all on
+	the convex hull, so any point strictly inside of it cannot be on the hull.
+
+	:param points: A list of (x, y) tuples, in any order
+	:return: A list of the (x, y) tuples that may be on the convex hull, in their original order
+	"""
+	octagon = extreme_octagon(points)
+	if len(octagon) < 3:
+		# no interior to test against
+		return list(points)
+
+	# each edge as its start point and direction, walking clockwise
+	edges = []
+	for i in range(len(octagon)):
+		start_x, start_y = octagon[i - 1]
+		end_x, end_y = octagon[i]
+		edges.append((start_x, start_y, end_x - start_x, end_y - start_y))
+
+	survivors = []
+	for point in points:
+		x, y = point
+		for start_x, start_y, dx, dy in edges:
+			# a point strictly inside is strictly right of every clockwise edge
+			if dx * (y - start_y) - dy * (x - start_x) >= 0:
+				survivors.append(point)
+				break
+
+	return survivors
+
+
+def extreme_octagon(points: list) -> list:
+	"""
+	Finds the points with min/max x, y, x + y and x - y
+
+	:param points: A list of (x, y) tuples
+	:return: The distinct extreme points, as (x, y) tuples in clockwise order
+	"""
+	# left, top left, top, top right, right, bottom right, bottom, bottom left
+	octagon = [
+		min(points, key=lambda point: point[0]),
+		min(points, key=lambda point: point[0] - point[1]),
+		max(points, key=lambda point: point[1]),
+		max(points, key=lambda point: point[0] + point[1]),
+		max(points, key=lambda point: point[0]),
+		max(points, key=lambda point: point[0] - point[1]),
+		min(points, key=lambda point: point[1]),
+		min(points, key=lambda point: point[0] + point[1]),
+	]
+	# drop repeated corners, including a last corner equal to the first
+	distinct = []
+	for point in octagon:
+		if not distinct or point != distinct[-1]:
+			distinct.append(point)
+	while len(distinct) > 1 and distinct[-1] == distinct[0]:
+		distinct.pop()
+
+	return distinct
+
+
+def exact_side(a_x: float, a_y: float, b_x: float, b_y: float, c_x: float, c_y: float) -> int:
+	"""
+	The cross product of a to b with a to c, in exact integer arithmetic
+
+	Every float is an integer over a power of 2, so scaling all six values by the largest
+	of their denominators makes them integers, which keeps the sign of the cross product.
+
+	:return: Positive when c is left of the line from a to b, negative when right, 0 when on it
+	"""
+	ratios = [value.as_integer_ratio() for value in (a_x, a_y, b_x, b_y, c_x, c_y)]
+	scale = max(denominator for _, denominator in ratios)
+	a_x, a_y, b_x, b_y, c_x, c_y = [numerator * (scale // denominator) for numerator, denominator in ratios]
+	return (b_x - a_x) * (c_y - a_y) - (b_y - a_y) * (c_x - a_x)
+
+
+def settle_side(side: float, line_x: float, line_y: float, d_x: float, d_y: float,
+				left_x: float, left_y: float, right_x: float, right_y: float, new_x: float, new_y: float):
+	"""
+	Settles the sign of a tangent walker's cross product, in exact mode
+
+	:param side: The floating-point cross product line_x * d_y - line_y * d_x
+	:param d_x: The x-offset of the new point from the node being walked from
+	:param d_y: The y-offset of the new point from the node being walked from
+	:return: side, or the sign of the exact cross product when rounding may have flipped it
+	"""
+	if abs(side) < SIDE_ERROR_BOUND * (abs(line_x * d_y) + abs(line_y * d_x)):
+		return exact_side(left_x, left_y, right_x, right_y, new_x, new_y)
+	return side
+
+
+# How walk_tangent steps around hull rings and reads their points: functions of a node
+# giving its clockwise and counter-clockwise neighbours and its x- and y-value.  NODE_LINKS
+# serves rings of PointNodes, and ring_links(ring) the rings of indices of a PointRing
+NODE_LINKS = (attrgetter('clockwise'), attrgetter('counter_clockwise'), attrgetter('x'), attrgetter('y'))
+
+
+def ring_links(ring: PointRing) -> tuple:
+	"""
+	:return: The links walk_tangent steps around the rings of a PointRing with
+	"""
+	return ring.clockwise.__getitem__, ring.counter_clockwise.__getitem__, ring.x.__getitem__, ring.y.__getitem__
+
+
+def walk_tangent(left_node, right_node, upper: bool, links: tuple = NODE_LINKS, exact: bool = False, lines=None) -> tuple:
+	"""
+	Finds the upper or lower tangent of two convex hulls
+
+	Each step finds which side of the current line the next node is on, from the sign of a
+	cross product, so there is no division and the hulls may share x-values.  The walks
+	only move outwards, to nodes sorting before the left node or after the right node, so
+	they end even when rounding errors make the signs inconsistent.  A node on the line is
+	walked to as well, so collinear nodes are left out of the combined hull.
+
+	:param left_node: The rightmost node in the left convex hull
+	:param right_node: The leftmost node in the right convex hull
+	:param upper: True for the upper tangent, False for the lower tangent
+	:param links: NODE_LINKS for PointNodes, or ring_links(ring) for the indices of a PointRing
+	:param exact: Whether to settle the sign of near-collinear nodes in exact arithmetic
+	:param lines: An optional array('d') the x1, y1, x2, y2 of the starting line and of every
+				  line walked to are appended to, e.g. for hull_events
+	:return: A tuple of the left and right nodes of the tangent
+	"""
+	clockwise, counter_clockwise, x_of, y_of = links
+	# the upper tangent walks UP both hulls, away from each other, and the lower one DOWN
+	if upper:
+		sign, left_step, right_step = 1.0, counter_clockwise, clockwise
+	else:
+		sign, left_step, right_step = -1.0, clockwise, counter_clockwise
+
+	# starting line between innermost nodes of the hulls
+	left_x, left_y = x_of(left_node), y_of(left_node)
+	right_x, right_y = x_of(right_node), y_of(right_node)
+	line_x = right_x - left_x
+	line_y = right_y - left_y
+	if lines is not None:
+		lines.extend((left_x, left_y, right_x, right_y))
+
+	# alternate walking left and right hulls until the tangent is found
+	done = 0
+	while not done:
+		done = 1
+		# walk the left hull
+		while True:
+			new_left = left_step(left_node)
+			new_x, new_y = x_of(new_left), y_of(new_left)
+
+			# side of the current line the new point is on - positive when beyond it: above
+			# it for the upper tangent, below it for the lower
+			side = line_x * (new_y - left_y) - line_y * (new_x - left_x)
+			if exact:
+				side = settle_side(side, line_x, line_y, new_x - left_x, new_y - left_y, left_x, left_y, right_x, right_y, new_x, new_y)
+			if sign * side >= 0 and (new_x < left_x or (new_x == left_x and new_y < left_y)):
+				# new line is closer to being the tangent (or reaches farther along it) - keep it
+				left_node = new_left
+				left_x, left_y = new_x, new_y
+				line_x = right_x - left_x
+				line_y = right_y - left_y
+				if lines is not None:
+					lines.extend((left_x, left_y, right_x, right_y))
+
+				done = 0
+			else:
+				# the line is tangent to the left hull
+				break
+		# walk the right hull
+		while True:
+			new_right = right_step(right_node)
+			new_x, new_y = x_of(new_right), y_of(new_right)
+
+			side = line_x * (new_y - right_y) - line_y * (new_x - right_x)
+			if exact:
+				side = settle_side(side, line_x, line_y, new_x - right_x, new_y - right_y, left_x, left_y, right_x, right_y, new_x, new_y)
+			if sign * side >= 0 and (new_x > right_x or (new_x == right_x and new_y > right_y)):
+				right_node = new_right
+				right_x, right_y = new_x, new_y
+				line_x = right_x - left_x
+				line_y = right_y - left_y
+				if lines is not None:
+					lines.extend((left_x, left_y, right_x, right_y))
+
+				done = 0
+			else:
+				# the line is tangent to the right hull
+				break
+	return left_node, right_node
+
+
+def find_upper_tangent(left_node: PointNode, right_node: PointNode, exact: bool = False, lines=None) -> Tuple[PointNode, PointNode]:
+	"""
+	Finds the upper tangent of two convex hulls, see walk_tangent
+
+	:param left_node: The rightmost node in the left convex hull
+	:param right_node: The leftmost node in the right convex hull
+	:param exact: Whether to settle the sign of near-collinear nodes in exact arithmetic
+	:param lines: An optional array('d') to append every line walked to, see walk_tangent
+	:return: A tuple of PointNode objects of the left and right points of the upper tangent
+	"""
+	return walk_tangent(left_node, right_node, True, NODE_LINKS, exact, lines)
+
+
+def find_lower_tangent(left_node: PointNode, right_node: PointNode, exact: bool = False, lines=None) -> Tuple[PointNode, PointNode]:
+	"""
+	Finds the lower tangent of two convex hulls, see walk_tangent
+
+	:param left_node: The rightmost node in the left convex hull
+	:param right_node: The leftmost node in the right convex hull
+	:param exact: Whether to settle the sign of near-collinear nodes in exact arithmetic
+	:param lines: An optional array('d') to append every line walked to, see walk_tangent
+	:return: A tuple of PointNode objects of the left and right points of the lower tangent
+	"""
+	return walk_tangent(left_node, right_node, False, NODE_LINKS, exact, lines)
+
+
+def combine(left_hull: Hull, right_hull: Hull, stats=None, depth: int = 0, exact: bool = False, events=None) -> Hull:
+	"""
+	Combines two hulls by finding upper and lower tangents and removing nodes
+	that are no longer part of the combined hull
+
+	:param left_hull: The left hull to combine
+	:param right_hull: The right hull to combine, whose points all sort after those of left_hull
+	:param stats: An optional hull_stats.HullStats to record the merge in
+	:param depth: The recursion depth of the merge, 0 at the top
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param events: An optional hull_events.HullEvents to log the merge in
+	:return: The combined hull, which is left_hull updated in place
+	"""
+	# both tangents start from the innermost nodes of the hulls
+	left_node = left_hull.rightmost
+	right_node = right_hull.leftmost
+
+	# find tangents
+	if events is None:
+		upper_left, upper_right = find_upper_tangent(left_node, right_node, exact)
+		lower_left, lower_right = find_lower_tangent(left_node, right_node, exact)
+	else:
+		# the walks append the lines they try, for the log
+		upper_lines = array('d')
+		lower_lines = array('d')
+		upper_left, upper_right = find_upper_tangent(left_node, right_node, exact, upper_lines)
+		lower_left, lower_right = find_lower_tangent(left_node, right_node, exact, lower_lines)
+		events.record_merge(left_hull, right_hull, upper_lines, lower_lines)
+
+	if stats is not None:
+		# measured before the hulls are connected, while both rings are whole
+		stats.record_merge(depth, left_hull, right_hull, upper_left, upper_right, lower_left, lower_right)
+
+	# connect the hulls by pointing tangent points to each other rather
+	upper_left.clockwise = upper_right
+	upper_right.counter_clockwise = upper_left
+	lower_left.counter_clockwise = lower_right
+	lower_right.clockwise = lower_left
+
+	# the outermost nodes of the hulls are the outermost nodes of the combined hull - the
+	# left hull's handle is reused for it, rather than allocating a new one per merge
+	left_hull.root = upper_left
+	left_hull.rightmost = right_hull.rightmost
+	return left_hull
+
+
+def combine_ring(ring: PointRing, left_hull: tuple, right_hull: tuple, exact: bool = False) -> Tuple[int, int, int]:
+	"""
+	Combines two hull rings of a PointRing, like combine
+
+	:param ring: The PointRing holding both hulls
+	:param left_hull: The root, leftmost and rightmost indices of the left hull
+	:param right_hull: The root, leftmost and rightmost indices of the right hull, whose points all
+					   sort after those of left_hull
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:return: A tuple of the root, leftmost and rightmost indices of the combined hull
+	"""
+	_, leftmost, left_node = left_hull
+	_, right_node, rightmost = right_hull
+
+	# find tangents, both starting from the innermost indices of the hulls
+	links = ring_links(ring)
+	upper_left, upper_right = walk_tangent(left_node, right_node, True, links, exact)
+	lower_left, lower_right = walk_tangent(left_node, right_node, False, links, exact)
+
+	# connect the hulls by pointing tangent points to each other
+	clockwise = ring.clockwise
+	counter_clockwise = ring.counter_clockwise
+	clockwise[upper_left] = upper_right
+	counter_clockwise[upper_right] = upper_left
+	counter_clockwise[lower_left] = lower_right
+	clockwise[lower_right] = lower_left
+
+	return upper_left, leftmost, rightmost
+
+
+def to_leftmost_node(root_node: PointNode) -> PointNode:
+	"""
+	Rotates through the convex hull to the leftmost node\n
+
+	:param root_node: A node in the convex hull
+	:return: The leftmost node in the same convex hull as root_node, the lowest of them on a tie
+	"""
+	curr_node = root_node
+	curr_point = (root_node.x, root_node.y)
+	while (curr_node.clockwise.x, curr_node.clockwise.y) < curr_point:
+		# bottom of the hull - rotate clockwise
+		curr_node = curr_node.clockwise
+		curr_point = (curr_node.x, curr_node.y)
+	while (curr_node.counter_clockwise.x, curr_node.counter_clockwise.y) < curr_point:
+		# top of the hull - rotate counter-clockwise
+		curr_node = curr_node.counter_clockwise
+		curr_point = (curr_node.x, curr_node.y)
+
+	return curr_node
+
+
+def to_rightmost_node(root_node: PointNode) -> PointNode:
+	"""
+	Rotates through the convex hull to the rightmost node\n
+
+	:param root_node: A node in the convex hull
+	:return: The rightmost node in the same convex hull as root_node, the highest of them on a tie
+	"""
+	curr_node = root_node
+	curr_point = (root_node.x, root_node.y)
+	while (curr_node.clockwise.x, curr_node.clockwise.y) > curr_point:
+		# top of the hull - rotate clockwise
+		curr_node = curr_node.clockwise
+		curr_point = (curr_node.x, curr_node.y)
+	while (curr_node.counter_clockwise.x, curr_node.counter_clockwise.y) > curr_point:
+		# bottom of the hull - rotate counter-clockwise
+		curr_node = curr_node.counter_clockwise
+		curr_point = (curr_node.x, curr_node.y)
+
+	return curr_node
+
+
+# def is_upper_tangent(point_in_hull: PointNode, tangent_left: QPointF, tangent_right: QPointF) -> bool:
+# 	"""
+# 	Finds if the tangent is above of all points on the list
+#
+# 	:param point_in_hull: Any point of the hull which will be compared to tangent line, as a PointNode
+# 	:param tangent_left: The left point of the tangent, as a QPointF
+# 	:param tangent_right: The right point of the tangent, as a QPointF
+# 	:return: Whether the tangent is above all points on the list
+# 	"""
+# 	m = find_slope(tangent_left, tangent_right)
+# 	b = find_y_intercept(m, tangent_left)
+#
+# 	# check if each point in the hull is below the tangent
+# 	curr_point = point_in_hull
+# 	while True:
+# 		if above_or_below(m, b, curr_point.point) == ABOVE:
+# 			# not an upper tangent for at least this point
+# 			return False
+#
+# 		# increment and check if tried every point
+# 		curr_point = curr_point.clockwise
+# 		if curr_point is point_in_hull:
+# 			break
+#
+# 	# all points were on or below
+# 	return True
+
+
+# def is_lower_tangent(point_in_hull: PointNode, tangent_left: QPointF, tangent_right: QPointF) -> bool:
+# 	"""
+# 	Finds if the tangent is below of all points on the list
+#
+# 	:param point_in_hull: Any point of the hull which will be compared to tangent line, as a PointNode
+# 	:param tangent_left: The left point of the tangent, as a QPointF
+# 	:param tangent_right: The right point of the tangent, as a QPointF
+# 	:return: Whether the tangent is below all points on the list
+# 	"""
+#
+# 	m = find_slope(tangent_left, tangent_right)
+# 	b = find_y_intercept(m, tangent_left)
+#
+# 	# check if each point in the hull is above the tangent
+# 	curr_point = point_in_hull
+# 	while True:
+# 		if above_or_below(m, b, curr_point.point) == BELOW:
+# 			# not a lower tangent for at least this point
+# 			return False
+#
+# 		# increment and check if tried every point
+# 		curr_point = curr_point.clockwise
+# 		if curr_point is point_in_hull:
+# 			break
+#
+# 	# all points were on or above
+# 	return True
+
+
+# def above_or_below(m: float, b: float, point: QPointF) -> int:
+# 	"""
+# 	y_0 >/=/< m(x_0) + b
+#
+# 	:param m: The slope, as a float
+# 	:param b: The y-intercept, as a float
+# 	:param point: The point to compare to the tangent line, as a QPointF
+# 	:return: ABOVE (1), ON (0), or BELOW (-1)
+# 	"""
+# 	y_0 = point.y()
+# 	result = m * point.x() + b
+# 	# print(f"y_0: {y_0}, result: {result}")
+# 	if abs(y_0 - result) < 0.0000001: # 0.0000000001
+# 		# print("   ON")
+# 		return ON
+# 	elif y_0 > result:
+# 		# print("   ABOVE")
+# 		return ABOVE
+# 	elif y_0 < result:
+# 		# print("   BELOW")
+# 		return BELOW
+
+
+# def find_slope(tangent_left: QPointF, tangent_right: QPointF) -> float:
+# 	"""
+# 	m = (y_2 - Y_1) / (x_2 - x_1)
+#
+# 	:param tangent_left: The left point on the tangent, as a QPointF
+# 	:param tangent_right: The right point on the tangent, as a QPointF
+# 	:return: The slope, as a float
+# 	"""
+# 	return (tangent_right.y() - tangent_left.y()) / (tangent_right.x() - tangent_left.x())
+
+
+# def find_y_intercept(m: float, point_on_tangent: QPointF) -> float:
+# 	"""
+# 	b = y_1 - (m * x_1)
+#
+# 	:param m: The slope
+# 	:param point_on_tangent: Either point on the tangent, as a QPointF
+# 	:return: The y-intercept, as a float
+# 	"""
+# 	return point_on_tangent.y() - (m * point_on_tangent.x())
@@ -0,0 +1,197 @@
+import numpy as np
+
+from convex_hull_core import PointRing, ring_hull_range, ring_to_indices
+from presort import argsort_order, unique_order
+
+
+#
+# A second hull engine that works on NumPy coordinate arrays rather than lists of
+# QPointF objects.  It sorts with NumPy, then runs the merges of convex_hull_dc_array:
+# a hull is a ring of indices in a convex_hull_core.PointRing, the clockwise/
+# counter-clockwise links of every point being stored in two integer arrays, so no
+# QPointF or PointNode is ever built.
+#
+
+
+def convex_hull_dc_np(points, ys=None, prefilter: bool = False, exact: bool = False, cancelled=None) -> np.ndarray:
+	"""
+	A divide and conquer approach to finding a convex hull, on index arrays
+
+	:param points: An (N, 2) float64 array of points, or an array of x-values when ys is given
+	:param ys: An optional array of y-values, parallel to points
+	:param prefilter: Whether to discard the points inside the extreme octagon before sorting
+	:param exact: Whether the tangents settle near-collinear points in exact arithmetic
+	:param cancelled: An optional threading.Event, raising convex_hull_core.HullCancelled when set
+	:return: An array of indices into the input points, composing the convex hull in clockwise order,
+			 with the first index of any repeated point
+	"""
+	if ys is None:
+		points = np.asarray(points, dtype=np.float64)
+		xs = points[:, 0]
+		ys = points[:, 1]
+	else:
+		xs = np.asarray(points, dtype=np.float64)
+		ys = np.asarray(ys, dtype=np.float64)
+
+	if prefilter:
+		survivors = np.flatnonzero(akl_toussaint_mask(xs, ys))
+		# sort the surviving points by x-value, then y-value, keeping their original indices
+		order = survivors[argsort_order(xs[survivors], ys[survivors])]
+	else:
+		# sort the points by x-value, then y-value, like presort in compute_hull
+		order = argsort_order(xs, ys)
+	# the merge needs every point once
+	order = unique_order(order, xs, ys)
+
+	# scalar access to NumPy arrays is slow, so the merge runs on a PointRing of plain floats
+	ring = PointRing(xs[order].tolist(), ys[order].tolist())
+	root, _, _ = ring_hull_range(ring, 0, len(order), exact, cancelled)
+
+	return order[np.array(ring_to_indices(ring, root), dtype=np.intp)]
+
+
+def akl_toussaint_mask(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+	"""
+	Vectorized convex_hull_core.akl_toussaint_filter
+
+	:param xs: An array of x-values
+	:param ys: An array of y-values, parallel to xs
+	:return: A boolean array, False for the points strictly inside the extreme octagon
+	"""
+	if len(xs) == 0:
+		return np.zeros(0, dtype=bool)
+
+	# extreme points in clockwise order: left, top left, top, top right, right, bottom right, bottom, bottom left
+	sums = xs + ys
+	diffs = xs - ys
+	corners = [np.argmin(xs), np.argmin(diffs), np.argmax(ys), np.argmax(sums),
+			   np.argmax(xs), np.argmax(diffs), np.argmin(ys), np.argmin(sums)]
+	octagon = []
+	for corner in corners:
+		point = (xs[corner], ys[corner])
+		if not octagon or point != octagon[-1]:
+			octagon.append(point)
+	while len(octagon) > 1 and octagon[-1] == octagon[0]:
+		octagon.pop()
+	if len(octagon) < 3:
+		return np.ones(len(xs), dtype=bool)
+
+	# a point strictly inside is strictly right of every clockwise edge
+	inside = np.ones(len(xs), dtype=bool)
+	for i in range(len(octagon)):
+		start_x, start_y = octagon[i - 1]
+		end_x, end_y = octagon[i]
+		inside &= (end_x - start_x) * (ys - start_y) - (end_y - start_y) * (xs - start_x) < 0
+
+	return ~inside
+
+
+def convex_hulls_batch_np(points, offsets) -> tuple:
+	"""
+	Finds the convex hulls of many small groups of points at once, with Andrew's monotone chain
+
+	Groups are padded to the next power of 2 in size, by repeating their last point, and
+	every size class is solved as one 2D array with a row per group.  The chains of all the
+	rows are built together, a column at a time, so the Python loop runs once per column
+	and pop rather than once per point.  Hulls start from their leftmost point (the lowest
+	of those) and hold no collinear vertices, and name a repeated point by its first index,
+	like those of convex_hull_dc_np.
+
+	:param points: An (N, 2) float64 array of the points of every group, one group after another
+	:param offsets: An array of G + 1 indices into points, group g being points[offsets[g]:offsets[g + 1]]
+	:return: A tuple of an array of indices into points, composing every hull in clockwise order, one
+			 hull after another, and an array of G + 1 offsets into it
+	"""
+	points = np.asarray(points, dtype=np.float64)
+	offsets = np.asarray(offsets, dtype=np.intp)
+	sizes = np.diff(offsets)
+
+	hulls = [None] * len(sizes)
+	hull_sizes = np.zeros(len(sizes), dtype=np.intp)
+
+	# size classes: 1-2 points, 3-4 points, 5-8 points, ...
+	classes = np.zeros(len(sizes), dtype=np.intp)
+	nonempty = sizes > 0
+	classes[nonempty] = np.ceil(np.log2(np.maximum(sizes[nonempty], 2))).astype(np.intp)
+	for size_class in np.unique(classes[nonempty]):
+		groups = np.flatnonzero(nonempty & (classes == size_class))
+		indices, counts = _monotone_chain_rows(points, offsets[groups], sizes[groups], 1 << size_class)
+		hull_sizes[groups] = counts
+		hulls_of_class = np.split(indices, np.cumsum(counts)[:-1])
+		for group, hull in zip(groups.tolist(), hulls_of_class):
+			hulls[group] = hull
+
+	hull_offsets = np.zeros(len(sizes) + 1, dtype=np.intp)
+	np.cumsum(hull_sizes, out=hull_offsets[1:])
+	nonempty_hulls = [hull for hull in hulls if hull is not None]
+	if not nonempty_hulls:
+		return np.zeros(0, dtype=np.intp), hull_offsets
+	return np.concatenate(nonempty_hulls), hull_offsets
+
+
+def _monotone_chain_rows(points: np.ndarray, starts: np.ndarray, sizes: np.ndarray, width: int) -> tuple:
+	"""
+	Finds the convex hulls of groups of at most width points, a row per group
+
+	:param starts: The index of the first point of each group
+	:param sizes: The number of points of each group, each at least 1
+	:param width: The number of columns to pad every row to
+	:return: A tuple of the hull indices into points, row after row, and the hull size of each row
+	"""
+	rows = np.arange(len(starts))
+	columns = np.arange(width)
+
+	# indices into points, padded by repeating the last point of the group
+	indices = starts[:, np.newaxis] + np.minimum(columns, sizes[:, np.newaxis] - 1)
+	xs = points[indices, 0]
+	ys = points[indices, 1]
+
+	# sort every row by x-value, then y-value - a repeated point is popped by the chain like a collinear one
+	order = np.lexsort((ys, xs), axis=1)
+	indices = np.take_along_axis(indices, order, axis=1)
+	xs = np.take_along_axis(xs, order, axis=1)
+	ys = np.take_along_axis(ys, order, axis=1)
+
+	# the first column of each run of repeated points - the sort being stable, it holds the
+	# point's first index, which the hull gives for whichever column of the run it keeps
+	new_run = np.ones((len(rows), width), dtype=bool)
+	new_run[:, 1:] = (xs[:, 1:] != xs[:, :-1]) | (ys[:, 1:] != ys[:, :-1])
+	run_start = np.maximum.accumulate(np.where(new_run, columns, 0), axis=1)
+
+	# the upper chain runs left to right over the top of the hull, the lower chain along the bottom
+	upper = np.zeros((len(rows), width), dtype=np.intp)
+	lower = np.zeros((len(rows), width), dtype=np.intp)
+	upper_size = np.zeros(len(rows), dtype=np.intp)
+	lower_size = np.zeros(len(rows), dtype=np.intp)
+	for column in range(width):
+		for chain, chain_size, sign in ((upper, upper_size, 1.0), (lower, lower_size, -1.0)):
+			# pop while the last two chain points and the new point don't turn the right way,
+			# rechecking only the rows that just popped
+			candidates = rows[chain_size >= 2]
+			while len(candidates):
+				size = chain_size[candidates]
+				a = chain[candidates, size - 2]
+				b = chain[candidates, size - 1]
+				a_x = xs[candidates, a]
+				a_y = ys[candidates, a]
+				side = ((xs[candidates, b] - a_x) * (ys[candidates, column] - a_y)
+						- (ys[candidates, b] - a_y) * (xs[candidates, column] - a_x))
+				candidates = candidates[sign * side >= 0]
+				chain_size[candidates] -= 1
+				candidates = candidates[chain_size[candidates] >= 2]
+			chain[rows, chain_size] = column
+			chain_size += 1
+
+	# a group of one point, however often repeated, is a hull of 1 point
+	single = (xs[:, 0] == xs[:, -1]) & (ys[:, 0] == ys[:, -1])
+	upper_size[single] = 1
+
+	# down the upper chain, then back along the lower chain without repeating its ends
+	reverse_columns = lower_size[:, np.newaxis] - 2 - columns
+	lower_reversed = np.take_along_axis(lower, np.maximum(reverse_columns, 0), axis=1)
+	hull_columns = np.concatenate((upper, lower_reversed), axis=1)
+	keep = np.concatenate((columns < upper_size[:, np.newaxis], reverse_columns >= 1), axis=1)
+
+	hull_columns = np.take_along_axis(run_start, hull_columns, axis=1)
+	hull_indices = np.take_along_axis(indices, hull_columns, axis=1)[keep]
+	return hull_indices, keep.sum(axis=1)
@@ -0,0 +1,373 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+from convex_hull_core import PointNode, convert_list_to_nodes
+
+
+#
+# A convex hull that is kept up to date as points are inserted and deleted, rather than
+# recomputed from scratch with compute_hull.  The hull is held as its upper and lower
+# chains, each a list of (x, y) tuples sorted left to right, so locating a point on the
+# hull is a binary search.  Every change reports the hull edges it removed and added,
+# which lets the GUI redraw only those edges.
+#
+
+# Points per block of the sorted set of all points, which holds blocks of half to twice as many
+POINT_BLOCK_SIZE = 512
+
+
+class HullChange:
+	"""
+	The edges of a hull changed by one insertion or deletion
+
+	removed: A list of ((x, y), (x, y)) edges no longer on the hull, in clockwise direction
+	added: A list of ((x, y), (x, y)) edges newly on the hull, in clockwise direction
+	"""
+	__slots__ = ('removed', 'added')
+
+	def __init__(self, removed: list, added: list):
+		self.removed = removed
+		self.added = added
+
+	def __bool__(self):
+		return bool(self.removed or self.added)
+
+
+class DynamicConvexHull:
+	"""
+	A convex hull supporting point insertion, deletion and membership queries
+
+	insert: O(log n + B) amortized - O(log n) to locate the point and O(1) amortized for
+			each vertex it removes, plus an O(B) memmove to insert it into one block of the
+			sorted set of all points, and O(h) for each chain it changes
+	delete: O(log n + B) amortized - the same, plus, when the point is a hull vertex, a
+			local repair over the points between the deleted vertex's neighbors
+	contains: O(log n)
+
+	B is POINT_BLOCK_SIZE.  The sorted set of all points is a list of blocks (see
+	_SortedPoints), so an update moves the pointers of one block rather than of every
+	point.  The chains are plain Python lists, since they only hold the hull vertices.
+	"""
+
+	def __init__(self, points=()):
+		points = sorted(set(points))
+		# every point, sorted by (x, y) - needed to repair the hull after a deletion
+		self._points = _SortedPoints(points)
+		# upper chain runs left to right over the top of the hull, lower chain along the bottom
+		self._upper = _chain(points, upper=True)
+		self._lower = _chain(points, upper=False)
+
+	def __len__(self):
+		return len(self._points)
+
+	def insert(self, point: tuple) -> HullChange:
+		"""
+		Adds a point to the set
+
+		:param point: The (x, y) tuple to add
+		:return: The edges of the hull changed by the insertion
+		"""
+		point = (float(point[0]), float(point[1]))
+		if not self._points.add(point):
+			# already in the set
+			return HullChange([], [])
+
+		removed = []
+		added = []
+		for chain, upper in ((self._upper, True), (self._lower, False)):
+			_insert_into_chain(chain, point, upper, removed, added)
+
+		return _net_change(removed, added)
+
+	def delete(self, point: tuple) -> HullChange:
+		"""
+		Removes a point from the set
+
+		:param point: The (x, y) tuple to remove
+		:return: The edges of the hull changed by the deletion
+		"""
+		point = (float(point[0]), float(point[1]))
+		self._points.remove(point)
+
+		removed = []
+		added = []
+		for chain, upper in ((self._upper, True), (self._lower, False)):
+			position = bisect_left(chain, point)
+			if position == len(chain) or chain[position] != point:
+				# not a vertex of this chain, so the chain is unchanged
+				continue
+
+			# rebuild the chain between the neighbors of the deleted vertex
+			start = position - 1 if position > 0 else None
+			end = position + 1 if position + 1 < len(chain) else None
+			repair = _chain(self._points.between(chain[start] if start is not None else None,
+												 chain[end] if end is not None else None), upper)
+
+			# the repair includes both neighbors, which stay where they are
+			if start is not None:
+				repair = repair[1:]
+			if end is not None:
+				repair = repair[:-1]
+			_replace(chain, position, position + 1, repair, upper, removed, added)
+
+		return _net_change(removed, added)
+
+	def contains(self, point: tuple) -> bool:
+		"""
+		Finds if a point is inside or on the current hull
+
+		:param point: An (x, y) tuple
+		:return: Whether the point is inside or on the hull
+		"""
+		if not self._points:
+			return False
+		x, y = point
+
+		# at most the top of the hull at x
+		upper = self._upper
+		index = bisect_right(upper, (x, float('inf')))
+		if index == 0:
+			return False
+		left = upper[index - 1]
+		if index == len(upper) or left[0] == x:
+			if left[0] != x or y > left[1]:
+				return False
+		elif _cross(left, upper[index], point) > 0:
+			return False
+
+		# at least the bottom of the hull at x
+		lower = self._lower
+		index = bisect_left(lower, (x, float('-inf')))
+		if index == len(lower):
+			return False
+		right = lower[index]
+		if index == 0 or right[0] == x:
+			if right[0] != x or y < right[1]:
+				return False
+		elif _cross(lower[index - 1], right, point) < 0:
+			return False
+
+		return True
+
+	def is_vertex(self, point: tuple) -> bool:
+		"""
+		Finds if a point is a vertex of the current hull
+
+		:param point: An (x, y) tuple
+		:return: Whether the point is a hull vertex
+		"""
+		for chain in (self._upper, self._lower):
+			index = bisect_left(chain, point)
+			if index < len(chain) and chain[index] == point:
+				return True
+		return False
+
+	def vertices(self) -> list:
+		"""
+		Returns the hull vertices, like convert_nodes_to_list
+
+		:return: A list of (x, y) tuples composing the convex hull in clockwise order, from the leftmost
+		"""
+		if len(self._upper) <= 1:
+			return list(self._upper)
+		# down the upper chain, then back along the lower chain without repeating its ends
+		return self._upper + self._lower[-2:0:-1]
+
+	def hull_node(self) -> PointNode:
+		"""
+		Returns the current hull as a ring of PointNodes
+
+		:return: The leftmost node of the hull
+		"""
+		return convert_list_to_nodes(self.vertices())
+
+
+class _SortedPoints:
+	"""
+	A sorted set of (x, y) tuples, held as a list of sorted blocks and the last point of each
+
+	Blocks are split past 2 * POINT_BLOCK_SIZE points and merged into a neighbor under
+	POINT_BLOCK_SIZE / 2, so finding a point is a binary search over the blocks then within
+	one, and changing the set moves only the pointers of that block - and, once per split or
+	merge, those of the list of blocks.
+	"""
+	__slots__ = ('_blocks', '_maxes', '_len')
+
+	def __init__(self, sorted_points: list):
+		"""
+		:param sorted_points: A list of (x, y) tuples, sorted by (x, y), without repeats
+		"""
+		self._blocks = [sorted_points[i:i + POINT_BLOCK_SIZE] for i in range(0, len(sorted_points), POINT_BLOCK_SIZE)]
+		self._maxes = [block[-1] for block in self._blocks]
+		self._len = len(sorted_points)
+
+	def __len__(self):
+		return self._len
+
+	def _find(self, point: tuple) -> int:
+		"""
+		:return: The index of the block point is in, or belongs in
+		"""
+		# past the last block's end, the point belongs at the end of it
+		return min(bisect_left(self._maxes, point), len(self._maxes) - 1)
+
+	def add(self, point: tuple) -> bool:
+		"""
+		Adds a point to the set
+
+		:return: Whether the point was added, rather than already in the set
+		"""
+		if not self._blocks:
+			self._blocks.append([point])
+			self._maxes.append(point)
+			self._len = 1
+			return True
+
+		b = self._find(point)
+		block = self._blocks[b]
+		index = bisect_left(block, point)
+		if index < len(block) and block[index] == point:
+			return False
+		block.insert(index, point)
+		self._maxes[b] = block[-1]
+		self._len += 1
+		if len(block) > 2 * POINT_BLOCK_SIZE:
+			self._split(b)
+		return True
+
+	def remove(self, point: tuple):
+		"""
+		Removes a point from the set
+
+		:raises KeyError: If the point is not in the set
+		"""
+		if not self._blocks:
+			raise KeyError(point)
+		b = self._find(point)
+		block = self._blocks[b]
+		index = bisect_left(block, point)
+		if index == len(block) or block[index] != point:
+			raise KeyError(point)
+		del block[index]
+		self._len -= 1
+
+		if not block:
+			# only the last block left can get this small
+			del self._blocks[b]
+			del self._maxes[b]
+			return
+		self._maxes[b] = block[-1]
+		if len(block) < POINT_BLOCK_SIZE // 2 and len(self._blocks) > 1:
+			# merge into the block after it, or before it for the last block
+			if b == len(self._blocks) - 1:
+				b -= 1
+			self._blocks[b].extend(self._blocks.pop(b + 1))
+			del self._maxes[b]
+			if len(self._blocks[b]) > 2 * POINT_BLOCK_SIZE:
+				self._split(b)
+
+	def _split(self, b: int):
+		"""
+		Splits block b in two
+		"""
+		block = self._blocks[b]
+		self._blocks.insert(b + 1, block[POINT_BLOCK_SIZE:])
+		del block[POINT_BLOCK_SIZE:]
+		self._maxes.insert(b, block[-1])
+
+	def between(self, low: tuple, high: tuple) -> list:
+		"""
+		:param low: The first point to include, or None to start from the first point
+		:param high: The last point to include, or None to go to the last point
+		:return: A list of the points from low to high, both included, in order
+		"""
+		points = []
+		first = 0 if low is None else bisect_left(self._maxes, low)
+		# only the first block starts before low
+		start = 0 if low is None or first == len(self._blocks) else bisect_left(self._blocks[first], low)
+		for block in islice(self._blocks, first, None):
+			if high is not None and block[-1] > high:
+				points.extend(block[start:bisect_right(block, high)])
+				break
+			points.extend(block[start:])
+			start = 0
+		return points
+
+
+def _cross(a: tuple, b: tuple, c: tuple) -> float:
+	"""
+	Positive when c is left of the line from a to b, negative when right, 0 when on it
+	"""
+	return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _chain(sorted_points: list, upper: bool) -> list:
+	"""
+	Finds the upper or lower chain of a hull with Andrew's monotone chain
+
+	:param sorted_points: A list of (x, y) tuples, sorted by (x, y)
+	:param upper: Whether to find the upper chain, rather than the lower
+	:return: The chain's vertices, left to right
+	"""
+	chain = []
+	for point in sorted_points:
+		if upper:
+			while len(chain) >= 2 and _cross(chain[-2], chain[-1], point) >= 0:
+				chain.pop()
+		else:
+			while len(chain) >= 2 and _cross(chain[-2], chain[-1], point) <= 0:
+				chain.pop()
+		chain.append(point)
+	return chain
+
+
+def _insert_into_chain(chain: list, point: tuple, upper: bool, removed: list, added: list):
+	"""
+	Adds a point to a chain, if it lands outside of it, dropping the vertices it hides
+	"""
+	if not chain:
+		_replace(chain, 0, 0, [point], upper, removed, added)
+		return
+	sign = 1 if upper else -1
+
+	index = bisect_left(chain, point)
+	if 0 < index < len(chain) and sign * _cross(chain[index - 1], chain[index], point) <= 0:
+		# under the upper chain (or over the lower chain)
+		return
+
+	# walk out from the point, in both directions, over vertices that no longer bend the right way
+	left = index - 1
+	while left >= 1 and sign * _cross(chain[left - 1], chain[left], point) >= 0:
+		left -= 1
+	right = index
+	while right + 1 < len(chain) and sign * _cross(point, chain[right], chain[right + 1]) >= 0:
+		right += 1
+
+	_replace(chain, left + 1, right, [point], upper, removed, added)
+
+
+def _replace(chain: list, start: int, end: int, points: list, upper: bool, removed: list, added: list):
+	"""
+	Replaces chain[start:end] with points, recording the clockwise edges removed and added
+	"""
+	first = max(start - 1, 0)
+	old = chain[first:end + 1]
+	new = chain[first:start] + points + chain[end:end + 1]
+	for window, edges in ((old, removed), (new, added)):
+		for i in range(len(window) - 1):
+			# clockwise is left to right along the upper chain, right to left along the lower
+			if upper:
+				edges.append((window[i], window[i + 1]))
+			else:
+				edges.append((window[i + 1], window[i]))
+
+	chain[start:end] = points
+
+
+def _net_change(removed: list, added: list) -> HullChange:
+	"""
+	Drops the edges that were both removed and added
+	"""
+	unchanged = set(removed) & set(added)
+	return HullChange([edge for edge in removed if edge not in unchanged],
+					  [edge for edge in added if edge not in unchanged])
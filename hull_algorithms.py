@@ -0,0 +1,288 @@
+from bisect import bisect_right
+
+from convex_hull_core import *
+from presort import presort
+
+
+#
+# Hull algorithms other than divide and conquer, and one interface over every engine.
+# compute_hull_points takes points in any order and returns the hull vertices in clockwise
+# order as (x, y) tuples, like convert_nodes_to_list, whichever engine runs:
+#
+#   monotone_chain	Andrew's monotone chain, one pass over the sorted points - O(n) when they
+#					are already sorted, O(n log n) otherwise
+#   quickhull		recursive partitioning about the farthest point, with no sort - about
+#					O(n log h) on clouds with few hull vertices, O(n^2) at worst
+#   chan			Chan's algorithm, gift wrapping over the hulls of small groups - O(n log h)
+#   auto			picks one of the above, or a divide and conquer engine, see choose_engine
+#
+# As with the divide and conquer engines, repeated points count once and collinear points
+# are left out of a hull.  The hulls of these engines start from their leftmost point (the
+# lowest of those).
+#
+
+# Below this many points, auto runs the monotone chain whatever the input
+AUTO_SMALL_N = 64
+
+# The number of points auto samples to estimate the number of hull vertices
+AUTO_SAMPLE_SIZE = 1024
+
+# auto runs quickhull when the sample's hull has at most this share of the sample's points
+AUTO_QUICKHULL_SHARE = 0.05
+
+
+def compute_hull_points(points: list, engine: str = ENGINE_AUTO, presorted: bool = False, exact: bool = False) -> list:
+	"""
+	Finds a convex hull with any engine
+
+	:param points: A list of (x, y) tuples, in any order
+	:param engine: One of the ENGINE_ constants of convex_hull_core
+	:param presorted: Whether points are already sorted by x-value, then y-value, with no repeats
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: A list of (x, y) tuples composing the convex hull in clockwise order
+	"""
+	if not points:
+		return []
+	if engine == ENGINE_AUTO:
+		engine = choose_engine(points, presorted)
+
+	if engine == ENGINE_QUICKHULL:
+		return quickhull(points, exact)
+	elif engine == ENGINE_CHAN:
+		return chan(points, exact)
+	elif engine == ENGINE_NUMPY:
+		from convex_hull_np import convex_hull_dc_np
+		return [points[i] for i in convex_hull_dc_np(points, exact=exact).tolist()]
+
+	sorted_points = points if presorted else presort(points)[0]
+	if engine == ENGINE_MONOTONE_CHAIN:
+		return monotone_chain(sorted_points, exact)
+	elif engine == ENGINE_DC:
+		return convert_nodes_to_list(convex_hull_dc(sorted_points, exact=exact).root)
+	elif engine == ENGINE_DC_ITERATIVE:
+		return convert_nodes_to_list(convex_hull_dc_iterative(sorted_points, exact=exact).root)
+	elif engine == ENGINE_DC_PARALLEL:
+		return convert_nodes_to_list(convex_hull_dc_parallel(sorted_points, exact=exact).root)
+	elif engine == ENGINE_DC_ARRAY:
+		return convert_ring_to_list(*convex_hull_dc_array(sorted_points, exact))
+	raise ValueError('Unknown hull engine: {}'.format(engine))
+
+
+def vertex_indices(points: list, hull_points: list) -> list:
+	"""
+	Finds the hull vertices an engine returned in the points it was given
+
+	:param points: A list of (x, y) tuples
+	:param hull_points: Some of the (x, y) tuples of points, with no repeats
+	:return: A list of the index in points of each of hull_points, the first of any repeated point
+	"""
+	index_of = dict.fromkeys(hull_points)
+	remaining = len(index_of)
+	for index, point in enumerate(points):
+		if remaining == 0:
+			break
+		if point in index_of and index_of[point] is None:
+			index_of[point] = index
+			remaining -= 1
+	return [index_of[point] for point in hull_points]
+
+
+def choose_engine(points: list, presorted: bool = False) -> str:
+	"""
+	Picks the engine auto runs, from the number of points, whether they are sorted, and the
+	share of a sample of them on the sample's hull
+
+	A sample whose hull has few of its points hints at a cloud with few hull vertices,
+	where quickhull discards most points in its first passes and never sorts.  Otherwise
+	the monotone chain is the cheapest engine in CPython, the sort being done in C.
+
+	:param points: A list of (x, y) tuples, in any order
+	:param presorted: Whether points are known to be sorted
+	:return: The ENGINE_ constant to run
+	"""
+	if presorted or len(points) < AUTO_SMALL_N:
+		return ENGINE_MONOTONE_CHAIN
+
+	# an evenly strided sample, so the estimate is repeatable
+	step = max(1, len(points) // AUTO_SAMPLE_SIZE)
+	sample = points[::step]
+	if all(sample[i] <= sample[i + 1] for i in range(len(sample) - 1)):
+		# probably sorted already, which timsort finds in one pass
+		return ENGINE_MONOTONE_CHAIN
+
+	hull_size = len(monotone_chain(sorted(set(sample))))
+	if hull_size <= AUTO_QUICKHULL_SHARE * len(sample):
+		return ENGINE_QUICKHULL
+	return ENGINE_MONOTONE_CHAIN
+
+
+def monotone_chain(sorted_points_list: list, exact: bool = False) -> list:
+	"""
+	Andrew's monotone chain
+
+	:param sorted_points_list: A list of distinct (x, y) tuples, sorted
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: A list of (x, y) tuples composing the convex hull in clockwise order, from the first point
+	"""
+	if len(sorted_points_list) < 3:
+		return list(sorted_points_list)
+
+	upper = monotone_half_chain(sorted_points_list, 1.0, exact)
+	lower = monotone_half_chain(sorted_points_list, -1.0, exact)
+	# over the top left to right, then back along the bottom without repeating the ends
+	return upper + lower[-2:0:-1]
+
+
+def quickhull(points: list, exact: bool = False) -> list:
+	"""
+	Quickhull, with an explicit stack rather than recursion
+
+	:param points: A list of (x, y) tuples, in any order
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: A list of (x, y) tuples composing the convex hull in clockwise order, from the leftmost point
+	"""
+	leftmost = min(points)
+	rightmost = max(points)
+	if leftmost == rightmost:
+		return [leftmost]
+
+	# clockwise over the points above the line from leftmost to rightmost, then back under it
+	above = _left_of(points, leftmost, rightmost, exact)
+	below = _left_of(points, rightmost, leftmost, exact)
+	hull = [leftmost]
+	_quickhull_side(leftmost, rightmost, above, exact, hull)
+	hull.append(rightmost)
+	_quickhull_side(rightmost, leftmost, below, exact, hull)
+	if exact:
+		# the farthest points are found in floating point, so near-collinear inputs may give a
+		# few points inside the hull - though never miss a vertex, and the pass over them is cheap
+		return monotone_chain(sorted(hull), True)
+	return hull
+
+
+def _quickhull_side(a: tuple, b: tuple, candidates: list, exact: bool, hull: list):
+	"""
+	Appends to hull the vertices strictly between a and b, clockwise, given the points left of a to b
+	"""
+	# each entry is a segment and the points left of it, or a vertex to append
+	stack = [(a, b, candidates)]
+	while stack:
+		entry = stack.pop()
+		if len(entry) == 2:
+			hull.append(entry)
+			continue
+		a, b, candidates = entry
+		if not candidates:
+			continue
+
+		# the farthest point from the line is a vertex - on a tie, the first in (x, y) order
+		a_x, a_y = a
+		line_x = b[0] - a_x
+		line_y = b[1] - a_y
+		farthest = max(candidates, key=lambda p: (line_x * (p[1] - a_y) - line_y * (p[0] - a_x), -p[0], -p[1]))
+
+		# left to right: the points beyond a to farthest, farthest, then those beyond farthest to b
+		stack.append((farthest, b, _left_of(candidates, farthest, b, exact)))
+		stack.append(farthest)
+		stack.append((a, farthest, _left_of(candidates, a, farthest, exact)))
+
+
+def _left_of(points: list, a: tuple, b: tuple, exact: bool) -> list:
+	"""
+	:return: The points strictly left of the line from a to b
+	"""
+	a_x, a_y = a
+	b_x, b_y = b
+	line_x = b_x - a_x
+	line_y = b_y - a_y
+	if not exact:
+		return [p for p in points if line_x * (p[1] - a_y) - line_y * (p[0] - a_x) > 0]
+	return [p for p in points
+			if settle_side(line_x * (p[1] - a_y) - line_y * (p[0] - a_x), line_x, line_y, p[0] - a_x, p[1] - a_y,
+						   a_x, a_y, b_x, b_y, p[0], p[1]) > 0]
+
+
+def chan(points: list, exact: bool = False) -> list:
+	"""
+	Chan's algorithm
+
+	Guesses a bound m on the number of hull vertices, splits the points into groups of m,
+	and finds each group's upper and lower chains with the monotone chain.  The hull is
+	then gift-wrapped over the chains, the best point of each chain being found by binary
+	search, for at most m steps.  On failure the guess is squared.
+
+	:param points: A list of (x, y) tuples, in any order
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: A list of (x, y) tuples composing the convex hull in clockwise order, from the leftmost point
+	"""
+	leftmost = min(points)
+	rightmost = max(points)
+	if leftmost == rightmost:
+		return [leftmost]
+
+	guess = 4
+	while True:
+		m = min(guess, len(points))
+		groups = [sorted(set(points[i:i + m])) for i in range(0, len(points), m)]
+		upper = _wrap([monotone_half_chain(group, 1.0, exact) for group in groups], leftmost, rightmost, 1.0, m, exact)
+		lower = _wrap([monotone_half_chain(group, -1.0, exact) for group in groups], leftmost, rightmost, -1.0, m, exact)
+		if upper is not None and lower is not None:
+			return upper + lower[-2:0:-1]
+		guess *= guess
+
+
+def _wrap(chains: list, start: tuple, end: tuple, sign: float, steps: int, exact: bool):
+	"""
+	Gift-wraps the upper (sign 1.0) or lower (sign -1.0) hull chain from start to end
+
+	:param chains: The chains of every group, on the same side
+	:return: The hull chain from start to end, or None if it has more than steps edges
+	"""
+	hull = [start]
+	point = start
+	for _ in range(steps):
+		best = None
+		for chain in chains:
+			# only the part of each chain after the current point can be next
+			candidate = _best_in_chain(chain, bisect_right(chain, point), point, sign, exact)
+			if candidate is not None and (best is None or _better(point, best, candidate, sign, exact)):
+				best = candidate
+		point = best
+		hull.append(point)
+		if point == end:
+			return hull
+	return None
+
+
+def _best_in_chain(chain: list, first: int, point: tuple, sign: float, exact: bool):
+	"""
+	Binary searches chain[first:] for the point the hull turns to next from point
+	"""
+	if first == len(chain):
+		return None
+	low = first
+	high = len(chain) - 1
+	while low < high:
+		middle = (low + high) // 2
+		if _better(point, chain[middle], chain[middle + 1], sign, exact):
+			low = middle + 1
+		else:
+			high = middle
+	return chain[low]
+
+
+def _better(point: tuple, current: tuple, candidate: tuple, sign: float, exact: bool) -> bool:
+	"""
+	:return: Whether the hull turns to candidate rather than current from point - the one the
+			 other is on the inner side of, or on a tie the farther one
+	"""
+	p_x, p_y = point
+	a_x, a_y = current
+	c_x, c_y = candidate
+	side = (a_x - p_x) * (c_y - p_y) - (a_y - p_y) * (c_x - p_x)
+	if exact:
+		side = settle_side(side, a_x - p_x, a_y - p_y, c_x - p_x, c_y - p_y, p_x, p_y, a_x, a_y, c_x, c_y)
+	if side == 0:
+		# both on one ray from point, the points after it in (x, y) order
+		return candidate > current
+	return sign * side > 0
@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from convex_hull_np import convex_hulls_batch_np
+
+
+#
+# Hull finding for many small groups of points in one call, e.g. the clusters of a
+# pipeline, without the per-call overhead of ConvexHullSolver.compute_hull.  Groups are
+# passed and returned in a ragged format: a flat (N, 2) array holding every group's points,
+# one group after another, and an array of G + 1 offsets, group g being
+# points[offsets[g]:offsets[g + 1]].
+#
+
+# Below this many points per worker, compute_hulls_batch solves in a single process
+MIN_BATCH_CHUNK = 100000
+
+
+def compute_hulls_batch(points, offsets, workers: int = 1) -> tuple:
+	"""
+	Finds the convex hull of every group of points
+
+	:param points: An (N, 2) float64 array of the points of every group, one group after another
+	:param offsets: An array of G + 1 indices into points, group g being points[offsets[g]:offsets[g + 1]]
+	:param workers: The number of worker processes, os.cpu_count() when None
+	:return: A tuple of an (M, 2) array of every hull's vertices in clockwise order, one hull after
+			 another, and an array of G + 1 offsets into it
+	"""
+	points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+	offsets = np.asarray(offsets, dtype=np.intp)
+	indices, hull_offsets = _solve_batch(points, offsets, workers)
+	return points[indices], hull_offsets
+
+
+def _solve_batch(points: np.ndarray, offsets: np.ndarray, workers: int) -> tuple:
+	"""
+	Splits the groups into one contiguous run per worker, with about as many points each
+
+	:return: A tuple of the hull indices into points and the hull offsets, like convex_hulls_batch_np
+	"""
+	if workers is None:
+		workers = os.cpu_count() or 1
+	workers = min(workers, len(offsets) - 1, len(points) // MIN_BATCH_CHUNK)
+	if workers <= 1:
+		return convex_hulls_batch_np(points, offsets)
+
+	# the first group of each run, cutting the points as evenly as the groups allow
+	cuts = np.searchsorted(offsets, np.arange(1, workers) * len(points) // workers)
+	bounds = [0] + np.unique(cuts).tolist() + [len(offsets) - 1]
+	runs = [(points[offsets[first]:offsets[last]], offsets[first:last + 1] - offsets[first])
+			for first, last in zip(bounds[:-1], bounds[1:]) if last > first]
+
+	with ProcessPoolExecutor(max_workers=len(runs)) as executor:
+		results = list(executor.map(convex_hulls_batch_np, *zip(*runs)))
+
+	# shift each run's hulls back to indices into points, and its offsets past the runs before it
+	all_indices = []
+	all_offsets = [np.zeros(1, dtype=np.intp)]
+	point_base = 0
+	hull_base = 0
+	for (run_points, _), (indices, hull_offsets) in zip(runs, results):
+		all_indices.append(indices + point_base)
+		all_offsets.append(hull_offsets[1:] + hull_base)
+		point_base += len(run_points)
+		hull_base += hull_offsets[-1]
+	return np.concatenate(all_indices), np.concatenate(all_offsets)
+
+
+def pack_groups(groups) -> tuple:
+	"""
+	Packs groups of points into the ragged format
+
+	:param groups: An iterable of groups, each a list of (x, y) tuples or an (n, 2) array
+	:return: A tuple of an (N, 2) float64 array of every group's points and an array of G + 1 offsets
+	"""
+	groups = [np.asarray(group, dtype=np.float64).reshape(-1, 2) for group in groups]
+	offsets = np.zeros(len(groups) + 1, dtype=np.intp)
+	np.cumsum([len(group) for group in groups], out=offsets[1:])
+	if not groups:
+		return np.zeros((0, 2)), offsets
+	return np.concatenate(groups), offsets
+
+
+def unpack_groups(points, offsets) -> list:
+	"""
+	Unpacks groups of points from the ragged format
+
+	:return: A list of (n, 2) arrays, one per group, each a view into points
+	"""
+	return [points[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
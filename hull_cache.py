@@ -0,0 +1,153 @@
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b
+from itertools import chain
+
+
+#
+# A bounded cache of solved hulls, so re-solving a point set already seen (a seeded
+# instance of the GUI, a cluster resubmitted by an upstream job) skips the sort and the
+# merges.  Entries are keyed by a fingerprint of the points, or by the parameters they were
+# generated from when those are known, and evicted least recently used first once either
+# the entry or the byte limit is passed.
+#
+
+# Limits of a HullCache, unless told otherwise
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 64 << 20
+
+# Bytes a cached hull costs on top of its indices: the array and the dict entry
+ENTRY_OVERHEAD = 200
+
+
+class HullCache:
+	"""
+	A least recently used cache of hull vertices, as indices into the points they were found from
+
+	max_entries: The most hulls kept
+	max_bytes: The most bytes of hull indices kept, including ENTRY_OVERHEAD per hull
+	nbytes: The bytes currently kept
+	hits: The number of lookups that found a hull
+	misses: The number of lookups that didn't
+	evictions: The number of hulls dropped to stay within the limits
+	"""
+
+	def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.nbytes = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		# hulls are kept as array('q') buffers of indices, so their size is known exactly
+		self._hulls = OrderedDict()
+
+	def get(self, key):
+		"""
+		Looks up a hull, making it the most recently used
+
+		:param key: A key from points_key or generator_key
+		:return: The indices of the hull vertices in clockwise order, as a list, or None
+		"""
+		hull = self._hulls.get(key)
+		if hull is None:
+			self.misses += 1
+			return None
+		self.hits += 1
+		self._hulls.move_to_end(key)
+		return hull.tolist()
+
+	def put(self, key, hull_indices: list):
+		"""
+		Stores a hull, evicting the least recently used hulls past the limits
+
+		A hull too big for max_bytes on its own is not stored.
+
+		:param key: A key from points_key or generator_key
+		:param hull_indices: The indices of the hull vertices in clockwise order
+		"""
+		hull = array('q', hull_indices)
+		size = _entry_size(hull)
+		if size > self.max_bytes:
+			return
+
+		old_hull = self._hulls.pop(key, None)
+		if old_hull is not None:
+			self.nbytes -= _entry_size(old_hull)
+		self._hulls[key] = hull
+		self.nbytes += size
+
+		while len(self._hulls) > self.max_entries or self.nbytes > self.max_bytes:
+			_, evicted = self._hulls.popitem(last=False)
+			self.nbytes -= _entry_size(evicted)
+			self.evictions += 1
+
+	def clear(self):
+		"""
+		Drops every hull, keeping the counters
+		"""
+		self._hulls.clear()
+		self.nbytes = 0
+
+	def hit_rate(self) -> float:
+		"""
+		:return: The fraction of lookups that found a hull
+		"""
+		lookups = self.hits + self.misses
+		if not lookups:
+			return 0.0
+		return self.hits / lookups
+
+	def to_dict(self) -> dict:
+		"""
+		:return: The counters as a dict of plain values, e.g. for JSON
+		"""
+		return {
+			'entries': len(self._hulls),
+			'bytes': self.nbytes,
+			'hits': self.hits,
+			'misses': self.misses,
+			'evictions': self.evictions,
+			'hit_rate': self.hit_rate(),
+		}
+
+	def __len__(self):
+		return len(self._hulls)
+
+	def __contains__(self, key):
+		return key in self._hulls
+
+	def __str__(self):
+		return '{} hulls, {:.1f}KB, {} hits, {} misses ({:.0%} hit rate), {} evictions'.format(
+			len(self._hulls), self.nbytes / 1024, self.hits, self.misses, self.hit_rate(), self.evictions)
+
+
+def points_key(points) -> bytes:
+	"""
+	Fingerprints a point set, in the order given
+
+	The same points in another order are a different key, since sorting them would cost
+	about as much as the hull.
+
+	:param points: A list of (x, y) tuples, or a C-contiguous buffer of x, y doubles, which is hashed in place
+	:return: A 16-byte BLAKE2b digest of the coordinates
+	"""
+	if isinstance(points, list):
+		points = array('d', chain.from_iterable(points))
+	return blake2b(points, digest_size=16).digest()
+
+
+def generator_key(distribution: str, npoints: int, seed: int) -> tuple:
+	"""
+	Keys a point set by the parameters it was generated from, which is free to compute
+
+	:param distribution: The name of the distribution generated from
+	:param npoints: The number of points generated
+	:param seed: The seed of the random number generator
+	:return: A tuple naming the point set
+	"""
+	return 'generated', distribution, npoints, seed
+
+
+def _entry_size(hull: array) -> int:
+	return hull.itemsize * len(hull) + ENTRY_OVERHEAD
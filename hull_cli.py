@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from convex_hull_core import *
+from convex_hull_np import akl_toussaint_mask, convex_hull_dc_np
+from hull_algorithms import compute_hull_points, vertex_indices
+
+
+#
+# Headless hull jobs: reads a point file, finds its convex hull with any engine, and
+# writes the hull's indices into the file or its coordinates.  Point files are
+#
+#   .csv	one x,y pair per line (lines starting with # are skipped)
+#   .npy	an (N, 2) float64 NumPy array
+#   other	raw little-endian float64 values: x0, y0, x1, y1, ... (as hull_stream writes)
+#
+# and hull files are written in the same formats - indices as integers (int64 in binary).
+# Binary and .npy inputs are memory-mapped rather than read, and pre-filtered a chunk at
+# a time with NumPy, so only the points that may be on the hull ever become Python objects.
+#
+# usage: python hull_cli.py points.npy [--output hull.npy] [--engine auto] [--coordinates]
+#
+
+FORMAT_CSV = 'csv'
+FORMAT_NPY = 'npy'
+FORMAT_BINARY = 'bin'
+FORMATS = [FORMAT_CSV, FORMAT_NPY, FORMAT_BINARY]
+
+ENGINES = [ENGINE_AUTO, ENGINE_DC, ENGINE_DC_ITERATIVE, ENGINE_DC_PARALLEL, ENGINE_DC_ARRAY, ENGINE_NUMPY,
+		   ENGINE_MONOTONE_CHAIN, ENGINE_QUICKHULL, ENGINE_CHAN]
+
+# Number of points pre-filtered at a time, bounding the memory of the NumPy temporaries
+FILTER_CHUNK_SIZE = 1 << 20
+
+
+def file_format(path: str) -> str:
+	"""
+	:return: The format of a point or hull file, from its extension
+	"""
+	extension = os.path.splitext(path)[1].lower()
+	if extension == '.csv':
+		return FORMAT_CSV
+	elif extension == '.npy':
+		return FORMAT_NPY
+	return FORMAT_BINARY
+
+
+def read_points(path: str, fmt: str = None) -> np.ndarray:
+	"""
+	Opens a point file
+
+	:param path: The path of the file
+	:param fmt: One of FORMATS, or None to go by the extension
+	:return: An (N, 2) float64 array of the points - a read-only memory map for binary and
+			 .npy files (unless a .npy file holds another dtype, which is converted)
+	"""
+	fmt = fmt or file_format(path)
+	if fmt == FORMAT_CSV:
+		points = np.loadtxt(path, dtype=np.float64, delimiter=',', comments='#', ndmin=2)
+		if points.size == 0:
+			# loadtxt reads an empty file as (0, 1)
+			return np.zeros((0, 2))
+		if points.shape[1] != 2:
+			raise ValueError('{} has {} columns, not x, y'.format(path, points.shape[1]))
+		return points
+	elif fmt == FORMAT_NPY:
+		points = np.load(path, mmap_mode='r')
+		if points.ndim != 2 or points.shape[1] != 2:
+			raise ValueError('{} holds a {} array, not (N, 2)'.format(path, points.shape))
+		return np.asarray(points, dtype=np.float64)
+	elif fmt == FORMAT_BINARY:
+		size = os.path.getsize(path)
+		if size % (2 * 8):
+			raise ValueError('{} is not a whole number of float64 x, y pairs'.format(path))
+		if size == 0:
+			# an empty file can't be mapped
+			return np.zeros((0, 2))
+		return np.memmap(path, dtype='<f8', mode='r').reshape(-1, 2)
+	raise ValueError('Unknown point file format: {}'.format(fmt))
+
+
+def write_array(path: str, values: np.ndarray, fmt: str = None):
+	"""
+	Writes hull indices, or (M, 2) hull coordinates, to a file
+
+	:param fmt: One of FORMATS, or None to go by the extension
+	"""
+	fmt = fmt or file_format(path)
+	integers = values.dtype.kind in 'iu'
+	if fmt == FORMAT_CSV:
+		# 17 significant digits read back as the same doubles
+		np.savetxt(path, values, fmt='%d' if integers else '%.17g', delimiter=',')
+	elif fmt == FORMAT_NPY:
+		np.save(path, values)
+	elif fmt == FORMAT_BINARY:
+		values.astype('<i8' if integers else '<f8').tofile(path)
+	else:
+		raise ValueError('Unknown point file format: {}'.format(fmt))
+
+
+def filter_candidates(points: np.ndarray, chunk_size: int = FILTER_CHUNK_SIZE) -> np.ndarray:
+	"""
+	Finds the points that may be on the hull, a chunk at a time
+
+	A point inside the extreme octagon of its chunk is inside the hull, and so is one inside
+	the extreme octagon of the survivors of every chunk.
+
+	:param points: An (N, 2) float64 array, e.g. a memory map
+	:return: A sorted array of the indices of the points left
+	"""
+	survivors = []
+	for start in range(0, len(points), chunk_size):
+		chunk = points[start:start + chunk_size]
+		survivors.append(start + np.flatnonzero(akl_toussaint_mask(chunk[:, 0], chunk[:, 1])))
+	if not survivors:
+		return np.zeros(0, dtype=np.intp)
+	survivors = np.concatenate(survivors)
+	candidates = points[survivors]
+	return survivors[akl_toussaint_mask(candidates[:, 0], candidates[:, 1])]
+
+
+def hull_indices(points: np.ndarray, engine: str = ENGINE_AUTO, exact: bool = False) -> np.ndarray:
+	"""
+	Finds a convex hull with any engine
+
+	:param points: An (N, 2) float64 array of points
+	:param engine: One of ENGINES
+	:param exact: Whether near-collinear points are settled in exact arithmetic
+	:return: An array of indices into points, composing the convex hull in clockwise order,
+			 with the first index of any repeated point
+	"""
+	if len(points) == 0:
+		return np.zeros(0, dtype=np.intp)
+	if engine == ENGINE_NUMPY:
+		return convex_hull_dc_np(points, exact=exact)
+
+	coords = list(zip(points[:, 0].tolist(), points[:, 1].tolist()))
+	# the engines return coordinates: map them back to the first index of each point
+	return np.array(vertex_indices(coords, compute_hull_points(coords, engine, exact=exact)), dtype=np.intp)
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Find the convex hull of a point file.')
+	parser.add_argument('input', help='a .csv, .npy or raw little-endian float64 point file')
+	parser.add_argument('--output', help='write the hull to this file (.csv, .npy or raw binary)')
+	parser.add_argument('--input-format', choices=FORMATS, help='the input format, if not by extension')
+	parser.add_argument('--output-format', choices=FORMATS, help='the output format, if not by extension')
+	parser.add_argument('--engine', default=ENGINE_AUTO, choices=ENGINES)
+	parser.add_argument('--coordinates', action='store_true', help='write the hull coordinates, not indices')
+	parser.add_argument('--no-prefilter', action='store_true', help='give every point to the engine')
+	parser.add_argument('--exact', action='store_true', help='settle near-collinear points exactly')
+	args = parser.parse_args(argv)
+
+	timings = []
+	t1 = time.perf_counter()
+	try:
+		points = read_points(args.input, args.input_format)
+	except (OSError, ValueError) as error:
+		parser.error(str(error))
+	timings.append(('read', time.perf_counter() - t1))
+
+	t1 = time.perf_counter()
+	if args.no_prefilter:
+		candidates = None
+	else:
+		candidates = filter_candidates(points)
+	timings.append(('prefilter', time.perf_counter() - t1))
+
+	t1 = time.perf_counter()
+	if candidates is None:
+		indices = hull_indices(points, args.engine, args.exact)
+	else:
+		# the candidates are the only points copied out of the file
+		indices = candidates[hull_indices(points[candidates], args.engine, args.exact)]
+	timings.append(('hull', time.perf_counter() - t1))
+
+	if args.output:
+		t1 = time.perf_counter()
+		write_array(args.output, points[indices] if args.coordinates else indices, args.output_format)
+		timings.append(('write', time.perf_counter() - t1))
+
+	print('{} points, {} on the hull ({})'.format(len(points), len(indices), args.engine))
+	if candidates is not None:
+		print('pre-filter kept {} points'.format(len(candidates)))
+	for phase, seconds in timings:
+		print('{:<10} {:9.4f}s'.format(phase, seconds))
+	print('{:<10} {:9.4f}s'.format('total', sum(seconds for _, seconds in timings)))
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,117 @@
+from array import array
+from itertools import chain
+
+from convex_hull_core import Hull, convert_nodes_to_list
+
+
+#
+# Opt-in recording of the divide and conquer merges, for animating them afterwards.  Pass
+# a HullEvents to convex_hull_dc, convex_hull_dc_iterative or combine, and every merge
+# appends its events to the log, at full speed - the view plays the log back later (see
+# Proj2GUI.PointLineView.playEvents), at any speed and from any point.  The tangent walkers
+# append the lines they try to the arrays combine passes them (see
+# convex_hull_core.walk_tangent), so with no HullEvents the only cost is one check per
+# walker step.
+#
+# A merge of two hulls logs, in order:
+#
+#   EVENT_CANDIDATE	x1, y1, x2, y2	every line the upper tangent walk moves to, from the first
+#   EVENT_TANGENT	x1, y1, x2, y2	the upper tangent
+#   EVENT_CANDIDATE ...				the same for the lower tangent
+#   EVENT_TANGENT	...
+#   EVENT_MERGE		the leftmost and rightmost points of the left hull, then of the right
+#
+# The combined hull is not logged: it is the two hulls bridged by the tangents, which the
+# player rebuilds with merge_vertices.  The hulls the merges start from are logged as
+# EVENT_SUBHULL, their vertices in clockwise order x0, y0, x1, y1, ..., when built
+# directly from more than 1 point (see convex_hull_core.DC_BASE_SIZE).  A hull is named by
+# its leftmost and rightmost points, since it holds every sorted point between them; a
+# hull of 1 point is never logged, its name holds it.
+#
+
+EVENT_SUBHULL = 0
+EVENT_CANDIDATE = 1
+EVENT_TANGENT = 2
+EVENT_MERGE = 3
+
+
+class HullEvents:
+	"""
+	A log of merge events, kept in flat arrays: a kind per event, and each event's values
+	one after another in a single array of doubles
+	"""
+
+	def __init__(self):
+		self.kinds = array('b')
+		self.starts = array('q')
+		self.values = array('d')
+
+	def record_merge(self, left_hull: Hull, right_hull: Hull, upper_lines: array, lower_lines: array):
+		"""
+		Records the tangent walks of one merge, called by combine before it connects the hulls
+
+		:param upper_lines: The lines the upper tangent walk appended, the tangent last
+		:param lower_lines: The same for the lower tangent walk
+		"""
+		for lines in (upper_lines, lower_lines):
+			for i in range(0, len(lines), 4):
+				self._add(EVENT_CANDIDATE, lines[i:i + 4])
+			self._add(EVENT_TANGENT, lines[-4:])
+		self._add(EVENT_MERGE, (left_hull.leftmost.x, left_hull.leftmost.y, left_hull.rightmost.x, left_hull.rightmost.y,
+								right_hull.leftmost.x, right_hull.leftmost.y, right_hull.rightmost.x, right_hull.rightmost.y))
+
+	def record_hull(self, hull: Hull):
+		"""
+		Records a hull built directly from its points, before any merge uses it
+		"""
+		self._add(EVENT_SUBHULL, chain.from_iterable(convert_nodes_to_list(hull.root)))
+
+	def _add(self, kind: int, values):
+		self.kinds.append(kind)
+		self.starts.append(len(self.values))
+		self.values.extend(values)
+
+	def __len__(self):
+		return len(self.kinds)
+
+	def __getitem__(self, index: int) -> tuple:
+		"""
+		:return: A tuple of the kind of event index and a tuple of its values
+		"""
+		end = self.starts[index + 1] if index + 1 < len(self.starts) else len(self.values)
+		return self.kinds[index], tuple(self.values[self.starts[index]:end])
+
+	def __str__(self):
+		counts = [self.kinds.count(kind) for kind in (EVENT_SUBHULL, EVENT_CANDIDATE, EVENT_TANGENT, EVENT_MERGE)]
+		return '{} events: {} merges, {} tangent candidates, {:.1f}KB'.format(
+			len(self), counts[3], counts[1], (self.values.itemsize * len(self.values) + 9 * len(self)) / 1024)
+
+
+def merge_vertices(left: tuple, right: tuple, upper: tuple, lower: tuple) -> tuple:
+	"""
+	Rebuilds the hull an EVENT_MERGE combines, as combine connects it
+
+	:param left: The vertices of the left hull in clockwise order, x0, y0, x1, y1, ...
+	:param right: The same for the right hull
+	:param upper: The upper tangent, x1, y1, x2, y2
+	:param lower: The lower tangent
+	:return: The vertices of the combined hull in clockwise order, from the upper tangent's left point
+	"""
+	# clockwise, the right hull runs from the upper tangent down to the lower, and the left
+	# hull from the lower tangent back up to the upper
+	right_arc = _clockwise_arc(right, upper[2:4], lower[2:4])
+	left_arc = _clockwise_arc(left, lower[0:2], upper[0:2])
+	return tuple(upper[0:2]) + right_arc + left_arc[:-2]
+
+
+def _clockwise_arc(vertices: tuple, first: tuple, last: tuple) -> tuple:
+	"""
+	:return: The vertices from first to last, both included, going clockwise
+	"""
+	points = list(zip(vertices[0::2], vertices[1::2]))
+	start = points.index(tuple(first))
+	end = points.index(tuple(last))
+	if end < start:
+		end += len(points)
+	points = points + points
+	return tuple(chain.from_iterable(points[start:end + 1]))
@@ -0,0 +1,339 @@
+from bisect import bisect_left, bisect_right
+from math import atan2, pi
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+from convex_hull_core import PointNode, convert_nodes_to_list
+
+
+#
+# Queries against a finished hull: whether a point is inside it, its farthest vertex in a
+# direction, and the tangents to it from an outside point.  The hull's vertices are split
+# into an upper chain, left to right over the top, and a lower chain, left to right along
+# the bottom, so every query is a binary search rather than a walk around the ring.  Each
+# query has a vectorized *_batch variant, for an array of queries, which needs NumPy.
+#
+
+
+class HullIndex:
+	"""
+	An index over the vertices of a convex hull, for O(log n) queries
+
+	vertices: The hull vertices in clockwise order, from the leftmost (the lowest of those), as (x, y) tuples
+	upper: The upper chain, vertices[0] to the rightmost vertex (the highest of those)
+	lower: The lower chain, vertices[0] and then the remaining vertices backwards to the rightmost
+
+	The batch queries return indices into vertices, and -1 where there is no answer.
+	"""
+
+	def __init__(self, vertices: list):
+		"""
+		:param vertices: The hull vertices in clockwise order, as (x, y) tuples, e.g. from convert_nodes_to_list
+		"""
+		if not vertices:
+			raise ValueError('A hull needs at least one vertex')
+		vertices = [(float(x), float(y)) for x, y in vertices]
+		start = vertices.index(min(vertices))
+		self.vertices = vertices[start:] + vertices[:start]
+		rightmost = self.vertices.index(max(self.vertices))
+		self.upper = self.vertices[:rightmost + 1]
+		self.lower = self.vertices[:1] + self.vertices[:rightmost - 1:-1]
+
+		self._upper_x = [x for x, _ in self.upper]
+		self._lower_x = [x for x, _ in self.lower]
+
+		# the outward normal angle of each clockwise edge, vertices[k] to vertices[k + 1], unwrapped
+		# so they decrease from normal_angles[0] through less than a full turn
+		self._normal_angles = []
+		count = len(self.vertices)
+		for k in range(count if count > 1 else 0):
+			(x1, y1), (x2, y2) = self.vertices[k], self.vertices[(k + 1) % count]
+			angle = atan2(x2 - x1, y1 - y2)
+			while self._normal_angles and angle > self._normal_angles[-1]:
+				angle -= 2 * pi
+			self._normal_angles.append(angle)
+		self._negated_angles = [-angle for angle in self._normal_angles]
+
+		self._arrays = None
+
+	@classmethod
+	def from_node(cls, node: PointNode) -> 'HullIndex':
+		"""
+		:param node: Any node of a hull ring, e.g. the root of the Hull returned by convex_hull_dc
+		"""
+		return cls(convert_nodes_to_list(node))
+
+	def __len__(self):
+		return len(self.vertices)
+
+	def contains(self, point: tuple) -> bool:
+		"""
+		Finds if a point is inside or on the hull
+
+		:param point: An (x, y) tuple
+		:return: Whether the point is inside or on the hull
+		"""
+		x, y = point
+		upper = self.upper
+		lower = self.lower
+		if x < upper[0][0] or x > upper[-1][0]:
+			return False
+
+		# at most the top of the hull at x - the last upper vertex at x is the highest
+		i = bisect_right(self._upper_x, x) - 1
+		if i == len(upper) - 1:
+			if y > upper[i][1]:
+				return False
+		elif _cross(upper[i], upper[i + 1], x, y) > 0:
+			return False
+
+		# at least the bottom of the hull at x - the first lower vertex at x is the lowest
+		j = bisect_left(self._lower_x, x) - 1
+		if j < 0:
+			if y < lower[0][1]:
+				return False
+		elif _cross(lower[j], lower[j + 1], x, y) < 0:
+			return False
+
+		return True
+
+	def extreme(self, direction: tuple) -> tuple:
+		"""
+		Finds the vertex farthest in a direction
+
+		:param direction: A nonzero (dx, dy) tuple
+		:return: The (x, y) vertex maximizing dx * x + dy * y, either one on a tie
+		"""
+		return self.vertices[self._extreme_index(atan2(direction[1], direction[0]))]
+
+	def _extreme_index(self, angle: float) -> int:
+		if not self._normal_angles:
+			return 0
+		# a vertex is extreme for the directions between the normals of its two edges
+		first = self._normal_angles[0]
+		angle = first - (first - angle) % (2 * pi)
+		return bisect_left(self._negated_angles, -angle) % len(self.vertices)
+
+	def tangents(self, point: tuple):
+		"""
+		Finds the tangents to the hull from a point outside of it
+
+		:param point: An (x, y) tuple
+		:return: A tuple of the two (x, y) vertices the tangents touch, in clockwise order around the
+				 hull, so the edges facing point run clockwise from the first to the second - or None
+				 when point is inside or on the hull
+		"""
+		if self.contains(point):
+			return None
+		x, y = point
+		upper = self.upper
+		lower = self.lower
+		if len(upper) == 1:
+			return upper[0], upper[0]
+
+		# an edge faces point when point is strictly outside its line: above an upper edge, or
+		# below a lower edge.  The edges facing point are contiguous around the hull, and on
+		# the stretches searched below they are a prefix or a suffix
+		def faces_upper(k):
+			return _cross(upper[k], upper[k + 1], x, y) > 0
+
+		def faces_lower(k):
+			return _cross(lower[k], lower[k + 1], x, y) < 0
+
+		if x < upper[0][0]:
+			# facing edges run from the lower tangent, back to the leftmost vertex, and up to the upper tangent
+			return (lower[_prefix(faces_lower, 0, len(lower) - 1, True)],
+					upper[_prefix(faces_upper, 0, len(upper) - 1, True)])
+		if x > upper[-1][0]:
+			# facing edges run from the upper tangent, on to the rightmost vertex, and back to the lower tangent
+			return (upper[_prefix(faces_upper, 0, len(upper) - 1, False)],
+					lower[_prefix(faces_lower, 0, len(lower) - 1, False)])
+
+		i = bisect_right(self._upper_x, x) - 1
+		if i == len(upper) - 1:
+			above = y > upper[i][1]
+		else:
+			above = faces_upper(i)
+		if above:
+			# above the hull - the facing edges are on the upper chain, around the edge under point
+			i = min(i, len(upper) - 2)
+			return (upper[_prefix(faces_upper, 0, i, False)],
+					upper[_prefix(faces_upper, i, len(upper) - 1, True)])
+
+		# below the hull - the facing edges are on the lower chain, around the edge over point
+		j = max(bisect_left(self._lower_x, x) - 1, 0)
+		return (lower[_prefix(faces_lower, j, len(lower) - 1, True)],
+				lower[_prefix(faces_lower, 0, j, False)])
+
+	def contains_batch(self, points) -> 'np.ndarray':
+		"""
+		Vectorized contains
+
+		:param points: An (N, 2) array of points
+		:return: A boolean array, True for the points inside or on the hull
+		"""
+		xs, ys = _split(points)
+		upper_x, upper_y, lower_x, lower_y, _ = self._chain_arrays()
+		last = len(upper_x) - 1
+
+		inside = (xs >= upper_x[0]) & (xs <= upper_x[-1])
+
+		i = np.searchsorted(upper_x, xs, side='right') - 1
+		i = np.clip(i, 0, last)
+		after = np.minimum(i + 1, last)
+		top = _cross_arrays(upper_x[i], upper_y[i], upper_x[after], upper_y[after], xs, ys)
+		inside &= np.where(i == last, ys <= upper_y[i], top <= 0)
+
+		j = np.searchsorted(lower_x, xs, side='left') - 1
+		before = np.clip(j, 0, len(lower_x) - 1)
+		after = np.minimum(before + 1, len(lower_x) - 1)
+		bottom = _cross_arrays(lower_x[before], lower_y[before], lower_x[after], lower_y[after], xs, ys)
+		inside &= np.where(j < 0, ys >= lower_y[0], bottom >= 0)
+
+		return inside
+
+	def extreme_batch(self, directions) -> 'np.ndarray':
+		"""
+		Vectorized extreme
+
+		:param directions: An (N, 2) array of nonzero directions
+		:return: An array of the indices into vertices of the vertices farthest in each direction
+		"""
+		dxs, dys = _split(directions)
+		if not self._normal_angles:
+			return np.zeros(len(dxs), dtype=np.intp)
+		first = self._normal_angles[0]
+		angles = first - np.mod(first - np.arctan2(dys, dxs), 2 * pi)
+		negated_angles = self._chain_arrays()[4]
+		return np.searchsorted(negated_angles, -angles, side='left') % len(self.vertices)
+
+	def tangents_batch(self, points) -> tuple:
+		"""
+		Vectorized tangents
+
+		:param points: An (N, 2) array of points
+		:return: A tuple of two arrays of indices into vertices, of the first and second tangent
+				 vertices from each point, in clockwise order, -1 for points inside or on the hull
+		"""
+		xs, ys = _split(points)
+		upper_x, upper_y, lower_x, lower_y, _ = self._chain_arrays()
+		upper_edges = len(upper_x) - 1
+		lower_edges = len(lower_x) - 1
+		count = len(self.vertices)
+
+		first = np.full(len(xs), -1, dtype=np.intp)
+		second = np.full(len(xs), -1, dtype=np.intp)
+		outside = ~self.contains_batch(np.column_stack((xs, ys)))
+		if upper_edges == 0:
+			first[outside] = 0
+			second[outside] = 0
+			return first, second
+
+		def upper_prefix(lo, hi, facing, mask):
+			return _prefix_batch(upper_x, upper_y, xs[mask], ys[mask], lo, hi, 1.0, facing)
+
+		def lower_prefix(lo, hi, facing, mask):
+			# lower chain index k is vertices index -k, wrapped
+			k = _prefix_batch(lower_x, lower_y, xs[mask], ys[mask], lo, hi, -1.0, facing)
+			return (count - k) % count
+
+		def full(mask, value):
+			return np.full(np.count_nonzero(mask), value, dtype=np.intp)
+
+		left = outside & (xs < upper_x[0])
+		first[left] = lower_prefix(full(left, 0), full(left, lower_edges), True, left)
+		second[left] = upper_prefix(full(left, 0), full(left, upper_edges), True, left)
+
+		right = outside & (xs > upper_x[-1])
+		first[right] = upper_prefix(full(right, 0), full(right, upper_edges), False, right)
+		second[right] = lower_prefix(full(right, 0), full(right, lower_edges), False, right)
+
+		between = outside & ~left & ~right
+		i = np.clip(np.searchsorted(upper_x, xs, side='right') - 1, 0, upper_edges)
+		after = np.minimum(i + 1, upper_edges)
+		top = _cross_arrays(upper_x[i], upper_y[i], upper_x[after], upper_y[after], xs, ys)
+		above = between & np.where(i == upper_edges, ys > upper_y[i], top > 0)
+		i = np.minimum(i, upper_edges - 1)[above]
+		first[above] = upper_prefix(np.zeros_like(i), i, False, above)
+		second[above] = upper_prefix(i, np.full_like(i, upper_edges), True, above)
+
+		below = between & ~above
+		j = np.maximum(np.searchsorted(lower_x, xs, side='left') - 1, 0)[below]
+		first[below] = lower_prefix(j, np.full_like(j, lower_edges), True, below)
+		second[below] = lower_prefix(np.zeros_like(j), j, False, below)
+
+		return first, second
+
+	def _chain_arrays(self) -> tuple:
+		"""
+		:return: The chains as float64 arrays, upper x, upper y, lower x and lower y, and the negated normal angles
+		"""
+		if np is None:
+			raise ValueError('The batch queries need NumPy')
+		if self._arrays is None:
+			upper = np.array(self.upper, dtype=np.float64)
+			lower = np.array(self.lower, dtype=np.float64)
+			self._arrays = (upper[:, 0], upper[:, 1], lower[:, 0], lower[:, 1],
+							np.array(self._negated_angles, dtype=np.float64))
+		return self._arrays
+
+
+def _cross(a: tuple, b: tuple, x: float, y: float) -> float:
+	"""
+	Positive when (x, y) is left of the line from a to b, negative when right, 0 when on it
+	"""
+	return (b[0] - a[0]) * (y - a[1]) - (b[1] - a[1]) * (x - a[0])
+
+
+def _cross_arrays(a_x, a_y, b_x, b_y, x, y):
+	"""
+	Vectorized _cross
+	"""
+	return (b_x - a_x) * (y - a_y) - (b_y - a_y) * (x - a_x)
+
+
+def _prefix(faces, lo: int, hi: int, facing: bool) -> int:
+	"""
+	Binary search for the end of the run of edges at the start of [lo, hi) for which faces(k) is facing
+
+	:return: The first k in [lo, hi) for which faces(k) is not facing, or hi
+	"""
+	while lo < hi:
+		mid = (lo + hi) // 2
+		if faces(mid) == facing:
+			lo = mid + 1
+		else:
+			hi = mid
+	return lo
+
+
+def _prefix_batch(chain_x, chain_y, xs, ys, lo, hi, sign: float, facing: bool):
+	"""
+	Vectorized _prefix over the edges of one chain, an edge facing a point when sign times
+	_cross of the edge and the point is positive
+	"""
+	last_edge = len(chain_x) - 2
+	lo = lo.copy()
+	hi = hi.copy()
+	while True:
+		active = lo < hi
+		if not active.any():
+			return lo
+		mid = np.minimum((lo + hi) >> 1, last_edge)
+		side = sign * _cross_arrays(chain_x[mid], chain_y[mid], chain_x[mid + 1], chain_y[mid + 1], xs, ys)
+		holds = (side > 0) == facing
+		lo = np.where(active & holds, mid + 1, lo)
+		hi = np.where(active & ~holds, mid, hi)
+
+
+def _split(points) -> tuple:
+	"""
+	:return: The x and y columns of an (N, 2) array of points, as float64 arrays
+	"""
+	if np is None:
+		raise ValueError('The batch queries need NumPy')
+	points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+	return points[:, 0], points[:, 1]
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from convex_hull_np import convex_hull_dc_np, convex_hulls_batch_np
+
+
+#
+# A local hull service, so processes that need hulls share one warmed-up solver rather
+# than each importing the engines.  It listens on a Unix socket or a localhost TCP port.
+#
+# Every message is a HEADER (kind or status, request id, count) followed by a payload:
+#
+#   request  KIND_HULL		count points as little-endian float64 x, y pairs
+#			 KIND_STATS		nothing (count 0)
+#   response STATUS_OK		count little-endian int64 hull indices into the request's points,
+#							in clockwise order from the leftmost point (the lowest of those),
+#							with the first index of any repeated point
+#			 STATUS_ERROR	count bytes of a UTF-8 error message
+#			 STATUS_STATS	count bytes of the ServerStats as UTF-8 JSON
+#
+# A client may send many requests before reading the responses, which come back in the
+# order they are solved, tagged with their request id.  Requests of at most
+# SMALL_REQUEST_POINTS points are collected for up to BATCH_WINDOW seconds and solved
+# together on a thread, by convex_hulls_batch_np when there are enough of them - the answer
+# to a request is the same however it is solved.  Larger
+# ones are solved one each by convex_hull_dc_np in a process pool.  No more than max_pending_points points are held at
+# once: past that, the server stops reading requests until some are answered, so fast
+# clients are slowed down by their socket buffers filling rather than by its memory.
+#
+# usage: python hull_server.py (--unix /tmp/hull.sock | --port 8765) [--workers 4]
+#
+
+HEADER = struct.Struct('<BII')
+
+KIND_HULL = 0
+KIND_STATS = 1
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_STATS = 2
+
+# Requests of at most this many points are batched, larger ones go to the process pool
+SMALL_REQUEST_POINTS = 1024
+
+# A batch is solved once it has this many points, or its first request has waited BATCH_WINDOW seconds
+BATCH_POINTS = 1 << 16
+BATCH_WINDOW = 0.002
+
+# Below this many requests, a batch is solved a request at a time: convex_hulls_batch_np
+# pays a NumPy call per column of its widest group, which only enough rows make up for
+MIN_VECTOR_BATCH = 64
+
+# Limits of a HullServer, unless told otherwise
+DEFAULT_MAX_PENDING_POINTS = 1 << 24
+DEFAULT_MAX_REQUEST_POINTS = 1 << 26
+
+# The number of latencies kept for the percentiles
+LATENCY_WINDOW = 10000
+
+
+class ServerStats:
+	"""
+	Throughput and latency counters of a HullServer
+
+	requests: The number of hull requests answered
+	points: The number of points in them
+	errors: The number of hull requests that failed
+	batches: The number of batches of small requests solved
+	latencies: The latest LATENCY_WINDOW request latencies, from the request read to the response sent, in seconds
+	"""
+
+	def __init__(self):
+		self.started = time.perf_counter()
+		self.requests = 0
+		self.points = 0
+		self.errors = 0
+		self.batches = 0
+		self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+	def record(self, npoints: int, latency: float, error: bool = False):
+		self.requests += 1
+		self.points += npoints
+		self.errors += error
+		self.latencies.append(latency)
+
+	def percentile(self, percent: float) -> float:
+		"""
+		:return: The latency below which percent of the recent requests were answered, in seconds, or None
+		"""
+		if not self.latencies:
+			return None
+		latencies = sorted(self.latencies)
+		return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+	def to_dict(self) -> dict:
+		"""
+		:return: The counters, rates and percentiles as a dict of plain values, e.g. for JSON
+		"""
+		elapsed = time.perf_counter() - self.started
+		return {
+			'uptime': elapsed,
+			'requests': self.requests,
+			'points': self.points,
+			'errors': self.errors,
+			'batches': self.batches,
+			'requests_per_second': self.requests / elapsed,
+			'points_per_second': self.points / elapsed,
+			'latency_p50': self.percentile(50),
+			'latency_p90': self.percentile(90),
+			'latency_p99': self.percentile(99),
+		}
+
+	def __str__(self):
+		if not self.latencies:
+			return '{} requests'.format(self.requests)
+		values = self.to_dict()
+		return '{} requests ({:.0f}/s, {:.0f} points/s), {} errors, latency p50 {:.2f}ms p90 {:.2f}ms p99 {:.2f}ms'.format(
+			self.requests, values['requests_per_second'], values['points_per_second'], self.errors,
+			1000 * values['latency_p50'], 1000 * values['latency_p90'], 1000 * values['latency_p99'])
+
+
+class PointBudget:
+	"""
+	Bounds the points held by requests being solved
+
+	A request bigger than the whole budget waits for every other request to finish, then runs alone.
+	"""
+
+	def __init__(self, limit: int):
+		self.limit = limit
+		self.used = 0
+		self._condition = asyncio.Condition()
+
+	async def acquire(self, npoints: int):
+		async with self._condition:
+			await self._condition.wait_for(lambda: self.used == 0 or self.used + npoints <= self.limit)
+			self.used += npoints
+
+	async def release(self, npoints: int):
+		async with self._condition:
+			self.used -= npoints
+			self._condition.notify_all()
+
+
+class HullServer:
+	"""
+	Answers hull requests over a socket, see the framing above
+
+	Call serve_unix or serve_tcp in an event loop, then close when done.
+	"""
+
+	def __init__(self, workers: int = None, max_pending_points: int = DEFAULT_MAX_PENDING_POINTS,
+				 max_request_points: int = DEFAULT_MAX_REQUEST_POINTS):
+		"""
+		:param workers: The number of processes solving large requests, os.cpu_count() when None
+		:param max_pending_points: The most points held by requests being read or solved
+		:param max_request_points: The most points in one request; a bigger one is refused, closing its connection
+		"""
+		self.max_request_points = max_request_points
+		self.stats = ServerStats()
+		self._max_pending_points = max_pending_points
+		self._pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+		# batches run off the event loop, one at a time
+		self._batch_thread = ThreadPoolExecutor(max_workers=1)
+		self._budget = None
+		self._batch = None
+		self._batcher = None
+		self._server = None
+		# the tasks serving the open connections
+		self._connections = set()
+
+	async def serve_unix(self, path: str):
+		self._start()
+		self._server = await asyncio.start_unix_server(self._serve_connection, path)
+
+	async def serve_tcp(self, host: str = '127.0.0.1', port: int = 0) -> int:
+		"""
+		:return: The port listened on, which the system picks when port is 0
+		"""
+		self._start()
+		self._server = await asyncio.start_server(self._serve_connection, host, port)
+		return self._server.sockets[0].getsockname()[1]
+
+	async def serve_forever(self):
+		await self._server.serve_forever()
+
+	async def close(self):
+		if self._server is not None:
+			self._server.close()
+			await self._server.wait_closed()
+		# the connections stop reading, answer what they have read, then close
+		for connection in self._connections:
+			connection.cancel()
+		if self._connections:
+			await asyncio.gather(*self._connections, return_exceptions=True)
+		if self._batcher is not None:
+			self._batcher.cancel()
+			await asyncio.gather(self._batcher, return_exceptions=True)
+		self._pool.shutdown()
+		self._batch_thread.shutdown()
+
+	def _start(self):
+		# the asyncio objects belong to the running loop
+		self._budget = PointBudget(self._max_pending_points)
+		self._batch = asyncio.Queue()
+		self._batcher = asyncio.ensure_future(self._run_batches())
+
+	async def _serve_connection(self, reader, writer):
+		connection = asyncio.current_task()
+		self._connections.add(connection)
+		write_lock = asyncio.Lock()
+		answering = set()
+		try:
+			while True:
+				try:
+					kind, request_id, count = HEADER.unpack(await reader.readexactly(HEADER.size))
+				except (asyncio.IncompleteReadError, ConnectionError):
+					break
+
+				if kind == KIND_STATS:
+					await self._send(writer, write_lock, STATUS_STATS, request_id, json.dumps(self.stats.to_dict()).encode())
+					continue
+				if kind != KIND_HULL or count > self.max_request_points:
+					# the rest of the stream can't be trusted to be framed, so it is dropped
+					message = 'request too large' if kind == KIND_HULL else 'unknown request kind {}'.format(kind)
+					await self._send(writer, write_lock, STATUS_ERROR, request_id, message.encode())
+					break
+
+				# back-pressure: nothing more is read from any client until the points fit
+				await self._budget.acquire(count)
+				try:
+					payload = await reader.readexactly(16 * count)
+				except (asyncio.IncompleteReadError, ConnectionError):
+					await self._budget.release(count)
+					break
+				task = asyncio.ensure_future(self._answer(writer, write_lock, request_id, payload, count))
+				answering.add(task)
+				task.add_done_callback(answering.discard)
+		except asyncio.CancelledError:
+			# close() stops reading: the connection ends like a client hanging up, rather than
+			# as a cancelled task asyncio would report
+			pass
+		finally:
+			if answering:
+				await asyncio.gather(*answering, return_exceptions=True)
+			writer.close()
+			self._connections.discard(connection)
+
+	async def _answer(self, writer, write_lock, request_id: int, payload: bytes, count: int):
+		start = time.perf_counter()
+		error = False
+		try:
+			indices = await self._solve(payload, count)
+			status, data = STATUS_OK, indices.astype('<i8').tobytes()
+		except Exception as exception:
+			error = True
+			status, data = STATUS_ERROR, '{}: {}'.format(type(exception).__name__, exception).encode()
+		finally:
+			await self._budget.release(count)
+		try:
+			await self._send(writer, write_lock, status, request_id, data)
+		except ConnectionError:
+			error = True
+		self.stats.record(count, time.perf_counter() - start, error)
+
+	async def _solve(self, payload: bytes, count: int) -> np.ndarray:
+		if count == 0:
+			return np.zeros(0, dtype=np.intp)
+		if count > SMALL_REQUEST_POINTS:
+			return await asyncio.get_running_loop().run_in_executor(self._pool, _solve_points, payload)
+		future = asyncio.get_running_loop().create_future()
+		await self._batch.put((np.frombuffer(payload, dtype='<f8').reshape(-1, 2), future))
+		return await future
+
+	async def _run_batches(self):
+		loop = asyncio.get_running_loop()
+		while True:
+			requests = [await self._batch.get()]
+			npoints = len(requests[0][0])
+			deadline = loop.time() + BATCH_WINDOW
+			while npoints < BATCH_POINTS:
+				try:
+					request = await asyncio.wait_for(self._batch.get(), deadline - loop.time())
+				except asyncio.TimeoutError:
+					break
+				requests.append(request)
+				npoints += len(request[0])
+
+			groups = [points for points, _ in requests]
+			try:
+				hulls = await loop.run_in_executor(self._batch_thread, _solve_batch, groups)
+			except Exception as exception:
+				for _, future in requests:
+					if not future.done():
+						future.set_exception(exception)
+				continue
+			self.stats.batches += 1
+			for (_, future), hull in zip(requests, hulls):
+				if not future.done():
+					future.set_result(hull)
+
+	@staticmethod
+	async def _send(writer, write_lock, status: int, request_id: int, data: bytes):
+		# responses are written whole, however many requests finish together
+		async with write_lock:
+			writer.write(HEADER.pack(status, request_id, len(data) // 8 if status == STATUS_OK else len(data)))
+			writer.write(data)
+			await writer.drain()
+
+
+def _solve_points(payload: bytes) -> np.ndarray:
+	"""
+	Solves one large request, in a worker process
+	"""
+	points = np.frombuffer(payload, dtype='<f8').reshape(-1, 2)
+	return _from_leftmost(points, convex_hull_dc_np(points, prefilter=True))
+
+
+def _solve_batch(groups: list) -> list:
+	"""
+	Solves a batch of small requests together
+
+	:param groups: A list of (n, 2) arrays
+	:return: A list of arrays of hull indices, each into its own group
+	"""
+	if len(groups) < MIN_VECTOR_BATCH:
+		return [_from_leftmost(group, convex_hull_dc_np(group)) for group in groups]
+	offsets = np.zeros(len(groups) + 1, dtype=np.intp)
+	np.cumsum([len(group) for group in groups], out=offsets[1:])
+	indices, hull_offsets = convex_hulls_batch_np(np.concatenate(groups), offsets)
+	return [indices[hull_offsets[g]:hull_offsets[g + 1]] - offsets[g] for g in range(len(groups))]
+
+
+def _from_leftmost(points: np.ndarray, hull: np.ndarray) -> np.ndarray:
+	"""
+	Rotates a hull of convex_hull_dc_np to start from its leftmost point (the lowest of
+	those), where the hulls of convex_hulls_batch_np start
+	"""
+	if len(hull) < 2:
+		return hull
+	vertices = points[hull]
+	return np.roll(hull, -np.lexsort((vertices[:, 1], vertices[:, 0]))[0])
+
+
+class HullClient:
+	"""
+	A blocking client of a HullServer, one request at a time
+	"""
+
+	def __init__(self, address):
+		"""
+		:param address: The path of a Unix socket, or a (host, port) tuple
+		"""
+		if isinstance(address, str):
+			self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		else:
+			self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		self._socket.connect(address)
+		self._next_id = 0
+
+	def hull(self, points) -> np.ndarray:
+		"""
+		:param points: An (N, 2) array of points, or a list of (x, y) tuples
+		:return: An array of indices into points, composing the convex hull in clockwise order
+				 from the leftmost point, with the first index of any repeated point
+		"""
+		values = np.ascontiguousarray(points, dtype='<f8').reshape(-1, 2)
+		status, data = self._request(KIND_HULL, len(values), values)
+		return np.frombuffer(data, dtype='<i8').astype(np.intp)
+
+	def stats(self) -> dict:
+		"""
+		:return: The server's ServerStats.to_dict()
+		"""
+		status, data = self._request(KIND_STATS, 0, b'')
+		return json.loads(data)
+
+	def close(self):
+		self._socket.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def _request(self, kind: int, count: int, payload) -> tuple:
+		request_id = self._next_id
+		self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+		self._socket.sendall(HEADER.pack(kind, request_id, count))
+		if len(payload):
+			self._socket.sendall(payload)
+		status, _, count = HEADER.unpack(self._receive(HEADER.size))
+		data = self._receive(8 * count if status == STATUS_OK else count)
+		if status == STATUS_ERROR:
+			raise RuntimeError('hull server: {}'.format(data.decode()))
+		return status, data
+
+	def _receive(self, size: int) -> bytes:
+		data = bytearray(size)
+		view = memoryview(data)
+		received = 0
+		while received < size:
+			n = self._socket.recv_into(view[received:])
+			if not n:
+				raise ConnectionError('hull server closed the connection')
+			received += n
+		return bytes(data)
+
+
+async def _serve(args):
+	server = HullServer(args.workers, args.max_pending_points)
+	if args.unix:
+		await server.serve_unix(args.unix)
+		print('serving hulls on {}'.format(args.unix))
+	else:
+		port = await server.serve_tcp('127.0.0.1', args.port)
+		print('serving hulls on 127.0.0.1:{}'.format(port))
+	# a kill stops the server like Ctrl-C, shutting its worker processes down
+	serving = asyncio.ensure_future(server.serve_forever())
+	asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, serving.cancel)
+	try:
+		await serving
+	except asyncio.CancelledError:
+		pass
+	finally:
+		print(server.stats)
+		await server.close()
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Serve convex hulls over a local socket.')
+	address = parser.add_mutually_exclusive_group(required=True)
+	address.add_argument('--unix', help='listen on this Unix socket path')
+	address.add_argument('--port', type=int, help='listen on this localhost TCP port')
+	parser.add_argument('--workers', type=int, help='processes solving large requests (default: one per core)')
+	parser.add_argument('--max-pending-points', type=int, default=DEFAULT_MAX_PENDING_POINTS,
+						help='stop reading requests while this many points are being solved')
+	args = parser.parse_args(argv)
+	try:
+		asyncio.run(_serve(args))
+	except KeyboardInterrupt:
+		pass
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,111 @@
+from collections import Counter
+
+from convex_hull_core import Hull, PointNode
+
+
+#
+# Opt-in instrumentation of the divide and conquer merge step.  Pass a HullStats to
+# convex_hull_dc, convex_hull_dc_iterative or combine, and every merge records how many
+# steps its tangent walks took.  The walkers themselves are not touched: the step counts are
+# the ring distances each walk covered, measured after the tangents are found.  With no
+# HullStats, the only cost is one check per merge.
+#
+
+
+class HullStats:
+	"""
+	Counters for the merges of one hull computation
+
+	merges: The number of merges
+	tangent_steps: Total steps of find_upper_tangent/find_lower_tangent
+	largest_subhull: The most nodes in a hull being merged
+	steps_by_depth: For each recursion depth (0 at the top), a Counter of steps per merge
+	"""
+
+	def __init__(self):
+		self.merges = 0
+		self.tangent_steps = 0
+		self.subhull_nodes = 0
+		self.largest_subhull = 0
+		self.steps_by_depth = {}
+
+	def record_merge(self, depth: int, left_hull: Hull, right_hull: Hull,
+					 upper_left: PointNode, upper_right: PointNode, lower_left: PointNode, lower_right: PointNode):
+		"""
+		Records one merge, called by combine before it connects the hulls
+		"""
+		left_size = ring_size(left_hull.root)
+		right_size = ring_size(right_hull.root)
+
+		# each tangent walk starts from an innermost node and only goes one way around its ring
+		rightmost = left_hull.rightmost
+		leftmost = right_hull.leftmost
+		tangent_steps = (ring_distance(rightmost, upper_left, 'counter_clockwise')
+						 + ring_distance(leftmost, upper_right, 'clockwise')
+						 + ring_distance(rightmost, lower_left, 'clockwise')
+						 + ring_distance(leftmost, lower_right, 'counter_clockwise'))
+
+		self.merges += 1
+		self.tangent_steps += tangent_steps
+		self.subhull_nodes += left_size + right_size
+		self.largest_subhull = max(self.largest_subhull, left_size, right_size)
+		self.steps_by_depth.setdefault(depth, Counter())[tangent_steps] += 1
+
+	def steps_per_node(self) -> float:
+		"""
+		:return: Steps walked per node of the hulls merged - growing with n hints at quadratic merges
+		"""
+		if not self.subhull_nodes:
+			return 0.0
+		return self.tangent_steps / self.subhull_nodes
+
+	def to_dict(self) -> dict:
+		"""
+		:return: The counters as a dict of plain values, e.g. for JSON
+		"""
+		return {
+			'merges': self.merges,
+			'tangent_steps': self.tangent_steps,
+			'largest_subhull': self.largest_subhull,
+			'steps_per_node': self.steps_per_node(),
+			'steps_by_depth': {
+				str(depth): {str(steps): count for steps, count in sorted(histogram.items())}
+				for depth, histogram in sorted(self.steps_by_depth.items())
+			},
+		}
+
+	def __str__(self):
+		lines = ['{} merges, {} tangent steps, largest sub-hull {}, {:.2f} steps per node'.format(
+			self.merges, self.tangent_steps, self.largest_subhull, self.steps_per_node())]
+		for depth, histogram in sorted(self.steps_by_depth.items()):
+			merges = sum(histogram.values())
+			steps = sum(step * count for step, count in histogram.items())
+			lines.append('  depth {:>2}: {:>8} merges, {:>8.2f} steps per merge, at most {}'.format(
+				depth, merges, steps / merges, max(histogram)))
+		return '\n'.join(lines)
+
+
+def ring_size(node: PointNode) -> int:
+	"""
+	:return: The number of nodes in the hull ring of node
+	"""
+	size = 1
+	curr_node = node.clockwise
+	while curr_node is not node:
+		size += 1
+		curr_node = curr_node.clockwise
+	return size
+
+
+def ring_distance(start: PointNode, end: PointNode, direction: str) -> int:
+	"""
+	:param direction: 'clockwise' or 'counter_clockwise'
+	:return: The number of steps from start to end, walking the ring in direction
+	"""
+	steps = 0
+	curr_node = start
+	while curr_node is not end:
+		steps += 1
+		curr_node = getattr(curr_node, direction)
+	return steps
+
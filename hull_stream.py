@@ -0,0 +1,127 @@
+import mmap
+import os
+import sys
+from array import array
+from itertools import islice
+
+from convex_hull_core import akl_toussaint_filter, convert_nodes_to_list, convex_hull_dc_iterative
+from presort import presort
+
+
+#
+# Out-of-core hull finding.  Points are read a fixed-size chunk at a time, and only the
+# running hull is kept between chunks, so peak memory depends on the chunk size plus
+# the hull size rather than on the total number of points.
+#
+# Point files are raw little-endian float64 values: x0, y0, x1, y1, ...
+#
+
+# Number of points per chunk, unless told otherwise
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Bytes per point in a point file
+POINT_SIZE = 16
+
+
+def convex_hull_stream(chunks, prefilter: bool = True) -> list:
+	"""
+	Finds the convex hull of a stream of point chunks
+
+	Each chunk's hull is found with the divide and conquer algorithm, and merged into
+	the hull of all the chunks before it.
+
+	:param chunks: An iterable of chunks, each a list of (x, y) tuples
+	:param prefilter: Whether to discard the points inside each chunk's extreme octagon first
+	:return: A list of (x, y) tuples composing the convex hull in clockwise order
+	"""
+	hull = []
+	for chunk in chunks:
+		if not chunk:
+			continue
+		if prefilter:
+			chunk = akl_toussaint_filter(chunk)
+		chunk_hull = _hull_of(chunk)
+
+		# the merged hull is the hull of both hulls' vertices
+		hull = _hull_of(hull + chunk_hull)
+
+	return hull
+
+
+def _hull_of(points: list) -> list:
+	"""
+	Finds the hull of a list of (x, y) tuples in any order, ignoring repeated points
+	"""
+	sorted_points, _ = presort(points)
+	return convert_nodes_to_list(convex_hull_dc_iterative(sorted_points).root)
+
+
+def chunk_points(points, chunk_size: int = DEFAULT_CHUNK_SIZE):
+	"""
+	Splits an iterator of points into chunks
+
+	:param points: An iterable of (x, y) tuples
+	:param chunk_size: The number of points per chunk
+	:return: A generator of lists of at most chunk_size (x, y) tuples
+	"""
+	points = iter(points)
+	while True:
+		chunk = list(islice(points, chunk_size))
+		if not chunk:
+			return
+		yield chunk
+
+
+def read_point_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = False):
+	"""
+	Reads a point file a chunk at a time
+
+	:param path: The path of a file of little-endian float64 x, y pairs
+	:param chunk_size: The number of points per chunk
+	:param use_mmap: Whether to memory-map the file rather than read it
+	:return: A generator of lists of at most chunk_size (x, y) tuples
+	:raises ValueError: Before the first chunk, if the file is not a whole number of points
+	"""
+	with open(path, 'rb') as file:
+		size = os.fstat(file.fileno()).st_size
+		if size % POINT_SIZE:
+			raise ValueError('{} is not a whole number of float64 x, y pairs: {} bytes, {} past the last pair'.format(
+				path, size, size % POINT_SIZE))
+		if use_mmap and sys.byteorder == 'little':
+			if size == 0:
+				# an empty file can't be mapped, and has no chunks
+				return
+			# the mapped file's doubles are read in place
+			with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped).cast('d') as values:
+				for start in range(0, len(values), 2 * chunk_size):
+					with values[start:start + 2 * chunk_size] as chunk:
+						points = list(zip(chunk[0::2].tolist(), chunk[1::2].tolist()))
+					yield points
+			return
+
+		while True:
+			data = file.read(POINT_SIZE * chunk_size)
+			if not data:
+				return
+			values = array('d')
+			values.frombytes(data)
+			if sys.byteorder == 'big':
+				values.byteswap()
+			yield list(zip(values[0::2], values[1::2]))
+
+
+def write_points(path: str, points):
+	"""
+	Writes points to a point file
+
+	:param path: The path of the file to write
+	:param points: An iterable of (x, y) tuples
+	"""
+	with open(path, 'wb') as file:
+		for chunk in chunk_points(points):
+			values = array('d')
+			for point in chunk:
+				values.extend(point)
+			if sys.byteorder == 'big':
+				values.byteswap()
+			values.tofile(file)
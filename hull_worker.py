@@ -0,0 +1,155 @@
+import threading
+import time
+
+from which_pyqt import PYQT_VER
+if PYQT_VER == 'PYQT5':
+	from PyQt5.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal
+else:
+	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+
+from convex_hull_core import HullCancelled
+
+
+#
+# Runs ConvexHullSolver.compute_hull off the Qt main thread, so the window keeps
+# repainting and taking clicks during a long solve.  The solver draws on a ViewProxy, which
+# queues the drawing commands and hands them to the real view over a queued signal, to
+# be applied on the main thread at most once per REDRAW_INTERVAL.
+#
+
+# The shortest time between two redraws of the view, in seconds - about a 60Hz display
+REDRAW_INTERVAL = 1.0 / 60.0
+
+
+class ViewProxy(QObject):
+	"""
+	Stands in for a PointLineView on the worker thread
+
+	Offers the addLines/clearLines/displayStatusText calls the solver makes.  Must be
+	created on the main thread, where its commands are applied to the view.
+	"""
+	commandsQueued = pyqtSignal()
+
+	def __init__(self, view, cancelled: threading.Event):
+		super().__init__()
+		self.view = view
+		self.cancelled = cancelled
+		self._lock = threading.Lock()
+		self._commands = []
+		self._last_redraw = 0.0
+		self._timer = QTimer(self)
+		self._timer.setSingleShot(True)
+		self._timer.timeout.connect(self.flush)
+		# the slot runs on this object's thread, the main thread, whichever thread emits
+		self.commandsQueued.connect(self._schedule, Qt.QueuedConnection)
+
+	# The view API the solver calls, on the worker thread
+
+	def addLines(self, line_list, color):
+		self._queue(('addLines', line_list, color))
+
+	def clearLines(self, lines=None):
+		self._queue(('clearLines', lines))
+
+	def displayStatusText(self, text):
+		self._queue(('displayStatusText', text))
+
+	def _queue(self, command):
+		if self.cancelled.is_set():
+			# stops the solver at its next drawing command
+			raise HullCancelled()
+		with self._lock:
+			self._commands.append(command)
+			# one signal per batch: the rest of the batch is picked up when it is applied
+			signal = len(self._commands) == 1
+		if signal:
+			self.commandsQueued.emit()
+
+	# The main thread side
+
+	def _schedule(self):
+		wait = self._last_redraw + REDRAW_INTERVAL - time.perf_counter()
+		if wait <= 0:
+			self.flush()
+		elif not self._timer.isActive():
+			self._timer.start(int(wait * 1000) + 1)
+
+	def discard(self):
+		"""
+		Drops every queued command, and any redraw scheduled for them
+		"""
+		self._timer.stop()
+		with self._lock:
+			self._commands = []
+
+	def flush(self):
+		"""
+		Applies every queued command to the view, then redraws it once
+		"""
+		with self._lock:
+			commands = self._commands
+			self._commands = []
+		if not commands:
+			return
+		for name, *args in commands:
+			getattr(self.view, name)(*args)
+		self.view.update()
+		self._last_redraw = time.perf_counter()
+
+
+class HullWorker(QThread):
+	"""
+	A thread running one ConvexHullSolver.compute_hull call
+
+	Connect to solved (the hull indices compute_hull returned), failed (the error
+	text) or cancelled before calling start().  The view is up to date when they are emitted.
+	"""
+	solved = pyqtSignal(object)
+	failed = pyqtSignal(str)
+	cancelled = pyqtSignal()
+
+	def __init__(self, solver, points, pause, view, **kwargs):
+		"""
+		:param solver: The ConvexHullSolver, which must not be used elsewhere until the worker finishes
+		:param points: An (N, 2) float64 array or other buffer of x, y doubles, as for compute_hull
+		:param pause: Whether to log the merges for animating, as for compute_hull
+		:param view: The PointLineView to draw on
+		:param kwargs: Any other compute_hull arguments, e.g. engine or cache_key
+		"""
+		super().__init__()
+		self.solver = solver
+		self.points = points
+		self.pause = pause
+		self.kwargs = kwargs
+		solver.cancelled.clear()
+		self.proxy = ViewProxy(view, solver.cancelled)
+		self.finished.connect(self._finish)
+		self._hull = None
+		self._error = None
+
+	def cancel(self):
+		"""
+		Asks the solve to stop, within a few thousand merges; cancelled is emitted when it has
+		"""
+		self.solver.cancelled.set()
+
+	def run(self):
+		try:
+			self._hull = self.solver.compute_hull(self.points, self.pause, self.proxy, **self.kwargs)
+		except HullCancelled:
+			pass
+		except Exception as error:
+			self._error = '{}: {}'.format(type(error).__name__, error)
+
+	def _finish(self):
+		# on the main thread, once run has returned: draw what is left, then report
+		if self.solver.cancelled.is_set():
+			# drop what was queued before the cancel, so it isn't drawn after the view is cleared
+			self.proxy.discard()
+			self.cancelled.emit()
+			return
+		self.proxy.flush()
+		if self._error is not None:
+			self.failed.emit(self._error)
+		else:
+			self.solved.emit(self._hull)
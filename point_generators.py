@@ -0,0 +1,110 @@
+import math
+
+import numpy as np
+
+
+#
+# Problem instance generators, shared by the GUI (Proj2GUI.newPoints) and the benchmark.
+# Points are drawn with NumPy in batches: a batch is sized from the acceptance rate of
+# the distribution's rejection test so that one batch is nearly always enough, and the
+# test is applied to the whole batch at once.
+#
+# The same distribution, size and seed always give the same points, as with the seeded
+# random.seed of the GUI.  A seed of None draws fresh points every time.
+#
+
+DISTRIBUTIONS = ['uniform', 'spherical', 'gaussian', 'circle', 'collinear', 'grid', 'lattice']
+
+# The distributions the GUI offers
+GUI_DISTRIBUTIONS = ['uniform', 'spherical', 'gaussian']
+
+# The largest distance of a point from the origin
+MAX_R = 0.98
+
+# Batches are this many times the expected number of draws needed, plus MIN_BATCH
+OVERSAMPLE = 1.1
+MIN_BATCH = 64
+
+
+def generate_points(distribution: str, npoints: int, seed: int = None) -> np.ndarray:
+	"""
+	Generates a problem instance
+
+	The points of the uniform, spherical and gaussian distributions have unique x-values.
+	The others are degenerate on purpose: circle puts every point on the hull, collinear
+	every point on one line, grid gives integer x-values and few distinct y-values, and
+	lattice gives small integer coordinates, with shared x-values and repeated points.
+
+	:param distribution: One of DISTRIBUTIONS
+	:param npoints: The number of points to generate
+	:param seed: The seed for the random number generator, or None for fresh entropy
+	:return: An (npoints, 2) float64 array of points, in random order
+	"""
+	rng = np.random.default_rng(seed)
+
+	if distribution == 'uniform':
+		# the disc's share of the square
+		return _rejection_sample(rng, npoints, math.pi * MAX_R**2 / 4, _draw_uniform)
+	elif distribution == 'spherical':
+		# the ball's share of the cube
+		return _rejection_sample(rng, npoints, math.pi * MAX_R**3 / 6, _draw_spherical)
+	elif distribution == 'gaussian':
+		# the share of a 2D normal distribution within MAX_R
+		return _rejection_sample(rng, npoints, 1.0 - math.exp(-MAX_R**2 / (2 * 0.25**2)), _draw_gaussian)
+	elif distribution == 'circle':
+		angles = rng.uniform(0.0, 2.0 * math.pi, npoints)
+		return np.column_stack((MAX_R * np.cos(angles), MAX_R * np.sin(angles)))
+	elif distribution == 'collinear':
+		xs = rng.uniform(-1.0, 1.0, npoints)
+		return np.column_stack((xs, 0.5 * xs))
+	elif distribution == 'grid':
+		return np.column_stack((np.arange(npoints, dtype=np.float64), rng.integers(0, 300, npoints).astype(np.float64)))
+	elif distribution == 'lattice':
+		side = max(2, int(math.sqrt(npoints)) // 2)
+		return rng.integers(0, side, (npoints, 2)).astype(np.float64)
+	else:
+		raise ValueError('Unknown distribution: {}'.format(distribution))
+
+
+def points_to_list(points: np.ndarray) -> list:
+	"""
+	:param points: An (N, 2) array of points
+	:return: A list of (x, y) tuples of floats
+	"""
+	return list(zip(*points.T.tolist())) if len(points) else []
+
+
+def _rejection_sample(rng, npoints: int, acceptance: float, draw) -> np.ndarray:
+	"""
+	Draws batches of points until npoints with unique x-values are accepted
+
+	:param acceptance: The expected fraction of points draw accepts
+	:param draw: Called with rng and a batch size, returns an (n, 2) array of the points it accepts
+	:return: An (npoints, 2) array of the first npoints accepted with unique x-values
+	"""
+	points = np.zeros((0, 2))
+	while len(points) < npoints:
+		batch = int((npoints - len(points)) / acceptance * OVERSAMPLE) + MIN_BATCH
+		points = np.concatenate((points, draw(rng, batch)))
+		sorted_xs = np.sort(points[:, 0])
+		if (sorted_xs[1:] == sorted_xs[:-1]).any():
+			# keep the first point of each x-value, in the order drawn
+			_, first = np.unique(points[:, 0], return_index=True)
+			points = points[np.sort(first)]
+	return points[:npoints]
+
+
+def _draw_uniform(rng, batch: int) -> np.ndarray:
+	points = rng.uniform(-1.0, 1.0, (batch, 2))
+	return points[np.einsum('ij,ij->i', points, points) <= MAX_R**2]
+
+
+def _draw_spherical(rng, batch: int) -> np.ndarray:
+	# points in a ball, projected onto the xy-plane
+	points = rng.uniform(-1.0, 1.0, (batch, 3))
+	return points[np.einsum('ij,ij->i', points, points) <= MAX_R**2, :2]
+
+
+def _draw_gaussian(rng, batch: int) -> np.ndarray:
+	points = rng.normal(0.0, 0.25, (batch, 2))
+	return points[np.einsum('ij,ij->i', points, points) <= MAX_R**2]
@@ -0,0 +1,202 @@
+from operator import itemgetter
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+
+#
+# Strategies for sorting points by increasing x-value, then y-value, before the divide
+# and conquer algorithm runs.  Repeated points are dropped, keeping the first of each, so
+# the hull engines see every point once.
+#
+# Lists of (x, y) tuples come back as sorted lists, and (N, 2) NumPy arrays come back as
+# sorted arrays.
+#
+
+SORT_AUTO = 'auto'
+SORT_TIMSORT = 'timsort'	# sorted() on the (x, y) tuples
+SORT_ARGSORT = 'argsort'	# NumPy lexsort of the x- and y-value arrays
+SORT_RADIX = 'radix'		# LSD radix sort of the y- then x-values' bit patterns, 16 bits per pass
+SORT_BUCKET = 'bucket'		# bucket sort over a bounded x-range, e.g. [-1, 1] in the GUI
+
+# Average number of points per bucket in a bucket sort
+BUCKET_LOAD = 4
+
+# From this many points, the auto strategy radix sorts NumPy arrays: below it, the fixed
+# cost of its 8 passes loses to lexsort
+RADIX_MIN_SIZE = 2048
+
+
+def presort(points, strategy: str = SORT_AUTO, bounds: tuple = None):
+	"""
+	Sorts points by increasing x-value, then y-value, dropping repeated points
+
+	:param points: A list of (x, y) tuples, or an (N, 2) NumPy array
+	:param strategy: One of the SORT_* strategies
+	:param bounds: An optional (low, high) range holding every x-value, used by SORT_BUCKET
+	:return: A tuple of the sorted points, in the same type as points, and the strategy used
+	"""
+	if strategy == SORT_AUTO:
+		strategy = choose_strategy(points)
+	if strategy not in (SORT_TIMSORT, SORT_ARGSORT, SORT_RADIX, SORT_BUCKET):
+		raise ValueError('Unknown sort strategy: {}'.format(strategy))
+
+	if _is_array(points):
+		xs = points[:, 0]
+		ys = points[:, 1]
+		if strategy == SORT_TIMSORT:
+			order = sorted(range(len(points)), key=list(zip(xs.tolist(), ys.tolist())).__getitem__)
+		elif strategy == SORT_BUCKET:
+			order = bucket_order(xs.tolist(), ys.tolist(), bounds)
+		elif strategy == SORT_ARGSORT:
+			order = argsort_order(xs, ys)
+		else:
+			order = radix_order(xs, ys)
+		return points[unique_order(np.asarray(order, dtype=np.intp), xs, ys)], strategy
+
+	if strategy == SORT_TIMSORT:
+		# sorting on the x-values alone keeps to sorted()'s fast path for float keys
+		return settle_ties(sorted(points, key=itemgetter(0))), strategy
+	if strategy == SORT_BUCKET:
+		order = bucket_order([point[0] for point in points], [point[1] for point in points], bounds)
+		sorted_points = []
+		for i in order:
+			if not sorted_points or points[i] != sorted_points[-1]:
+				sorted_points.append(points[i])
+		return sorted_points, strategy
+
+	if np is None:
+		raise ValueError('The {} strategy needs NumPy'.format(strategy))
+	xs = np.fromiter((point[0] for point in points), dtype=np.float64, count=len(points))
+	ys = np.fromiter((point[1] for point in points), dtype=np.float64, count=len(points))
+	order = argsort_order(xs, ys) if strategy == SORT_ARGSORT else radix_order(xs, ys)
+	return list(map(points.__getitem__, unique_order(order, xs, ys).tolist())), strategy
+
+
+def choose_strategy(points) -> str:
+	"""
+	Picks a sort strategy by the type and size of the input
+
+	On lists, argsort and radix pay to copy the values out of the tuples first and to
+	rebuild the list after, which costs about as much as sorted() itself, even at 10^6
+	points.  On arrays, radix beats lexsort from RADIX_MIN_SIZE points.  The bucket
+	strategy does not beat sorted() when run from Python, so it is only used when asked for.
+
+	:param points: A list of (x, y) tuples, or an (N, 2) NumPy array
+	:return: One of the SORT_* strategies, other than SORT_AUTO
+	"""
+	if _is_array(points):
+		return SORT_RADIX if len(points) >= RADIX_MIN_SIZE else SORT_ARGSORT
+	return SORT_TIMSORT
+
+
+def argsort_order(xs, ys):
+	"""
+	:param xs: A float64 array of x-values
+	:param ys: A float64 array of y-values, parallel to xs
+	:return: The stable sorted order of the points, as an index array
+	"""
+	return np.lexsort((ys, xs))
+
+
+def radix_order(xs, ys):
+	"""
+	LSD radix sort of float64 points, on the bit patterns of their values
+
+	Flipping the sign bit of non-negative values, and every bit of negative values, turns
+	the IEEE 754 bit patterns into unsigned integers that sort in the same order as the
+	floats.  These are then sorted 16 bits at a time, least significant digit first, over
+	the y-values and then the x-values.  -0.0 is made 0.0 first, as the two compare equal
+	but have different bit patterns.
+
+	:param xs: A float64 array of x-values
+	:param ys: A float64 array of y-values, parallel to xs
+	:return: The stable sorted order of the points, as an index array
+	"""
+	sign = np.uint64(1 << 63)
+	order = np.arange(len(xs))
+	for values in (ys, xs):
+		# adding 0.0 turns -0.0 into 0.0 and leaves every other value as it is
+		keys = (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+		keys = np.where(keys & sign, ~keys, keys | sign)
+		for shift in range(0, 64, 16):
+			digits = ((keys[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+			# a stable sort of 16-bit integers is NumPy's own counting (radix) sort
+			order = order[np.argsort(digits, kind='stable')]
+	return order
+
+
+def bucket_order(xs: list, ys: list, bounds: tuple = None) -> list:
+	"""
+	Bucket sort of points over a bounded range of x-values
+
+	:param xs: A list of x-values
+	:param ys: A list of y-values, parallel to xs
+	:param bounds: A (low, high) range holding every x-value, the min and max of xs by default
+	:return: The stable sorted order of the points, as a list of indices
+	"""
+	if not xs:
+		return []
+	low, high = bounds if bounds is not None else (min(xs), max(xs))
+	count = max(1, len(xs) // BUCKET_LOAD)
+	scale = count / (high - low) if high > low else 0.0
+
+	buckets = [[] for _ in range(count)]
+	last = count - 1
+	# x-values outside of bounds go to the end buckets
+	for i, x in enumerate(xs):
+		bucket = int((x - low) * scale)
+		buckets[min(max(bucket, 0), last)].append(i)
+
+	order = []
+	for bucket in buckets:
+		if len(bucket) > 1:
+			bucket.sort(key=lambda i: (xs[i], ys[i]))
+		order.extend(bucket)
+	return order
+
+
+def settle_ties(sorted_points: list) -> list:
+	"""
+	Sorts the points that share an x-value by y-value, and drops repeated points
+
+	:param sorted_points: A list of (x, y) tuples, sorted by x-value
+	:return: The points sorted by x-value, then y-value, with no repeated points - sorted_points
+			 itself when no x-value is shared
+	"""
+	previous_x = None
+	for i, point in enumerate(sorted_points):
+		if point[0] == previous_x:
+			break
+		previous_x = point[0]
+	else:
+		return sorted_points
+
+	# the rest is nearly in order, so comparing whole tuples only costs a pass over it
+	settled = sorted_points[:i - 1]
+	for point in sorted(sorted_points[i - 1:]):
+		if not settled or point != settled[-1]:
+			settled.append(point)
+	return settled
+
+
+def unique_order(order, xs, ys):
+	"""
+	Drops the repeated points from a sorted order, keeping the first of each
+
+	:param order: A sorted order of the points, as an index array
+	:param xs: A float64 array of x-values
+	:param ys: A float64 array of y-values, parallel to xs
+	:return: The order without repeated points, as an index array
+	"""
+	sorted_xs = xs[order]
+	sorted_ys = ys[order]
+	keep = np.ones(len(order), dtype=bool)
+	keep[1:] = (sorted_xs[1:] != sorted_xs[:-1]) | (sorted_ys[1:] != sorted_ys[:-1])
+	return order[keep]
+
+
+def _is_array(points) -> bool:
+	return np is not None and isinstance(points, np.ndarray)
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import dynamic_hull
+from dynamic_hull import DynamicConvexHull
+from hull_algorithms import monotone_chain
+
+
+def grid_point(r: random.Random) -> tuple:
+	# a coarse grid, so repeats and collinear points are common
+	return (float(r.randint(-20, 20)), float(r.randint(-20, 20)))
+
+
+@pytest.mark.parametrize('block_size', [2, 5, 512])
+def test_updates_match_a_fresh_hull(monkeypatch, block_size):
+	monkeypatch.setattr(dynamic_hull, 'POINT_BLOCK_SIZE', block_size)
+	r = random.Random(block_size)
+	points = {grid_point(r) for _ in range(50)}
+	hull = DynamicConvexHull(points)
+	for step in range(2000):
+		point = grid_point(r)
+		if point in points and r.random() < 0.6:
+			hull.delete(point)
+			points.discard(point)
+		else:
+			hull.insert(point)
+			points.add(point)
+		if step % 50 == 0 or len(points) < 3:
+			assert len(hull) == len(points)
+			assert hull.vertices() == monotone_chain(sorted(points))
+
+
+def test_delete_missing_point():
+	hull = DynamicConvexHull([(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)])
+	with pytest.raises(KeyError):
+		hull.delete((2.0, 2.0))
+	hull.delete((1.0, 0.0))
+	with pytest.raises(KeyError):
+		hull.delete((1.0, 0.0))
+
+
+def test_sorted_points(monkeypatch):
+	monkeypatch.setattr(dynamic_hull, 'POINT_BLOCK_SIZE', 4)
+	r = random.Random(1)
+	expected = sorted({(float(r.randint(0, 99)), 0.0) for _ in range(60)})
+	points = dynamic_hull._SortedPoints([])
+	for point in r.sample(expected, len(expected)):
+		assert points.add(point)
+		assert not points.add(point)
+	assert len(points) == len(expected)
+	assert points.between(None, None) == expected
+	for low, high in [(expected[3], expected[40]), ((-1.0, 0.0), (50.5, 0.0)), ((99.5, 0.0), None)]:
+		assert points.between(low, high) == [p for p in expected if (low is None or p >= low) and (high is None or p <= high)]
+	for point in r.sample(expected, len(expected)):
+		points.remove(point)
+	assert len(points) == 0 and points.between(None, None) == []
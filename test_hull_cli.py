@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from hull_cli import main, read_points
+
+
+def test_csv_points(tmp_path):
+	path = tmp_path / 'points.csv'
+	path.write_text('# x, y\n0,0\n1,0\n0,1\n')
+	assert read_points(str(path)).tolist() == [[0, 0], [1, 0], [0, 1]]
+
+	path.write_text('1,2\n')
+	assert read_points(str(path)).shape == (1, 2)
+
+
+def test_empty_csv(tmp_path):
+	path = tmp_path / 'points.csv'
+	path.write_text('# nothing\n')
+	with pytest.warns(UserWarning):
+		assert read_points(str(path)).shape == (0, 2)
+
+
+@pytest.mark.parametrize('text', ['0,0,0\n1,0,0\n', '0\n1\n2\n3\n'])
+def test_csv_needs_two_columns(tmp_path, text):
+	path = tmp_path / 'points.csv'
+	path.write_text(text)
+	with pytest.raises(ValueError, match='columns'):
+		read_points(str(path))
+
+
+def test_binary_needs_whole_pairs(tmp_path):
+	path = tmp_path / 'points.bin'
+	np.arange(6, dtype='<f8').tofile(str(path))
+	assert read_points(str(path)).shape == (3, 2)
+
+	np.arange(5, dtype='<f8').tofile(str(path))
+	with pytest.raises(ValueError, match='pairs'):
+		read_points(str(path))
+
+
+def test_bad_input_exits_with_message(tmp_path, capsys):
+	path = tmp_path / 'points.csv'
+	path.write_text('0,0,0\n1,0,0\n')
+	with pytest.raises(SystemExit) as exit_info:
+		main([str(path)])
+	assert exit_info.value.code == 2
+	assert '3 columns' in capsys.readouterr().err
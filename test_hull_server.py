@@ -0,0 +1,71 @@
+import asyncio
+
+import numpy as np
+
+import hull_server
+from hull_server import HEADER, KIND_HULL, MIN_VECTOR_BATCH, STATUS_OK, HullServer, _solve_batch, _solve_points
+
+
+def repeated_point_groups(count: int, seed: int = 0) -> list:
+	# small groups with repeated and collinear points, like those clients send
+	rng = np.random.default_rng(seed)
+	groups = []
+	for _ in range(count):
+		points = rng.integers(0, 4, size=(rng.integers(1, 30), 2)).astype(np.float64)
+		groups.append(points[rng.integers(0, len(points), size=len(points) + 5)])
+	return groups
+
+
+def test_batch_paths_agree():
+	groups = repeated_point_groups(500)
+	vectorized = _solve_batch(groups)
+	assert len(groups) >= MIN_VECTOR_BATCH
+	for group, hull in zip(groups, vectorized):
+		alone = _solve_batch([group])[0]
+		assert alone.tolist() == hull.tolist()
+		assert _solve_points(group.tobytes()).tolist() == hull.tolist()
+		# the first index of every repeated point
+		for index in hull.tolist():
+			assert index == np.flatnonzero((group == group[index]).all(axis=1))[0]
+
+
+async def _request(reader, writer, request_id: int, points: np.ndarray):
+	writer.write(HEADER.pack(KIND_HULL, request_id, len(points)) + points.astype('<f8').tobytes())
+
+
+async def _response(reader) -> tuple:
+	status, request_id, count = HEADER.unpack(await reader.readexactly(HEADER.size))
+	assert status == STATUS_OK
+	return request_id, np.frombuffer(await reader.readexactly(8 * count), dtype='<i8').tolist()
+
+
+async def _alone_and_batched(groups: list, monkeypatch) -> tuple:
+	server = HullServer(workers=1)
+	port = await server.serve_tcp()
+	try:
+		reader, writer = await asyncio.open_connection('127.0.0.1', port)
+		alone = []
+		for request_id, points in enumerate(groups):
+			await _request(reader, writer, request_id, points)
+			alone.append((await _response(reader))[1])
+
+		# every request written before any is read, and every batch they arrive in solved by
+		# convex_hulls_batch_np, however few requests the reads make it
+		monkeypatch.setattr(hull_server, 'MIN_VECTOR_BATCH', 1)
+		for request_id, points in enumerate(groups):
+			await _request(reader, writer, request_id, points)
+		await writer.drain()
+		batched = [None] * len(groups)
+		for _ in groups:
+			request_id, hull = await _response(reader)
+			batched[request_id] = hull
+		writer.close()
+		return alone, batched
+	finally:
+		await server.close()
+
+
+def test_same_reply_alone_and_in_a_batch(monkeypatch):
+	groups = repeated_point_groups(200, seed=1)
+	alone, batched = asyncio.run(_alone_and_batched(groups, monkeypatch))
+	assert alone == batched
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from hull_stream import POINT_SIZE, convex_hull_stream, read_point_chunks, write_points
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_read_point_chunks(tmp_path, use_mmap):
+	r = random.Random(0)
+	points = [(r.uniform(-1, 1), r.uniform(-1, 1)) for _ in range(1000)]
+	path = str(tmp_path / 'points.bin')
+	write_points(path, points)
+
+	chunks = list(read_point_chunks(path, 300, use_mmap))
+	assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+	assert [point for chunk in chunks for point in chunk] == points
+	assert convex_hull_stream(chunks)
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+@pytest.mark.parametrize('size', [1, 8, POINT_SIZE + 8, 10 * POINT_SIZE - 1])
+def test_truncated_file(tmp_path, use_mmap, size):
+	path = tmp_path / 'points.bin'
+	path.write_bytes(bytes(size))
+	with pytest.raises(ValueError, match='whole number'):
+		next(read_point_chunks(str(path), 4, use_mmap))
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_empty_file(tmp_path, use_mmap):
+	path = tmp_path / 'points.bin'
+	path.write_bytes(b'')
+	assert list(read_point_chunks(str(path), 4, use_mmap)) == []
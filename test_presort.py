@@ -0,0 +1,47 @@
+import random
+
+import numpy as np
+import pytest
+
+from convex_hull_core import convert_nodes_to_list, convex_hull_dc_iterative
+from hull_algorithms import monotone_chain
+from presort import SORT_ARGSORT, SORT_AUTO, SORT_BUCKET, SORT_RADIX, SORT_TIMSORT, choose_strategy, presort
+
+STRATEGIES = [SORT_TIMSORT, SORT_ARGSORT, SORT_RADIX, SORT_BUCKET]
+
+
+def signed_zero_points(seed: int, n: int = 40) -> list:
+	# a vertical line of points at x = 0, half of them at -0.0, with others either side
+	r = random.Random(seed)
+	points = [(r.choice([-0.0, 0.0]), r.uniform(-1, 1)) for _ in range(n)]
+	points += [(r.uniform(-1, 1), r.choice([-0.0, 0.0, r.uniform(-1, 1)])) for _ in range(n)]
+	r.shuffle(points)
+	return points
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_signed_zeros_sort_as_equal(strategy):
+	for seed in range(50):
+		points = signed_zero_points(seed)
+		expected = sorted(set(points))
+		for values in (points, np.array(points)):
+			sorted_points, _ = presort(values, strategy)
+			assert [tuple(point) for point in np.asarray(sorted_points).tolist()] == expected
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_signed_zeros_give_the_right_hull(strategy):
+	for seed in range(50):
+		points = signed_zero_points(seed)
+		expected = monotone_chain(sorted(set(points)))
+		sorted_points, _ = presort(np.array(points), strategy)
+		hull = convert_nodes_to_list(convex_hull_dc_iterative([tuple(point) for point in sorted_points.tolist()]).root)
+		start = hull.index(min(hull))
+		assert hull[start:] + hull[:start] == expected
+
+
+def test_auto_strategy_by_size():
+	assert choose_strategy([(0.0, 0.0)] * 10) == SORT_TIMSORT
+	assert choose_strategy(np.zeros((10, 2))) == SORT_ARGSORT
+	assert choose_strategy(np.zeros((100000, 2))) == SORT_RADIX
+	assert presort(np.random.rand(5000, 2), SORT_AUTO)[1] == SORT_RADIX